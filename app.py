@@ -1,8 +1,28 @@
+import logging
+import os
+import threading
+import time
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
+import pandas as pd
+
+from dados import (
+    COLUNAS_REGISTROS, DIRETORIO, URL_CSV, carregar_metadados, derivar_colunas, metadados_dataset, uso_memoria
+)
+from filtros import COLUNAS_FILTRO, IndiceFiltros
+from cache import CacheLRU, chave_selecao
+import atualizacao
+import cubo
+import figuras
+import paralelo
+import perfil
+import visoes
+from banco import CAMINHO_BANCO, BancoSalarios
+
+# Copy-on-write: a base é compartilhada por todas as sessões; seleções de colunas
+# viram vistas e nenhuma alteração em um resultado derivado chega até ela
+pd.set_option("mode.copy_on_write", True)
 
 # Configuração da página
 st.set_page_config(
@@ -12,509 +32,464 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Cache para carregar os dados
-@st.cache_data
-def load_data():
-    url = "https://raw.githubusercontent.com/heldjow/ImersaoDadosAlura/main/df_limpo.csv"
-    df = pd.read_csv(url)
-    return df
+# Logs no stderr (o JSON do MAPA_PERFIL=log e as trocas de versão da base);
+# basicConfig não faz nada se o servidor já configurou o logging
+logging.basicConfig(format="%(message)s")
+perfil.logger.setLevel(logging.INFO)
+atualizacao.logger.setLevel(logging.INFO)
 
-# Carregar dados
-df = load_data()
+# Perfil opcional por seção (MAPA_PERFIL=painel,log,cprofile; pela URL, só ?perfil=painel); None quando desligado
+perfilador = perfil.iniciar(os.environ.get("MAPA_PERFIL", ""), st.query_params.get("perfil"))
 
-# Título principal
-st.title("🚀 Guia de Carreira em Dados")
-st.markdown("""
-**Descubra oportunidades, salários e tendências para iniciar ou evoluir na área de dados**
-""")
+# O corpo do rerun fica num try: o perfil é encerrado mesmo quando o script é
+# interrompido (st.rerun, nova interação do usuário) antes do fim
+try:
+    # Backend: "pandas" (padrão) mantém a base em memória; "sql" consulta o banco e só traz os resultados
+    BACKEND = os.environ.get("MAPA_BACKEND", "pandas")
 
-# Sidebar com filtros
-st.sidebar.header("🎯 Filtros")
+    # Diretório com df_limpo.arrow/df_limpo.csv/df_limpo.meta.json (MAPA_DADOS, ex.: benchmark)
+    DIRETORIO_DADOS = os.environ.get("MAPA_DADOS", DIRETORIO)
+    # Banco SQLite do MAPA_BACKEND=sql
+    CAMINHO_BANCO_APP = os.environ.get("MAPA_BANCO", CAMINHO_BANCO)
 
-# Filtro por ano
-anos_disponiveis = sorted(df['ano'].unique())
-anos_selecionados = st.sidebar.multiselect(
-    "Selecione os anos:",
-    options=anos_disponiveis,
-    default=anos_disponiveis
-)
+    # Tudo o que o app deriva da base: colunas derivadas, índice de bitmaps dos filtros,
+    # cubo de agregados (contagem, soma, soma dos quadrados, mín, máx), opções/contagens
+    # da sidebar e as visões pré-calculadas que conferem com ela. Montado uma vez por
+    # versão e só lido depois
+    def montar_versao(df):
+        df = derivar_colunas(df)
+        return {
+            'df': df,
+            'indice': IndiceFiltros(df),
+            'cubo': cubo.CuboAgregado(df),
+            'metadados': metadados_dataset(df),
+            'visoes': visoes.abrir(DIRETORIO_DADOS),
+        }
 
-# Filtro por senioridade (note: 'senoridade' sem 'i')
-senioridades = df['senoridade'].dropna().unique()
-senioridades_selecionadas = st.sidebar.multiselect(
-    "Nível de Experiência:",
-    options=sorted(senioridades),
-    default=sorted(senioridades)
-)
+    # Base compartilhada entre sessões (snapshot Arrow local; CSV remoto só sem snapshot).
+    # Com MAPA_ATUALIZAR_S > 0, uma thread consulta a fonte nesse intervalo e troca a
+    # versão quando ela muda, sem bloquear os reruns (MAPA_URL_DADOS troca a URL remota)
+    @st.cache_resource
+    def load_atualizador():
+        fonte = atualizacao.fonte_padrao(DIRETORIO_DADOS, os.environ.get("MAPA_URL_DADOS", URL_CSV))
+        return atualizacao.Atualizador(fonte, montar_versao, float(os.environ.get("MAPA_ATUALIZAR_S", "0")))
 
-# Filtro por cargo (com search)
-cargos_disponiveis = sorted(df['cargo'].dropna().unique())
-cargos_selecionados = st.sidebar.multiselect(
-    "Cargos:",
-    options=cargos_disponiveis,
-    default=cargos_disponiveis[:10] if len(cargos_disponiveis) > 10 else cargos_disponiveis
-)
+    # Opções dos filtros e contagens: arquivo de metadados do ETL, sem ler a base
+    # (recalculados a partir dela só quando o arquivo falta ou está desatualizado)
+    @st.cache_data
+    def load_metadados():
+        if BACKEND == "sql":
+            banco = load_banco()
+            return {'opcoes': {coluna: banco.opcoes(coluna) for coluna in COLUNAS_FILTRO}, 'resumo': banco.resumo()}
+        return carregar_metadados(DIRETORIO_DADOS, lambda: load_atualizador().atual().conteudo['df'])
 
-# Filtro por modalidade de trabalho
-modalidades = df['modalidade'].dropna().unique()
-modalidades_selecionadas = st.sidebar.multiselect(
-    "Modalidade de Trabalho:",
-    options=sorted(modalidades),
-    default=sorted(modalidades)
-)
+    # Cache LRU dos resultados por seleção, compartilhado entre sessões (limite em MB via MAPA_CACHE_MB)
+    @st.cache_resource
+    def load_cache_resultados():
+        return CacheLRU(int(os.environ.get("MAPA_CACHE_MB", "256")) * 2**20)
 
-# Filtro por tamanho da empresa
-tamanhos_empresa = df['tamanho_empresa'].dropna().unique()
-tamanhos_selecionados = st.sidebar.multiselect(
-    "Tamanho da Empresa:",
-    options=sorted(tamanhos_empresa),
-    default=sorted(tamanhos_empresa)
-)
+    # Cache do JSON das figuras por (id, hash dos dados agregados, layout), compartilhado
+    # entre sessões (limite em MB via MAPA_FIGURAS_MB)
+    @st.cache_resource
+    def load_cache_figuras():
+        return CacheLRU(int(os.environ.get("MAPA_FIGURAS_MB", "64")) * 2**20)
 
-# Filtro por período/tipo de contrato
-periodos = df['periodo'].dropna().unique()
-periodos_selecionados = st.sidebar.multiselect(
-    "Tipo de Contrato:",
-    options=sorted(periodos),
-    default=sorted(periodos)
-)
+    # Pool de threads para montar as figuras de cada seção em paralelo, compartilhado
+    # entre sessões (MAPA_TRABALHADORES workers; None quando 1: tudo em sequência)
+    @st.cache_resource
+    def load_executor():
+        return paralelo.criar_executor()
+
+    # Banco SQLite em esquema estrela gerado pelo ETL (usado com MAPA_BACKEND=sql)
+    @st.cache_resource
+    def load_banco():
+        return BancoSalarios(CAMINHO_BANCO_APP)
+
+    # Visões pré-calculadas com MAPA_BACKEND=sql (no modo pandas vêm com a versão da base)
+    @st.cache_resource
+    def load_visoes():
+        # Validadas também contra o banco consultado, não só contra os arquivos de DIRETORIO_DADOS
+        return visoes.abrir(DIRETORIO_DADOS, CAMINHO_BANCO_APP)
+
+    # Modo das abas: "seletor" (padrão) calcula só a aba ativa; "tabs" usa st.tabs e calcula todas
+    MODO_ABAS = os.environ.get("MAPA_ABAS", "seletor")
 
-# Aplicar filtros
-df_filtrado = df.copy()
-if anos_selecionados:
-    df_filtrado = df_filtrado[df_filtrado['ano'].isin(anos_selecionados)]
-if senioridades_selecionadas:
-    df_filtrado = df_filtrado[df_filtrado['senoridade'].isin(senioridades_selecionadas)]
-if cargos_selecionados:
-    df_filtrado = df_filtrado[df_filtrado['cargo'].isin(cargos_selecionados)]
-if modalidades_selecionadas:
-    df_filtrado = df_filtrado[df_filtrado['modalidade'].isin(modalidades_selecionadas)]
-if tamanhos_selecionados:
-    df_filtrado = df_filtrado[df_filtrado['tamanho_empresa'].isin(tamanhos_selecionados)]
-if periodos_selecionados:
-    df_filtrado = df_filtrado[df_filtrado['periodo'].isin(periodos_selecionados)]
-
-# Seção de KPIs
-st.markdown("---")
-st.header("📈 Visão Geral do Mercado")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    salario_medio = df_filtrado['salario_em_dolar_americano'].mean()
-    salario_medio_geral = df['salario_em_dolar_americano'].mean()
-    diferenca = salario_medio - salario_medio_geral
-    st.metric(
-        label="💰 Salário Médio (USD)",
-        value=f"${salario_medio:,.0f}",
-        delta=f"${diferenca:,.0f}" if not np.isnan(diferenca) else None
+    # Metadados do ETL (opções dos filtros e contagens do rodapé): a sidebar é
+    # montada antes de carregar a base
+    with perfil.secao("metadados"):
+        # Com a base já carregada neste processo, os metadados da versão atual
+        versao = load_atualizador().versao if BACKEND != "sql" else None
+        metadados = versao.conteudo['metadados'] if versao is not None else load_metadados()
+        opcoes = metadados['opcoes']
+        base = metadados['resumo']
+
+    # Título principal
+    st.title("🚀 Guia de Carreira em Dados")
+    st.markdown("""
+**Descubra oportunidades, salários e tendências para iniciar ou evoluir na área de dados**
+""")
+
+    # Sidebar com filtros
+    st.sidebar.header("🎯 Filtros")
+
+    # Filtro por ano
+    anos_disponiveis = opcoes['ano']
+    anos_selecionados = st.sidebar.multiselect(
+        "Selecione os anos:",
+        options=anos_disponiveis,
+        default=anos_disponiveis
     )
 
-with col2:
-    total_registros = len(df_filtrado)
-    st.metric(
-        label="📊 Oportunidades",
-        value=f"{total_registros:,}",
-        delta=f"{len(df_filtrado) - len(df):,}" if len(df_filtrado) != len(df) else None
+    # Filtro por senioridade (note: 'senoridade' sem 'i')
+    senioridades = opcoes['senoridade']
+    senioridades_selecionadas = st.sidebar.multiselect(
+        "Nível de Experiência:",
+        options=sorted(senioridades),
+        default=sorted(senioridades)
     )
 
-with col3:
-    perc_remoto = (df_filtrado['modalidade'] == 'Remoto').sum() / len(df_filtrado) * 100
-    st.metric(
-        label="🏠 % Trabalho Remoto",
-        value=f"{perc_remoto:.1f}%"
+    # Filtro por cargo (com search)
+    cargos_disponiveis = opcoes['cargo']
+    cargos_selecionados = st.sidebar.multiselect(
+        "Cargos:",
+        options=cargos_disponiveis,
+        default=cargos_disponiveis[:10] if len(cargos_disponiveis) > 10 else cargos_disponiveis
     )
 
-with col4:
-    perc_junior = (df_filtrado['senoridade'] == 'Júnior').sum() / len(df_filtrado) * 100
-    st.metric(
-        label="🎯 % Vagas Júnior",
-        value=f"{perc_junior:.1f}%"
+    # Filtro por modalidade de trabalho
+    modalidades = opcoes['modalidade']
+    modalidades_selecionadas = st.sidebar.multiselect(
+        "Modalidade de Trabalho:",
+        options=sorted(modalidades),
+        default=sorted(modalidades)
     )
 
-# Tabs para diferentes análises
-tab1, tab2, tab3, tab4 = st.tabs([
-    "💰 Análise Salarial", 
-    "📍 Localização e Empresas", 
-    "📈 Tendências Temporais", 
-    "🚀 Para Iniciantes"
-])
-
-# Tab 1: Análise Salarial
-with tab1:
-    st.header("💰 Análise Salarial por Cargo e Experiência")
-    
-    col1, col2 = st.columns(2)
-    
+    # Filtro por tamanho da empresa
+    tamanhos_empresa = opcoes['tamanho_empresa']
+    tamanhos_selecionados = st.sidebar.multiselect(
+        "Tamanho da Empresa:",
+        options=sorted(tamanhos_empresa),
+        default=sorted(tamanhos_empresa)
+    )
+
+    # Filtro por período/tipo de contrato
+    periodos = opcoes['periodo']
+    periodos_selecionados = st.sidebar.multiselect(
+        "Tipo de Contrato:",
+        options=sorted(periodos),
+        default=sorted(periodos)
+    )
+
+    # Carregar dados (depois da sidebar, que já pode aparecer na tela)
+    with perfil.secao("carregar dados"):
+        cache_resultados = load_cache_resultados()
+        cache_figuras = load_cache_figuras()
+        executor = load_executor()
+
+        if BACKEND == "sql":
+            banco = load_banco()
+            filtrar_celulas = banco.celulas
+            filtrar_esbocos = banco.esbocos
+            celulas_total = banco.celulas
+            registros = banco.registros
+            armazem_visoes = load_visoes()
+            memoria_base = f"{banco.tamanho_arquivo() / 2**20:.1f} MB em disco (SQLite, filtros e agregações no SQL)"
+        else:
+            # A versão fica fixa até o fim do rerun: uma troca em segundo plano só vale no próximo
+            if versao is None:
+                versao = load_atualizador().atual()
+            df = versao.conteudo['df']
+            indice = versao.conteudo['indice']
+            cubo_salarios = versao.conteudo['cubo']
+            filtrar_celulas = cubo_salarios.filtrar
+            filtrar_esbocos = cubo_salarios.filtrar_esbocos
+            celulas_total = lambda: cubo_salarios.celulas
+            # Vista só com as colunas dos painéis: o take copia apenas as linhas selecionadas dessas colunas
+            df_registros = df[COLUNAS_REGISTROS]
+            registros = lambda selecoes: indice.filtrar(df_registros, selecoes)
+            armazem_visoes = versao.conteudo['visoes']
+            memoria_base = f"{uso_memoria(df) / 2**20:.1f} MB (schema categórico compacto)"
+
+    # Aplicar filtros (OR dentro da coluna, AND entre colunas; seleção vazia não filtra)
+    selecoes = {
+        'ano': anos_selecionados,
+        'senoridade': senioridades_selecionadas,
+        'cargo': cargos_selecionados,
+        'modalidade': modalidades_selecionadas,
+        'tamanho_empresa': tamanhos_selecionados,
+        'periodo': periodos_selecionados,
+    }
+    with perfil.secao("filtros"):
+        celulas = filtrar_celulas(selecoes)
+
+    # Seção de KPIs
+    st.markdown("---")
+    st.header("📈 Visão Geral do Mercado")
+
+    # Resultados por seção, cacheados pela versão da base e seleção normalizada (compartilhados entre sessões)
+    chave_visao = chave_selecao(selecoes)
+    chave = f"{versao.numero if versao else 0}:{chave_visao}"
+    df_filtrado = None
+    lock_registros = threading.Lock()
+
+    def filtrar_registros():
+        # Os registros filtrados só são materializados quando alguma seção não está no cache
+        # (uma vez por rerun, mesmo com seções calculadas em paralelo; ninguém os altera depois)
+        global df_filtrado
+        with lock_registros:
+            if df_filtrado is None:
+                with perfil.secao("registros filtrados"):
+                    df_filtrado = registros(selecoes)
+        return df_filtrado
+
+    def grafico(resultado, nome):
+        # Envio da figura (JSON do Plotly já serializado) medido como seção própria
+        with perfil.secao(nome):
+            figuras.plotly_json(resultado[nome])
+
+    # Importado só aqui: o plotly.express (via paineis/graficos, ~0,5 s na primeira
+    # importação) carrega depois que título e sidebar já foram enviados ao navegador.
+    # O plotly.graph_objects não entra nessa conta: o próprio Streamlit já o importa
+    import paineis
+
+    # Somas do cubo de cada seção para a última seleção que esta sessão calculou: quando
+    # só um filtro muda, são atualizadas somando/subtraindo as células dos valores
+    # adicionados/removidos (cubo.agregar_incremental). O dicionário é pego aqui, na
+    # thread do script, e usado pelas seções também nos workers do executor
+    somas_sessao = st.session_state.setdefault("somas_secoes", {})
+    versao_somas = versao.numero if versao else 0
+
+    def agregados(secao):
+        with perfil.secao("agregados do cubo"):
+            versao_anterior, estado = somas_sessao.get(secao, (None, None))
+            if versao_anterior != versao_somas:
+                estado = None
+            estado, resultado = cubo.agregar_incremental(
+                estado, paineis.PEDIDOS[secao], selecoes, celulas, filtrar_celulas, opcoes
+            )
+            somas_sessao[secao] = (versao_somas, estado)
+        return resultado
+
+    # Cálculo de cada seção; as figuras independentes de uma seção vão para o executor
+    # e as que já estão no cache de figuras não são montadas de novo
+    calculos = {
+        'analise_salarial': lambda: paineis.analise_salarial(
+            filtrar_registros(), celulas, filtrar_esbocos(selecoes), executor, cache_figuras, agregados('analise_salarial')
+        ),
+        'localizacao_empresas': lambda: paineis.localizacao_empresas(
+            filtrar_registros(), celulas, filtrar_esbocos(selecoes), executor, cache_figuras, agregados('localizacao_empresas')
+        ),
+        'tendencias': lambda: paineis.tendencias(celulas, executor, cache_figuras, agregados('tendencias')),
+        'iniciantes': lambda: paineis.iniciantes(filtrar_registros(), executor, cache_figuras),
+    }
+    # Seções já agendadas no executor neste rerun (modo "tabs")
+    adiantados = {}
+
+    def da_visao(secao, calcular_ao_vivo):
+        # Numa falha do cache de resultados: visão pré-calculada (visoes.py) se houver, senão cálculo ao vivo
+        if armazem_visoes is not None:
+            with perfil.secao("visão pré-calculada"):
+                resultado = armazem_visoes.obter(chave_visao, secao)
+            if resultado is not None:
+                return resultado
+        return calcular_ao_vivo()
+
+    def calcular(secao):
+        # Resultado da seção pelo cache; se já foi agendada, só espera o worker
+        with perfil.secao("calcular"):
+            if secao in adiantados:
+                return adiantados[secao].result()
+            return cache_resultados.obter((secao, chave), lambda: da_visao(secao, calculos[secao]))
+
+    with perfil.secao("kpis"):
+        resultado_kpis = cache_resultados.obter(
+            ('kpis', chave), lambda: da_visao('kpis', lambda: paineis.kpis(celulas, celulas_total(), agregados('kpis')))
+        )
+
+    col1, col2, col3, col4 = st.columns(4)
+
     with col1:
-        # Top 10 cargos melhor pagos
-        top_cargos = df_filtrado.groupby('cargo')['salario_em_dolar_americano'].agg(['mean', 'count']).reset_index()
-        top_cargos = top_cargos.sort_values('mean', ascending=False).head(10)
-        
-        fig1 = px.bar(
-            top_cargos,
-            x='mean',
-            y='cargo',
-            orientation='h',
-            title='Top 10 Cargos Melhor Remunerados',
-            labels={'mean': 'Salário Médio (USD)', 'cargo': 'Cargo'},
-            color='mean',
-            color_continuous_scale='Viridis',
-            hover_data=['count']
+        salario_medio = resultado_kpis['salario_medio']
+        salario_medio_geral = resultado_kpis['salario_medio_geral']
+        diferenca = salario_medio - salario_medio_geral
+        st.metric(
+            label="💰 Salário Médio (USD)",
+            value=f"${salario_medio:,.0f}",
+            delta=f"${diferenca:,.0f}" if not np.isnan(diferenca) else None
         )
-        fig1.update_layout(height=500)
-        st.plotly_chart(fig1, use_container_width=True)
-    
+
     with col2:
-        # Distribuição salarial por senioridade
-        # Ordem personalizada para senioridade
-        ordem_senioridade = ['Júnior', 'Pleno', 'Sênior', 'Executivo']
-        df_filtrado['senoridade'] = pd.Categorical(
-            df_filtrado['senoridade'], 
-            categories=ordem_senioridade, 
-            ordered=True
+        total_registros = resultado_kpis['total_registros']
+        st.metric(
+            label="📊 Oportunidades",
+            value=f"{total_registros:,}",
+            delta=f"{total_registros - base['registros']:,}" if total_registros != base['registros'] else None
         )
-        
-        fig2 = px.box(
-            df_filtrado.sort_values('senoridade'),
-            x='senoridade',
-            y='salario_em_dolar_americano',
-            title='Distribuição Salarial por Nível de Senioridade',
-            labels={'senoridade': 'Nível', 'salario_em_dolar_americano': 'Salário (USD)'},
-            color='senoridade',
-            color_discrete_sequence=px.colors.qualitative.Set2
-        )
-        fig2.update_layout(height=500, showlegend=False)
-        st.plotly_chart(fig2, use_container_width=True)
-    
-    # Salário vs Modalidade de Trabalho
-    st.subheader("💼 Salário vs Modalidade de Trabalho")
-    
-    col3, col4 = st.columns(2)
-    
+
     with col3:
-        # Salário médio por modalidade
-        salario_modalidade = df_filtrado.groupby('modalidade')['salario_em_dolar_americano'].agg(['mean', 'median', 'count']).reset_index()
-        salario_modalidade = salario_modalidade.sort_values('mean', ascending=False)
-        
-        fig3 = px.bar(
-            salario_modalidade,
-            x='modalidade',
-            y='mean',
-            title='Salário Médio por Modalidade de Trabalho',
-            labels={'mean': 'Salário Médio (USD)', 'modalidade': 'Modalidade'},
-            color='mean',
-            color_continuous_scale='Blues',
-            hover_data=['count']
+        perc_remoto = resultado_kpis['perc_remoto']
+        st.metric(
+            label="🏠 % Trabalho Remoto",
+            value=f"{perc_remoto:.1f}%"
         )
-        fig3.update_layout(height=400)
-        st.plotly_chart(fig3, use_container_width=True)
-    
+
     with col4:
-        # Scatter plot: experiência vs salário colorido por modalidade
-        # Converter senioridade para numérico para análise
-        senioridade_map = {'Júnior': 1, 'Pleno': 2, 'Sênior': 3, 'Executivo': 4}
-        df_filtrado['senoridade_numerico'] = df_filtrado['senoridade'].map(senioridade_map)
-        
-        fig4 = px.scatter(
-            df_filtrado,
-            x='senoridade_numerico',
-            y='salario_em_dolar_americano',
-            color='modalidade',
-            size='salario_em_dolar_americano',
-            hover_data=['cargo', 'tamanho_empresa'],
-            title='Relação: Senioridade vs Salário vs Modalidade',
-            labels={
-                'senoridade_numerico': 'Nível de Senioridade (1=Júnior, 4=Executivo)',
-                'salario_em_dolar_americano': 'Salário (USD)',
-                'modalidade': 'Modalidade'
-            },
-            category_orders={'modalidade': ['Presencial', 'Híbrido', 'Remoto']}
+        perc_junior = resultado_kpis['perc_junior']
+        st.metric(
+            label="🎯 % Vagas Júnior",
+            value=f"{perc_junior:.1f}%"
         )
-        fig4.update_layout(height=400)
-        st.plotly_chart(fig4, use_container_width=True)
 
-# Tab 2: Localização e Empresas
-with tab2:
-    st.header("📍 Análise por Localização e Empresa")
-    
-    col1, col2 = st.columns(2)
+    # Tab 1: Análise Salarial
+    def tab_analise_salarial():
+        st.header("💰 Análise Salarial por Cargo e Experiência")
+        resultado = calcular('analise_salarial')
     
-    with col1:
-        # Top países das empresas com maiores salários
-        top_paises = df_filtrado.groupby('localizacao_empresa')['salario_em_dolar_americano'].agg(['mean', 'count']).reset_index()
-        top_paises = top_paises[top_paises['count'] >= 5]  # Filtra países com pelo menos 5 registros
-        top_paises = top_paises.sort_values('mean', ascending=False).head(15)
-        
-        fig5 = px.bar(
-            top_paises,
-            x='mean',
-            y='localizacao_empresa',
-            orientation='h',
-            title='Top 15 Países (Empresa) com Maiores Salários',
-            labels={'mean': 'Salário Médio (USD)', 'localizacao_empresa': 'País da Empresa'},
-            color='mean',
-            color_continuous_scale='Blues',
-            hover_data=['count']
-        )
-        fig5.update_layout(height=500)
-        st.plotly_chart(fig5, use_container_width=True)
+        col1, col2 = st.columns(2)
     
-    with col2:
-        # Distribuição por tamanho da empresa
-        fig6 = px.pie(
-            df_filtrado,
-            names='tamanho_empresa',
-            title='Distribuição por Tamanho da Empresa',
-            hole=0.4,
-            color='tamanho_empresa',
-            category_orders={'tamanho_empresa': ['Pequeno', 'Médio', 'Grande']}
-        )
-        fig6.update_layout(height=400)
-        st.plotly_chart(fig6, use_container_width=True)
-        
-        # Salário médio por tamanho da empresa
-        st.subheader("🏢 Salário por Tamanho da Empresa")
-        salario_tamanho = df_filtrado.groupby('tamanho_empresa')['salario_em_dolar_americano'].agg(['mean', 'median', 'count']).round(0)
-        salario_tamanho = salario_tamanho.sort_values('mean', ascending=False)
-        
-        # Exibir como tabela formatada
-        st.dataframe(
-            salario_tamanho.style.format({
-                "mean": "${:,.0f}", 
-                "median": "${:,.0f}",
-                "count": "{:,.0f}"
-            }).background_gradient(cmap='Blues', subset=['mean', 'median'])
-        )
+        with col1:
+            # Top 10 cargos melhor pagos
+            grafico(resultado, 'fig1')
     
-    # Análise de residência vs localização da empresa
-    st.subheader("🌍 Relação Residência vs Localização da Empresa")
+        with col2:
+            # Distribuição salarial por senioridade
+            grafico(resultado, 'fig2')
     
-    if 'residencia' in df_filtrado.columns and 'localizacao_empresa' in df_filtrado.columns:
-        # Contar casos onde residência ≠ local empresa (trabalho remoto internacional)
-        df_filtrado['trabalho_internacional'] = df_filtrado['residencia'] != df_filtrado['localizacao_empresa']
-        
-        col5, col6 = st.columns(2)
-        
-        with col5:
-            # Percentual de trabalho internacional
-            perc_internacional = df_filtrado['trabalho_internacional'].mean() * 100
-            
-            fig7 = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=perc_internacional,
-                title={'text': "% Trabalho Internacional"},
-                gauge={
-                    'axis': {'range': [None, 100]},
-                    'bar': {'color': "darkgreen"},
-                    'steps': [
-                        {'range': [0, 33], 'color': "lightgreen"},
-                        {'range': [33, 66], 'color': "yellow"},
-                        {'range': [66, 100], 'color': "orange"}
-                    ]
-                }
-            ))
-            fig7.update_layout(height=250)
-            st.plotly_chart(fig7, use_container_width=True)
-        
-        with col6:
-            # Salário comparativo: internacional vs local
-            salario_comparativo = df_filtrado.groupby('trabalho_internacional')['salario_em_dolar_americano'].mean().reset_index()
-            salario_comparativo['trabalho_internacional'] = salario_comparativo['trabalho_internacional'].map({True: 'Internacional', False: 'Local'})
-            
-            fig8 = px.bar(
-                salario_comparativo,
-                x='trabalho_internacional',
-                y='salario_em_dolar_americano',
-                title='Salário: Trabalho Internacional vs Local',
-                labels={'salario_em_dolar_americano': 'Salário Médio (USD)', 'trabalho_internacional': 'Tipo'},
-                color='trabalho_internacional',
-                color_discrete_sequence=['green', 'blue']
-            )
-            fig8.update_layout(height=250, showlegend=False)
-            st.plotly_chart(fig8, use_container_width=True)
-
-# Tab 3: Tendências Temporais
-with tab3:
-    st.header("📈 Tendências e Evolução do Mercado")
+        # Salário vs Modalidade de Trabalho
+        st.subheader("💼 Salário vs Modalidade de Trabalho")
     
-    # Evolução salarial ao longo dos anos
-    evolucao_salario = df_filtrado.groupby('ano')['salario_em_dolar_americano'].agg(['mean', 'median', 'std', 'count']).reset_index()
+        col3, col4 = st.columns(2)
     
-    fig9 = px.line(
-        evolucao_salario,
-        x='ano',
-        y='mean',
-        title='Evolução do Salário Médio (USD)',
-        labels={'ano': 'Ano', 'mean': 'Salário Médio (USD)'},
-        markers=True,
-        line_shape='spline'
-    )
+        with col3:
+            # Salário médio por modalidade
+            grafico(resultado, 'fig3')
     
-    # Adicionar banda de desvio padrão
-    fig9.add_trace(go.Scatter(
-        x=evolucao_salario['ano'].tolist() + evolucao_salario['ano'].tolist()[::-1],
-        y=(evolucao_salario['mean'] + evolucao_salario['std']).tolist() + 
-           (evolucao_salario['mean'] - evolucao_salario['std']).tolist()[::-1],
-        fill='toself',
-        fillcolor='rgba(0,100,80,0.2)',
-        line=dict(color='rgba(255,255,255,0)'),
-        name='Desvio Padrão'
-    ))
+        with col4:
+            # Scatter plot: experiência vs salário colorido por modalidade
+            grafico(resultado, 'fig4')
+
+    # Tab 2: Localização e Empresas
+    def tab_localizacao_empresas():
+        st.header("📍 Análise por Localização e Empresa")
+        resultado = calcular('localizacao_empresas')
     
-    fig9.update_layout(height=400)
-    st.plotly_chart(fig9, use_container_width=True)
+        col1, col2 = st.columns(2)
     
-    col1, col2 = st.columns(2)
+        with col1:
+            # Top países das empresas com maiores salários
+            grafico(resultado, 'fig5')
     
-    with col1:
-        # Evolução da modalidade de trabalho
-        evolucao_modalidade = pd.crosstab(df_filtrado['ano'], df_filtrado['modalidade'], normalize='index') * 100
+        with col2:
+            # Distribuição por tamanho da empresa
+            grafico(resultado, 'fig6')
         
-        fig10 = px.area(
-            evolucao_modalidade,
-            title='Evolução das Modalidades de Trabalho (%)',
-            labels={'value': 'Percentual (%)', 'ano': 'Ano', 'modalidade': 'Modalidade'},
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        fig10.update_layout(height=350)
-        st.plotly_chart(fig10, use_container_width=True)
-    
-    with col2:
-        # Evolução da distribuição por tamanho da empresa
-        evolucao_tamanho = pd.crosstab(df_filtrado['ano'], df_filtrado['tamanho_empresa'], normalize='index') * 100
+            # Salário médio por tamanho da empresa
+            st.subheader("🏢 Salário por Tamanho da Empresa")
         
-        fig11 = px.line(
-            evolucao_tamanho,
-            title='Evolução do Tamanho das Empresas (%)',
-            markers=True,
-            color_discrete_sequence=px.colors.qualitative.Bold
-        )
-        fig11.update_layout(height=350)
-        st.plotly_chart(fig11, use_container_width=True)
-    
-    # Heatmap: Salário por ano e senioridade
-    st.subheader("🔥 Heatmap: Salário por Ano e Senioridade")
+            # Exibir como tabela formatada
+            with perfil.secao("salario_tamanho"):
+                st.dataframe(
+                    resultado['salario_tamanho'].style.format({
+                        "mean": "${:,.0f}", 
+                        "median": "${:,.0f}",
+                        "count": "{:,.0f}"
+                    }).background_gradient(cmap='Blues', subset=['mean', 'median'])
+                )
+    
+        # Análise de residência vs localização da empresa
+        st.subheader("🌍 Relação Residência vs Localização da Empresa")
+    
+        if resultado['fig7'] is not None:
+            col5, col6 = st.columns(2)
+        
+            with col5:
+                # Percentual de trabalho internacional
+                grafico(resultado, 'fig7')
+        
+            with col6:
+                # Salário comparativo: internacional vs local
+                grafico(resultado, 'fig8')
+
+    # Tab 3: Tendências Temporais
+    def tab_tendencias():
+        st.header("📈 Tendências e Evolução do Mercado")
+        resultado = calcular('tendencias')
     
-    heatmap_data = df_filtrado.pivot_table(
-        values='salario_em_dolar_americano',
-        index='senoridade',
-        columns='ano',
-        aggfunc='mean'
-    )
+        # Evolução salarial ao longo dos anos
+        grafico(resultado, 'fig9')
     
-    # Reordenar as linhas
-    heatmap_data = heatmap_data.reindex(['Júnior', 'Pleno', 'Sênior', 'Executivo'])
+        col1, col2 = st.columns(2)
     
-    fig12 = px.imshow(
-        heatmap_data,
-        title='Salário Médio por Ano e Senioridade (USD)',
-        labels=dict(x="Ano", y="Senioridade", color="Salário (USD)"),
-        color_continuous_scale='RdBu_r',
-        aspect="auto"
-    )
+        with col1:
+            # Evolução da modalidade de trabalho
+            grafico(resultado, 'fig10')
     
-    # Adicionar valores no heatmap
-    fig12.update_traces(text=heatmap_data.round(0), texttemplate="%{text}")
+        with col2:
+            # Evolução da distribuição por tamanho da empresa
+            grafico(resultado, 'fig11')
     
-    fig12.update_layout(height=300)
-    st.plotly_chart(fig12, use_container_width=True)
+        # Heatmap: Salário por ano e senioridade
+        st.subheader("🔥 Heatmap: Salário por Ano e Senioridade")
+        grafico(resultado, 'fig12')
 
-# Tab 4: Para Iniciantes
-with tab4:
-    st.header("🚀 Guia Prático para Iniciantes")
+    # Tab 4: Para Iniciantes
+    def tab_iniciantes():
+        st.header("🚀 Guia Prático para Iniciantes")
     
-    # Filtrar apenas vagas Júnior
-    df_junior = df_filtrado[df_filtrado['senoridade'] == 'Júnior']
+        # Apenas vagas Júnior (None quando não há nenhuma com os filtros atuais)
+        resultado = calcular('iniciantes')
     
-    if len(df_junior) > 0:
-        col1, col2 = st.columns(2)
+        if resultado is not None:
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.subheader("🎯 Cargos de Entrada Mais Comuns")
-            
-            # Top cargos para juniors
-            top_junior_cargos = df_junior['cargo'].value_counts().head(15).reset_index()
-            top_junior_cargos.columns = ['Cargo', 'Quantidade']
+            with col1:
+                st.subheader("🎯 Cargos de Entrada Mais Comuns")
             
-            fig13 = px.bar(
-                top_junior_cargos,
-                x='Quantidade',
-                y='Cargo',
-                orientation='h',
-                title='Top 15 Cargos para Iniciantes',
-                color='Quantidade',
-                color_continuous_scale='Greens',
-                hover_data=['Quantidade']
-            )
-            fig13.update_layout(height=500)
-            st.plotly_chart(fig13, use_container_width=True)
+                # Top cargos para juniors
+                grafico(resultado, 'fig13')
         
-        with col2:
-            st.subheader("💰 Análise Salarial para Iniciantes")
-            
-            # Box plot salarial para juniors por cargo (top 5)
-            top_5_cargos_junior = df_junior['cargo'].value_counts().head(5).index.tolist()
-            df_top5_junior = df_junior[df_junior['cargo'].isin(top_5_cargos_junior)]
+            with col2:
+                st.subheader("💰 Análise Salarial para Iniciantes")
             
-            fig14 = px.box(
-                df_top5_junior,
-                x='cargo',
-                y='salario_em_dolar_americano',
-                title='Distribuição Salarial - Top 5 Cargos Júnior',
-                labels={'salario_em_dolar_americano': 'Salário (USD)', 'cargo': 'Cargo'},
-                color='cargo',
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig14.update_layout(height=500, showlegend=False)
-            st.plotly_chart(fig14, use_container_width=True)
+                # Box plot salarial para juniors por cargo (top 5)
+                grafico(resultado, 'fig14')
         
-        # Insights detalhados para iniciantes
-        st.markdown("---")
-        st.subheader("📊 Estatísticas Detalhadas para Cargos Júnior")
+            # Insights detalhados para iniciantes
+            st.markdown("---")
+            st.subheader("📊 Estatísticas Detalhadas para Cargos Júnior")
         
-        # Calcular estatísticas para cargos júnior
-        stats_junior = df_junior.groupby('cargo').agg({
-            'salario_em_dolar_americano': ['mean', 'median', 'min', 'max', 'count'],
-            'modalidade': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'N/A',
-            'tamanho_empresa': lambda x: x.mode()[0] if len(x.mode()) > 0 else 'N/A'
-        }).round(0)
+            # Formatar a tabela
+            with perfil.secao("stats_junior"):
+                st.dataframe(
+                    resultado['stats_junior'].style.format({
+                        "Média": "${:,.0f}",
+                        "Mediana": "${:,.0f}",
+                        "Mínimo": "${:,.0f}",
+                        "Máximo": "${:,.0f}",
+                        "Quantidade": "{:,.0f}"
+                    }).background_gradient(cmap='Greens', subset=['Média', 'Mediana'])
+                )
         
-        # Renomear colunas
-        stats_junior.columns = ['Média', 'Mediana', 'Mínimo', 'Máximo', 'Quantidade', 'Modalidade_Mais_Comum', 'Tamanho_Empresa_Mais_Comum']
-        stats_junior = stats_junior.sort_values('Quantidade', ascending=False).head(10)
+            # Recomendações personalizadas
+            st.markdown("---")
+            st.subheader("💡 Recomendações Baseadas nos Dados")
         
-        # Formatar a tabela
-        st.dataframe(
-            stats_junior.style.format({
-                "Média": "${:,.0f}",
-                "Mediana": "${:,.0f}",
-                "Mínimo": "${:,.0f}",
-                "Máximo": "${:,.0f}",
-                "Quantidade": "{:,.0f}"
-            }).background_gradient(cmap='Greens', subset=['Média', 'Mediana'])
-        )
+            col_a, col_b, col_c = st.columns(3)
         
-        # Recomendações personalizadas
-        st.markdown("---")
-        st.subheader("💡 Recomendações Baseadas nos Dados")
-        
-        col_a, col_b, col_c = st.columns(3)
-        
-        with col_a:
-            # Cargo com melhor salário médio para juniors
-            melhor_salario_junior = stats_junior.sort_values('Média', ascending=False).iloc[0]
-            st.success(f"""
+            with col_a:
+                # Cargo com melhor salário médio para juniors
+                melhor_salario_junior = resultado['melhor_salario_junior']
+                st.success(f"""
             **🏆 Melhor Oportunidade Salarial:**
             - **Cargo:** {melhor_salario_junior.name}
             - **Salário Médio:** ${melhor_salario_junior['Média']:,.0f}
             - **Oportunidades:** {melhor_salario_junior['Quantidade']} vagas
             """)
         
-        with col_b:
-            # Cargo com mais oportunidades
-            mais_oportunidades = stats_junior.sort_values('Quantidade', ascending=False).iloc[0]
-            st.info(f"""
+            with col_b:
+                # Cargo com mais oportunidades
+                mais_oportunidades = resultado['mais_oportunidades']
+                st.info(f"""
             **📈 Maior Demanda:**
             - **Cargo:** {mais_oportunidades.name}
             - **Oportunidades:** {mais_oportunidades['Quantidade']} vagas
@@ -522,26 +497,26 @@ with tab4:
             - **Empresas:** Principalmente {mais_oportunidades['Tamanho_Empresa_Mais_Comum'].lower()}
             """)
         
-        with col_c:
-            # Modalidade mais comum para juniors
-            modalidade_junior = df_junior['modalidade'].value_counts(normalize=True).head(1)
-            st.warning(f"""
+            with col_c:
+                # Modalidade mais comum para juniors
+                modalidade_junior = resultado['modalidade_junior']
+                st.warning(f"""
             **🏢 Modalidade Predominante:**
             - **{modalidade_junior.index[0]}:** {modalidade_junior.iloc[0]*100:.1f}%
             - Dica: Prepare-se para esta modalidade
             - Desenvolva habilidades de comunicação adequadas
             """)
     
-    else:
-        st.warning("⚠️ Nenhuma vaga Júnior encontrada com os filtros atuais. Tente ajustar os filtros na sidebar.")
+        else:
+            st.warning("⚠️ Nenhuma vaga Júnior encontrada com os filtros atuais. Tente ajustar os filtros na sidebar.")
     
-    # Plano de ação
-    st.markdown("---")
-    st.subheader("🎯 Plano de Ação em 4 Passos")
+        # Plano de ação
+        st.markdown("---")
+        st.subheader("🎯 Plano de Ação em 4 Passos")
     
-    steps = st.container()
-    with steps:
-        st.markdown("""
+        steps = st.container()
+        with steps:
+            st.markdown("""
         ### **Passo 1: Desenvolva o Core Técnico**
         ```python
         # Habilidades essenciais (confirmadas pelos dados):
@@ -567,64 +542,68 @@ with tab4:
         - **Soft Skills:** Desenvolva comunicação de dados
         """)
     
-    # Comparação Júnior vs Mercado
-    if len(df_junior) > 0:
-        st.markdown("---")
-        st.subheader("📊 Comparação: Júnior vs Mercado Total")
-        
-        comparacao = pd.DataFrame({
-            'Métrica': ['Salário Médio', '% Remoto', '% Híbrido', '% Presencial', 'Empresas Médias/Grandes'],
-            'Júnior': [
-                df_junior['salario_em_dolar_americano'].mean(),
-                (df_junior['modalidade'] == 'Remoto').mean() * 100,
-                (df_junior['modalidade'] == 'Híbrido').mean() * 100,
-                (df_junior['modalidade'] == 'Presencial').mean() * 100,
-                (df_junior['tamanho_empresa'].isin(['Médio', 'Grande'])).mean() * 100
-            ],
-            'Mercado Total': [
-                df_filtrado['salario_em_dolar_americano'].mean(),
-                (df_filtrado['modalidade'] == 'Remoto').mean() * 100,
-                (df_filtrado['modalidade'] == 'Híbrido').mean() * 100,
-                (df_filtrado['modalidade'] == 'Presencial').mean() * 100,
-                (df_filtrado['tamanho_empresa'].isin(['Médio', 'Grande'])).mean() * 100
-            ]
-        })
-        
-        fig15 = px.bar(
-            comparacao.melt(id_vars='Métrica'),
-            x='Métrica',
-            y='value',
-            color='variable',
-            barmode='group',
-            title='Comparação: Iniciantes vs Mercado Total',
-            labels={'value': 'Valor', 'variable': 'Grupo'},
-            color_discrete_sequence=['green', 'blue']
+        # Comparação Júnior vs Mercado
+        if resultado is not None:
+            st.markdown("---")
+            st.subheader("📊 Comparação: Júnior vs Mercado Total")
+            grafico(resultado, 'fig15')
+
+    # Tabs para diferentes análises
+    abas = {
+        "💰 Análise Salarial": tab_analise_salarial,
+        "📍 Localização e Empresas": tab_localizacao_empresas,
+        "📈 Tendências Temporais": tab_tendencias,
+        "🚀 Para Iniciantes": tab_iniciantes,
+    }
+
+    if MODO_ABAS == "tabs":
+        # st.tabs só controla a visibilidade: as quatro abas são calculadas a cada rerun.
+        # Com executor, as quatro são agendadas de uma vez e renderizadas na ordem da página
+        if executor is not None:
+            for secao in calculos:
+                adiantados[secao] = paralelo.submeter(
+                    lambda secao=secao: cache_resultados.obter((secao, chave), lambda: da_visao(secao, calculos[secao])),
+                    executor
+                )
+        for aba, (nome, renderizar) in zip(st.tabs(list(abas)), abas.items()):
+            with aba, perfil.secao(nome):
+                renderizar()
+    else:
+        # Seletor guardado no session_state: só a aba ativa é calculada; as demais
+        # continuam no cache de resultados desde o último cálculo
+        aba_ativa = st.radio(
+            "Seção",
+            options=list(abas),
+            key="aba_ativa",
+            horizontal=True,
+            label_visibility="collapsed"
         )
-        fig15.update_layout(height=400, xaxis_tickangle=-45)
-        st.plotly_chart(fig15, use_container_width=True)
+        with perfil.secao(aba_ativa):
+            abas[aba_ativa]()
 
-# Rodapé e informações adicionais
-st.markdown("---")
-st.markdown("""
+    # Rodapé e informações adicionais
+    st.markdown("---")
+    st.markdown("""
 <div style='text-align: center; color: gray;'>
     <p>📊 Dashboard desenvolvido para análise de carreira em dados • Dados: {ano_min} - {ano_max}</p>
     <p>🎯 Use os filtros na sidebar para explorar diferentes perspectivas do mercado</p>
     <p>💡 Dica: Compare diferentes anos para identificar tendências</p>
 </div>
 """.format(
-    ano_min=df['ano'].min(),
-    ano_max=df['ano'].max()
-), unsafe_allow_html=True)
+        ano_min=base['ano_min'],
+        ano_max=base['ano_max']
+    ), unsafe_allow_html=True)
 
-# Expander com informações técnicas
-with st.expander("📋 Informações Técnicas e Metodologia"):
-    st.markdown(f"""
+    # Expander com informações técnicas
+    with st.expander("📋 Informações Técnicas e Metodologia"):
+        st.markdown(f"""
     ### **📊 Estatísticas do Dataset:**
-    - **Período:** {df['ano'].min()} - {df['ano'].max()}
-    - **Total de registros:** {len(df):,}
-    - **Cargos únicos:** {df['cargo'].nunique()}
-    - **Países únicos (empresa):** {df['localizacao_empresa'].nunique()}
-    - **Moedas únicas:** {df['moeda_salario'].nunique()}
+    - **Período:** {base['ano_min']} - {base['ano_max']}
+    - **Total de registros:** {base['registros']:,}
+    - **Cargos únicos:** {base['cargos']}
+    - **Países únicos (empresa):** {base['paises_empresa']}
+    - **Moedas únicas:** {base['moedas']}
+    - **Memória do dataset:** {memoria_base}
     
     ### **🎯 Métricas Calculadas:**
     - **Salários:** Convertidos para USD usando taxas padronizadas
@@ -645,15 +624,67 @@ with st.expander("📋 Informações Técnicas e Metodologia"):
     - **Trabalho Internacional:** `residencia ≠ localizacao_empresa`
     """)
 
-# Adicionar botão para resetar filtros
-if st.sidebar.button("🔄 Resetar Filtros"):
-    st.rerun()
+        # Contadores dos caches de resultados e de figuras (todas as sessões deste processo)
+        uso_cache = cache_resultados.estatisticas()
+        uso_figuras = cache_figuras.estatisticas()
+        st.markdown(f"""
+    ### **⚡ Cache de Resultados:**
+    - **Acertos / falhas:** {uso_cache['acertos']:,} / {uso_cache['falhas']:,} ({uso_cache['taxa_acerto']:.0%})
+    - **Entradas:** {uso_cache['entradas']:,} ({uso_cache['despejos']:,} despejadas)
+    - **Memória:** {uso_cache['bytes_usados'] / 2**20:.1f} / {uso_cache['limite_bytes'] / 2**20:.0f} MB
+
+    ### **🖼️ Cache de Figuras:**
+    - **Acertos / falhas:** {uso_figuras['acertos']:,} / {uso_figuras['falhas']:,} ({uso_figuras['taxa_acerto']:.0%})
+    - **Entradas:** {uso_figuras['entradas']:,} ({uso_figuras['despejos']:,} despejadas)
+    - **Memória:** {uso_figuras['bytes_usados'] / 2**20:.1f} / {uso_figuras['limite_bytes'] / 2**20:.0f} MB
+    """)
+
+        # Visões pré-calculadas em uso (python visoes.py)
+        if armazem_visoes is not None:
+            uso_visoes = armazem_visoes.estatisticas()
+            st.markdown(f"""
+    ### **📦 Visões Pré-calculadas:**
+    - **Visões gravadas:** {uso_visoes['visoes']:,} ({uso_visoes['bytes'] / 2**20:.1f} MB)
+    - **Acertos / falhas:** {uso_visoes['acertos']:,} / {uso_visoes['falhas']:,} ({uso_visoes['taxa_acerto']:.0%})
+    """)
+
+        # Versão da base em memória e atualização em segundo plano (MAPA_ATUALIZAR_S)
+        if versao is not None:
+            estado = load_atualizador().estado()
+            verificacao = f"a cada {estado['intervalo_s']:g} s" if estado['intervalo_s'] > 0 else "desligada"
+            if estado['ultima_verificacao']:
+                verificacao += f", última às {time.strftime('%H:%M:%S', time.localtime(estado['ultima_verificacao']))}"
+            st.markdown(f"""
+    ### **🔄 Atualização dos Dados:**
+    - **Versão em uso:** {versao.numero} (carregada às {time.strftime('%H:%M:%S', time.localtime(versao.carregada_em))})
+    - **Verificação:** {verificacao}
+    - **Falhas:** {estado['falhas']}
+    """)
+
+    # Adicionar botão para resetar filtros
+    if st.sidebar.button("🔄 Resetar Filtros"):
+        st.rerun()
 
-# Informação sobre dados filtrados
-st.sidebar.markdown("---")
-st.sidebar.markdown(f"""
+    # Informação sobre dados filtrados
+    st.sidebar.markdown("---")
+    st.sidebar.markdown(f"""
 **📊 Dados Filtrados:**
-- Registros: **{len(df_filtrado):,}** / {len(df):,}
-- Cargos: **{df_filtrado['cargo'].nunique()}** / {df['cargo'].nunique()}
-- Anos: **{df_filtrado['ano'].nunique()}** / {df['ano'].nunique()}
-""")
\ No newline at end of file
+- Registros: **{total_registros:,}** / {base['registros']:,}
+- Cargos: **{celulas['cargo'].nunique()}** / {base['cargos']}
+- Anos: **{celulas['ano'].nunique()}** / {base['anos']}
+""")
+finally:
+    if perfilador is not None:
+        perfilador.finalizar()
+
+# Perfil do rerun (só com MAPA_PERFIL/?perfil=), já encerrado no finally
+if perfilador is not None and 'painel' in perfilador.modos:
+    total_rerun = perfilador.total
+    with st.expander(f"⏱️ Perfil do rerun: {total_rerun * 1000:,.0f} ms"):
+        st.dataframe(
+            perfilador.tabela().style.format({"início (ms)": "{:,.1f}", "ms": "{:,.1f}", "% do rerun": "{:.1f}%"}),
+            hide_index=True,
+            use_container_width=True
+        )
+        if perfilador.arquivo_cprofile:
+            st.caption(f"cProfile: `{perfilador.arquivo_cprofile}` (abra com `python -m pstats` ou snakeviz)")
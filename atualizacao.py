@@ -0,0 +1,245 @@
+"""Atualização da base em segundo plano (stale-while-revalidate).
+
+O ``Atualizador`` guarda a versão atual dos dados (o DataFrame e o que o app
+deriva dele: índice, cubo, metadados) e, com um intervalo configurado,
+consulta a fonte numa thread própria. Quando a fonte muda, a nova versão é
+baixada, lida e montada fora do caminho das requisições e só então trocada
+numa única atribuição. Cada rerun pega a versão uma vez no início e a usa até
+o fim; enquanto a próxima é montada, as sessões seguem com a anterior.
+
+Fontes:
+
+- ``FonteArquivos``: snapshot, CSV ou partições locais (``dados.carregar_dados``).
+  A cada consulta compara mtime e tamanho dos arquivos; só quando eles mudam
+  calcula a assinatura do conteúdo, e só recarrega se ela mudou.
+- ``FonteURL``: o CSV remoto, com requisições condicionais (``If-None-Match``/
+  ``If-Modified-Since``). Um 304 não baixa nada; sem validadores no servidor,
+  um download com o mesmo hash também não gera versão nova.
+
+``python atualizacao.py --url http://127.0.0.1:8000/df_limpo.csv`` consulta
+uma fonte algumas vezes e mostra o que mudou (útil com um servidor local,
+ex.: ``python -m http.server``).
+"""
+import argparse
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+import dados
+
+logger = logging.getLogger(__name__)
+
+
+class FonteArquivos:
+    """Dados locais de ``diretorio`` (partições, snapshot ou CSV tratado)."""
+
+    def __init__(self, diretorio=dados.DIRETORIO):
+        self.caminhos = dados.caminhos_dados(diretorio)
+        self.descricao = diretorio
+        self._impressao = None
+        self._assinatura = None
+
+    def _impressao_atual(self):
+        # Barata: só stat dos arquivos que carregar_dados pode ler
+        arquivos = [
+            self.caminhos['caminho_snapshot'],
+            self.caminhos['caminho_csv'],
+            os.path.join(self.caminhos['diretorio_particoes'], dados.ARQUIVO_MANIFESTO),
+        ]
+        impressao = []
+        for caminho in arquivos:
+            try:
+                estado = os.stat(caminho)
+            except FileNotFoundError:
+                continue
+            impressao.append((caminho, estado.st_mtime_ns, estado.st_size))
+        return tuple(impressao)
+
+    def _assinatura_atual(self):
+        # Partições têm prioridade; senão o CSV de origem, que é o que o snapshot
+        # guarda (mesmo valor de dados.assinatura_dados quando o snapshot é válido)
+        if dados.ler_manifesto(self.caminhos['diretorio_particoes']).get("anos"):
+            return dados.assinatura_dados(self.caminhos['caminho_snapshot'], self.caminhos['diretorio_particoes'])
+        if os.path.exists(self.caminhos['caminho_csv']):
+            return dados.hash_arquivo(self.caminhos['caminho_csv'])
+        return dados.assinatura_dados(self.caminhos['caminho_snapshot'], self.caminhos['diretorio_particoes'])
+
+    def carregar(self):
+        """Carga incondicional; registra a impressão e a assinatura carregadas."""
+        df = dados.carregar_dados(**self.caminhos)
+        # Depois da carga: ela pode ter regenerado o snapshot
+        self._impressao = self._impressao_atual()
+        self._assinatura = dados.assinatura_dados(self.caminhos['caminho_snapshot'], self.caminhos['diretorio_particoes'])
+        return df
+
+    def novos_dados(self):
+        """DataFrame da nova versão, ou ``None`` se o conteúdo não mudou."""
+        impressao = self._impressao_atual()
+        if impressao == self._impressao:
+            return None
+        if self._assinatura_atual() == self._assinatura:
+            # Arquivo tocado ou regravado com o mesmo conteúdo
+            self._impressao = impressao
+            return None
+        return self.carregar()
+
+
+class FonteURL:
+    """CSV tratado publicado em ``url``, consultado com requisições condicionais."""
+
+    def __init__(self, url=dados.URL_CSV, timeout=30):
+        self.url = url
+        self.descricao = url
+        self.timeout = timeout
+        self.etag = None
+        self.modificado_em = None
+        self._hash = None
+
+    def _baixar(self, condicional):
+        cabecalhos = {}
+        if condicional and self.etag:
+            cabecalhos['If-None-Match'] = self.etag
+        if condicional and self.modificado_em:
+            cabecalhos['If-Modified-Since'] = self.modificado_em
+        requisicao = urllib.request.Request(self.url, headers=cabecalhos)
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+                conteudo = resposta.read()
+                etag, modificado_em = resposta.headers.get('ETag'), resposta.headers.get('Last-Modified')
+        except urllib.error.HTTPError as erro:
+            if erro.code == 304:
+                return None
+            raise
+
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        self.etag, self.modificado_em = etag, modificado_em
+        if condicional and hash_conteudo == self._hash:
+            return None
+        df = dados.aplicar_schema(pd.read_csv(io.BytesIO(conteudo)))
+        self._hash = hash_conteudo
+        return df
+
+    def carregar(self):
+        """Download incondicional do CSV."""
+        return self._baixar(condicional=False)
+
+    def novos_dados(self):
+        """DataFrame da nova versão, ou ``None`` (304 ou mesmo conteúdo)."""
+        return self._baixar(condicional=True)
+
+
+def fonte_padrao(diretorio=dados.DIRETORIO, url=dados.URL_CSV):
+    """A mesma fonte que ``carregar_dados`` usaria: arquivos locais se houver, senão a URL."""
+    fonte = FonteArquivos(diretorio)
+    if fonte._impressao_atual():
+        return fonte
+    return FonteURL(url)
+
+
+class VersaoDados:
+    """Uma versão carregada da base; ``conteudo`` é o que ``construir(df)`` devolveu."""
+
+    def __init__(self, numero, conteudo):
+        self.numero = numero
+        self.conteudo = conteudo
+        self.carregada_em = time.time()
+
+
+class Atualizador:
+    """Versão atual dos dados, renovada em segundo plano a cada ``intervalo`` segundos.
+
+    ``construir(df)`` monta o que o app usa a partir do DataFrame (roda na
+    thread de atualização). Com ``intervalo`` ≤ 0 não há thread: a base é
+    carregada uma vez, como antes.
+    """
+
+    def __init__(self, fonte, construir, intervalo=0):
+        self.fonte = fonte
+        self.construir = construir
+        self.intervalo = intervalo
+        self.versao = None
+        self.ultima_verificacao = None
+        self.falhas = 0
+        self._lock_carga = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def atual(self):
+        """Versão atual; só a primeira chamada do processo espera pela carga."""
+        versao = self.versao
+        if versao is not None:
+            return versao
+        with self._lock_carga:
+            if self.versao is None:
+                self.versao = VersaoDados(1, self.construir(self.fonte.carregar()))
+                self._iniciar()
+        return self.versao
+
+    def verificar(self):
+        """Consulta a fonte uma vez e troca a versão se houver dados novos."""
+        self.ultima_verificacao = time.time()
+        df = self.fonte.novos_dados()
+        if df is None:
+            return False
+        conteudo = self.construir(df)
+        # Troca atômica: reruns em andamento continuam com a versão que já pegaram
+        self.versao = VersaoDados(self.versao.numero + 1, conteudo)
+        logger.info("dados atualizados: versão %d (%s)", self.versao.numero, self.fonte.descricao)
+        return True
+
+    def _iniciar(self):
+        if self.intervalo > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._executar, name="mapa_atualizacao", daemon=True)
+            self._thread.start()
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception:
+                # Fonte fora do ar ou arquivo inválido: segue servindo a versão atual
+                self.falhas += 1
+                logger.exception("falha ao atualizar os dados de %s", self.fonte.descricao)
+
+    def parar(self):
+        """Encerra a thread de atualização."""
+        self._parar.set()
+
+    def estado(self):
+        """Número e horário da versão atual, última consulta e falhas."""
+        versao = self.versao
+        return {
+            'versao': versao.numero if versao else None,
+            'carregada_em': versao.carregada_em if versao else None,
+            'ultima_verificacao': self.ultima_verificacao,
+            'falhas': self.falhas,
+            'intervalo_s': self.intervalo,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta a fonte dos dados algumas vezes e mostra as versões")
+    parser.add_argument("--url", help="CSV remoto (padrão: arquivos locais, ou a URL do projeto sem eles)")
+    parser.add_argument("--diretorio", default=dados.DIRETORIO)
+    parser.add_argument("--intervalo", type=float, default=5)
+    parser.add_argument("--consultas", type=int, default=3)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    fonte = FonteURL(args.url) if args.url else fonte_padrao(args.diretorio)
+    atualizador = Atualizador(fonte, construir=len)
+    print(f"Versão 1: {atualizador.atual().conteudo:,} registros ({fonte.descricao})")
+    for _ in range(args.consultas):
+        time.sleep(args.intervalo)
+        inicio = time.perf_counter()
+        mudou = atualizador.verificar()
+        versao = atualizador.versao
+        situacao = f"versão {versao.numero}: {versao.conteudo:,} registros" if mudou else "sem mudanças"
+        print(f"{situacao} ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
@@ -0,0 +1,292 @@
+"""Backend SQL embutido (SQLite) com o dataset limpo em esquema estrela.
+
+O ETL pode gravar, além do CSV e do snapshot, o arquivo ``df_limpo.sqlite``
+com a tabela fato ``fato_salario`` (uma linha por registro, só chaves e
+salários) e as dimensões ``dim_ano``, ``dim_senoridade``, ``dim_periodo``,
+``dim_cargo``, ``dim_moeda``, ``dim_pais`` (residência e localização da
+empresa), ``dim_modalidade`` e ``dim_empresa`` (porte). A tabela agregada
+``agg_salario`` guarda as mesmas medidas do ``cubo.CuboAgregado`` e
+``agg_quantis`` os esboços de quantis (``quantis``) por combinação de filtros.
+
+Com ``MAPA_BACKEND=sql`` o ``app.py`` não carrega a base: os filtros da
+sidebar viram ``WHERE`` sobre as chaves da fato/agregado e só o resultado da
+consulta chega ao pandas. As seções que dependem de registros (box plot,
+scatter, trabalho internacional e a aba para iniciantes) usam ``registros``,
+que traz todas as linhas da seleção.
+
+Uso::
+
+    python banco.py                        # dataset atual → df_limpo.sqlite
+"""
+import argparse
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+import dados
+import quantis
+from filtros import COLUNAS_FILTRO
+
+CAMINHO_BANCO = os.path.join(dados.DIRETORIO, "df_limpo.sqlite")
+
+# Colunas do dataset limpo, na ordem do CSV
+COLUNAS = [
+    'ano', 'senoridade', 'periodo', 'cargo', 'salario', 'moeda_salario',
+    'salario_em_dolar_americano', 'residencia', 'modalidade',
+    'localizacao_empresa', 'tamanho_empresa',
+]
+MEDIDAS = ['salario', 'salario_em_dolar_americano']
+
+# Coluna do dataset → (dimensão, atributo); a fato guarda ``id_<coluna>``
+REFERENCIAS = {
+    'ano': ('dim_ano', 'ano'),
+    'senoridade': ('dim_senoridade', 'senoridade'),
+    'periodo': ('dim_periodo', 'periodo'),
+    'cargo': ('dim_cargo', 'cargo'),
+    'moeda_salario': ('dim_moeda', 'moeda'),
+    'residencia': ('dim_pais', 'pais'),
+    'modalidade': ('dim_modalidade', 'modalidade'),
+    'localizacao_empresa': ('dim_pais', 'pais'),
+    'tamanho_empresa': ('dim_empresa', 'tamanho_empresa'),
+}
+
+# Dimensões e granularidade da tabela agregada (as mesmas do cubo)
+DIMENSOES_AGREGADO = ['ano', 'senoridade', 'cargo', 'modalidade', 'tamanho_empresa', 'periodo', 'localizacao_empresa']
+MEDIDAS_AGREGADO = ['contagem', 'soma', 'soma_quadrados', 'minimo', 'maximo']
+
+
+def _dimensoes():
+    """Dimensões únicas (``dim_pais`` atende duas colunas)."""
+    return dict(REFERENCIAS.values())
+
+
+def _criar_tabelas(conexao):
+    for tabela, atributo in _dimensoes().items():
+        tipo = 'INTEGER' if atributo == 'ano' else 'TEXT'
+        conexao.execute(
+            f"CREATE TABLE {tabela} (id INTEGER PRIMARY KEY, {atributo} {tipo} NOT NULL UNIQUE, ordem INTEGER)"
+        )
+    chaves = ", ".join(
+        f"id_{coluna} INTEGER REFERENCES {tabela}(id)" for coluna, (tabela, _) in REFERENCIAS.items()
+    )
+    conexao.execute(
+        f"CREATE TABLE fato_salario (id_registro INTEGER PRIMARY KEY, {chaves}, "
+        "salario INTEGER, salario_em_dolar_americano INTEGER)"
+    )
+    carga = ", ".join(['id_registro INTEGER'] + [f"{coluna}" for coluna in COLUNAS])
+    conexao.execute(f"CREATE TEMP TABLE carga ({carga})")
+
+
+def _carregar_bloco(conexao, bloco, deslocamento):
+    """Insere um bloco do dataset limpo: novos valores nas dimensões e linhas na fato."""
+    conexao.execute("DELETE FROM carga")
+    bloco = bloco[COLUNAS].set_axis(pd.RangeIndex(deslocamento, deslocamento + len(bloco)))
+    bloco.to_sql('carga', conexao, if_exists='append', index=True, index_label='id_registro')
+
+    for coluna, (tabela, atributo) in REFERENCIAS.items():
+        conexao.execute(
+            f"INSERT OR IGNORE INTO {tabela} ({atributo}) "
+            f"SELECT DISTINCT {coluna} FROM carga WHERE {coluna} IS NOT NULL"
+        )
+    chaves = [f"id_{coluna}" for coluna in REFERENCIAS]
+    buscas = [
+        f"(SELECT id FROM {tabela} WHERE {atributo} = c.{coluna})"
+        for coluna, (tabela, atributo) in REFERENCIAS.items()
+    ]
+    conexao.execute(
+        f"INSERT INTO fato_salario (id_registro, {', '.join(chaves + MEDIDAS)}) "
+        f"SELECT c.id_registro, {', '.join(buscas + [f'c.{m}' for m in MEDIDAS])} FROM carga c"
+    )
+
+
+def _ordenar_dimensoes(conexao):
+    """Preenche ``ordem`` com a ordem das categorias em ``dados.aplicar_schema``."""
+    for tabela, atributo in _dimensoes().items():
+        linhas = conexao.execute(f"SELECT id, {atributo} FROM {tabela}").fetchall()
+        ordem = dados.CATEGORICAS_ORDENADAS.get(atributo, [])
+        chave = lambda linha: (ordem.index(linha[1]) if linha[1] in ordem else len(ordem), linha[1])
+        conexao.executemany(
+            f"UPDATE {tabela} SET ordem = ? WHERE id = ?",
+            [(posicao, linha[0]) for posicao, linha in enumerate(sorted(linhas, key=chave))],
+        )
+
+
+def _criar_agregado(conexao):
+    """Tabelas agregadas: ``agg_salario`` (contagem/soma/soma dos quadrados/mín/máx
+    por combinação) e ``agg_quantis`` (esboços de quantis por combinação de filtros)."""
+    chaves = ", ".join(f"id_{coluna}" for coluna in DIMENSOES_AGREGADO)
+    conexao.execute(
+        f"CREATE TABLE agg_salario AS SELECT {chaves}, "
+        "COUNT(*) AS contagem, "
+        "TOTAL(salario_em_dolar_americano) AS soma, "
+        "TOTAL(1.0 * salario_em_dolar_americano * salario_em_dolar_americano) AS soma_quadrados, "
+        "MIN(1.0 * salario_em_dolar_americano) AS minimo, "
+        "MAX(1.0 * salario_em_dolar_americano) AS maximo "
+        f"FROM fato_salario GROUP BY {chaves}"
+    )
+    # Balde do esboço calculado pela mesma função do pandas
+    conexao.create_function("balde", 1, lambda valor: int(quantis.balde(valor)), deterministic=True)
+    chaves = ", ".join(f"id_{coluna}" for coluna in COLUNAS_FILTRO)
+    conexao.execute(
+        f"CREATE TABLE agg_quantis AS SELECT {chaves}, balde(salario_em_dolar_americano) AS balde, "
+        "COUNT(*) AS contagem FROM fato_salario WHERE salario_em_dolar_americano IS NOT NULL "
+        f"GROUP BY {chaves}, balde(salario_em_dolar_americano)"
+    )
+    for coluna in dados.CATEGORICAS_ORDENADAS.keys() | {'ano', 'cargo', 'periodo'}:
+        conexao.execute(f"CREATE INDEX fato_{coluna} ON fato_salario (id_{coluna})")
+
+
+def criar_banco(blocos, caminho=CAMINHO_BANCO):
+    """Grava o banco a partir de um ou mais DataFrames do dataset limpo.
+
+    ``blocos`` pode ser um DataFrame ou um iterável deles (ex.: ``read_csv``
+    com ``chunksize``), então a carga não precisa da base inteira em memória.
+    Como o snapshot, o arquivo é montado num temporário e renomeado no final.
+    Retorna o número de registros carregados.
+    """
+    if isinstance(blocos, pd.DataFrame):
+        blocos = [blocos]
+    temporario = caminho + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+
+    conexao = sqlite3.connect(temporario)
+    try:
+        _criar_tabelas(conexao)
+        total = 0
+        for bloco in blocos:
+            _carregar_bloco(conexao, bloco, total)
+            total += len(bloco)
+        _ordenar_dimensoes(conexao)
+        _criar_agregado(conexao)
+        conexao.commit()
+    finally:
+        conexao.close()
+    os.replace(temporario, caminho)
+    return total
+
+
+class BancoSalarios:
+    """Consultas do dashboard sobre o banco em esquema estrela.
+
+    Uma conexão somente leitura por thread (cada sessão do Streamlit roda na
+    sua). As dimensões, pequenas, ficam em memória para traduzir a seleção da
+    sidebar em chaves e para dar aos resultados as mesmas categorias do
+    DataFrame completo.
+    """
+
+    def __init__(self, caminho=CAMINHO_BANCO):
+        if not os.path.exists(caminho):
+            raise FileNotFoundError(f"{caminho} não existe; gere com `python banco.py` ou `python etl.py --banco`")
+        self.caminho = caminho
+        self._local = threading.local()
+
+        self.chaves = {}
+        for coluna, (tabela, atributo) in REFERENCIAS.items():
+            linhas = self.conexao.execute(f"SELECT {atributo}, id FROM {tabela} ORDER BY ordem").fetchall()
+            self.chaves[coluna] = dict(linhas)
+        self.categorias = {coluna: list(chaves) for coluna, chaves in self.chaves.items()}
+
+        # Tipos numéricos reduzidos da base inteira (os de um recorte poderiam ser menores)
+        limites = self.conexao.execute(
+            "SELECT MIN(salario), MAX(salario), MIN(salario_em_dolar_americano), "
+            "MAX(salario_em_dolar_americano) FROM fato_salario"
+        ).fetchone()
+        self.tipos = {
+            'ano': pd.to_numeric(pd.Series(self.categorias['ano'], dtype='int64'), downcast='integer').dtype,
+            'salario': pd.to_numeric(pd.Series(limites[:2], dtype='int64'), downcast='integer').dtype,
+            'salario_em_dolar_americano': pd.to_numeric(pd.Series(limites[2:], dtype='int64'), downcast='integer').dtype,
+        }
+
+    @property
+    def conexao(self):
+        if not hasattr(self._local, 'conexao'):
+            self._local.conexao = sqlite3.connect(f"file:{self.caminho}?mode=ro", uri=True, check_same_thread=False)
+        return self._local.conexao
+
+    def opcoes(self, coluna):
+        """Valores distintos de ``coluna`` (ordenados) para a sidebar."""
+        return sorted(self.categorias[coluna])
+
+    def _filtro(self, selecoes, apelido):
+        """``WHERE`` sobre as chaves da fato; seleção vazia não filtra."""
+        condicoes, parametros = [], []
+        for coluna, valores in (selecoes or {}).items():
+            if not valores:
+                continue
+            chaves = [self.chaves[coluna][v] for v in valores if v in self.chaves[coluna]]
+            if not chaves:
+                return "WHERE 0", []
+            condicoes.append(f"{apelido}.id_{coluna} IN ({', '.join('?' * len(chaves))})")
+            parametros.extend(chaves)
+        return ("WHERE " + " AND ".join(condicoes) if condicoes else ""), parametros
+
+    def _consulta(self, tabela, colunas, medidas, selecoes, ordem):
+        juncoes = "".join(
+            f" LEFT JOIN {REFERENCIAS[c][0]} d_{c} ON d_{c}.id = t.id_{c}" for c in colunas if c in REFERENCIAS
+        )
+        campos = [
+            f"d_{c}.{REFERENCIAS[c][1]} AS {c}" if c in REFERENCIAS else f"t.{c} AS {c}" for c in colunas
+        ] + [f"t.{m} AS {m}" for m in medidas]
+        filtro, parametros = self._filtro(selecoes, 't')
+        sql = f"SELECT {', '.join(campos)} FROM {tabela} t{juncoes} {filtro} ORDER BY {ordem}"
+        return pd.read_sql_query(sql, self.conexao, params=parametros)
+
+    def celulas(self, selecoes=None):
+        """Equivalente a ``CuboAgregado.filtrar(selecoes)``, calculado no SQL."""
+        ordem = ", ".join(f"d_{c}.ordem" for c in DIMENSOES_AGREGADO)
+        df = self._consulta('agg_salario', DIMENSOES_AGREGADO, MEDIDAS_AGREGADO, selecoes, ordem)
+        df = df.astype({'contagem': 'int64', **{m: 'float64' for m in MEDIDAS_AGREGADO[1:]}})
+        return dados.aplicar_schema(df, self.categorias).astype({'ano': self.tipos['ano']})
+
+    def esbocos(self, selecoes=None):
+        """Equivalente a ``CuboAgregado.filtrar_esbocos(selecoes)``."""
+        df = self._consulta('agg_quantis', COLUNAS_FILTRO, ['balde', 'contagem'], selecoes, 't.rowid')
+        df = df.astype({'balde': 'int32', 'contagem': 'int64'})
+        return dados.aplicar_schema(df, self.categorias).astype({'ano': self.tipos['ano']})
+
+    def registros(self, selecoes=None):
+        """Registros que atendem à seleção, com o índice posicional da base.
+
+        Custo proporcional ao número de linhas selecionadas: é o que as seções
+        baseadas em registros ainda pagam no backend SQL.
+        """
+        # Só as colunas de ``dados.COLUNAS_REGISTROS`` (as derivadas são montadas aqui), como no modo pandas
+        colunas = [c for c in COLUNAS if c in dados.COLUNAS_REGISTROS]
+        df = self._consulta('fato_salario', ['id_registro'] + colunas, [], selecoes, 't.id_registro')
+        df = df.set_index(df.pop('id_registro').astype('int64').rename(None))
+        df = dados.aplicar_schema(df, self.categorias).astype({c: t for c, t in self.tipos.items() if c in colunas})
+        return dados.derivar_colunas(df)[dados.COLUNAS_REGISTROS]
+
+    def resumo(self):
+        """Mesmas chaves do ``resumo`` de ``dados.metadados_dataset``, sem carregar a base."""
+        registros, paises_empresa = self.conexao.execute(
+            "SELECT (SELECT COUNT(*) FROM fato_salario), "
+            "(SELECT COUNT(DISTINCT id_localizacao_empresa) FROM agg_salario)"
+        ).fetchone()
+        anos = self.categorias['ano']
+        return {
+            'registros': registros,
+            'ano_min': np.min(anos),
+            'ano_max': np.max(anos),
+            'anos': len(anos),
+            'cargos': len(self.categorias['cargo']),
+            'paises_empresa': paises_empresa,
+            'moedas': len(self.categorias['moeda_salario']),
+        }
+
+    def tamanho_arquivo(self):
+        """Tamanho do banco em disco, em bytes."""
+        return os.path.getsize(self.caminho)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o banco SQLite (esquema estrela) do dataset limpo")
+    parser.add_argument("banco", nargs="?", default=CAMINHO_BANCO)
+    args = parser.parse_args()
+
+    total = criar_banco(dados.carregar_dados(), args.banco)
+    print(f"Banco salvo em {args.banco} ({total:,} registros, {os.path.getsize(args.banco) / 2**20:.1f} MB)")
@@ -0,0 +1,343 @@
+"""Benchmark headless de uma interação com o ``app.py`` (Streamlit AppTest).
+
+Para cada tamanho de base sintética e cada cenário de filtros, roda o script
+num processo novo: uma execução inicial (carga dos dados + página padrão) e um
+rerun com os filtros do cenário. Mede o tempo de cada execução, o pico de
+memória do processo (RSS máximo) e os bytes das figuras Plotly enviadas ao
+navegador, e grava tudo em JSON para comparar execuções ao longo do tempo.
+
+Com ``--inicializacao`` mede a partida de um worker novo: o tempo de importar
+cada dependência pesada e o tempo até a sidebar ser enviada (início da carga
+dos dados, via ``perfil``), com e sem o arquivo de metadados do ETL.
+
+Uso::
+
+    python benchmark.py                                  # 130k, 1M e 3M linhas
+    python benchmark.py --linhas 130000 --saida bench.json
+    python benchmark.py --backend sql --abas seletor
+    python benchmark.py --trabalhadores 8           # figuras em paralelo (MAPA_TRABALHADORES)
+    python benchmark.py --visoes                    # com as visões pré-calculadas (visoes.py)
+    python benchmark.py --inicializacao --linhas 1000000
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import dados
+from mapeamentos import SUBSTITUIR_CARGO
+
+DIRETORIO_APP = os.path.dirname(os.path.abspath(__file__))
+LINHAS_PADRAO = [130_000, 1_000_000, 3_000_000]
+MODULOS_IMPORTACAO = ['pandas', 'pyarrow', 'streamlit', 'plotly.express', 'paineis']
+VARIANTES_INICIO = ['com_metadados', 'sem_metadados']
+
+ANOS = [2020, 2021, 2022, 2023, 2024, 2025]
+PERIODOS = ['Horário integral', 'Contrato', 'FreeLancer', 'Meio período']
+MOEDAS = ['USD', 'EUR', 'GBP', 'INR', 'CAD', 'BRL']
+PAISES = ['USA', 'GBR', 'CAN', 'DEU', 'IND', 'ESP', 'FRA', 'BRA', 'AUS', 'NLD']
+
+
+def _multiselect(at, rotulo):
+    return next(m for m in at.sidebar.multiselect if m.label == rotulo)
+
+
+def _selecionar(at, rotulo, valores):
+    _multiselect(at, rotulo).set_value(valores)
+
+
+# Cenário → ajuste dos filtros da sidebar antes do rerun (None: filtros padrão)
+CENARIOS = {
+    'padrao': None,
+    'todos_cargos': lambda at: _selecionar(at, "Cargos:", _multiselect(at, "Cargos:").options),
+    'um_ano': lambda at: _selecionar(at, "Selecione os anos:", [_multiselect(at, "Selecione os anos:").options[-1]]),
+    'junior': lambda at: _selecionar(at, "Nível de Experiência:", ['Júnior']),
+    # A base sintética não tem Executivo em meio período: resultado sempre vazio
+    'vazio': lambda at: (
+        _selecionar(at, "Nível de Experiência:", ['Executivo']),
+        _selecionar(at, "Tipo de Contrato:", ['Meio período']),
+    ),
+}
+
+
+def gerar_dataset(linhas, semente=0):
+    """Base sintética com o schema e proporções aproximadas do df_limpo."""
+    rng = np.random.default_rng(semente)
+    cargos = sorted(set(SUBSTITUIR_CARGO.values()))
+    # Poucos cargos concentram a maior parte das vagas, como na base real
+    pesos_cargos = 1 / np.arange(1, len(cargos) + 1) ** 1.2
+    senoridade = rng.choice(dados.ORDEM_SENORIDADE, linhas, p=[0.1, 0.3, 0.55, 0.05])
+    periodo = rng.choice(PERIODOS, linhas, p=[0.97, 0.01, 0.01, 0.01])
+    periodo[senoridade == 'Executivo'] = 'Horário integral'
+    salario_usd = rng.lognormal(11.8, 0.45, linhas).round().astype('int64')
+    return pd.DataFrame({
+        'ano': rng.choice(ANOS, linhas, p=[0.02, 0.04, 0.12, 0.3, 0.4, 0.12]),
+        'senoridade': senoridade,
+        'periodo': periodo,
+        'cargo': rng.choice(cargos, linhas, p=pesos_cargos / pesos_cargos.sum()),
+        'salario': (salario_usd * rng.uniform(0.8, 1.2, linhas)).round().astype('int64'),
+        'moeda_salario': rng.choice(MOEDAS, linhas, p=[0.85, 0.05, 0.04, 0.02, 0.02, 0.02]),
+        'salario_em_dolar_americano': salario_usd,
+        'residencia': rng.choice(PAISES, linhas, p=[0.8] + [0.2 / 9] * 9),
+        'modalidade': rng.choice(dados.ORDEM_MODALIDADE, linhas, p=[0.6, 0.05, 0.35]),
+        'localizacao_empresa': rng.choice(PAISES, linhas, p=[0.82] + [0.18 / 9] * 9),
+        'tamanho_empresa': rng.choice(dados.ORDEM_TAMANHO_EMPRESA, linhas, p=[0.05, 0.9, 0.05]),
+    })
+
+
+def preparar_dados(linhas, diretorio, backend, gravar_visoes=False):
+    """Grava a base sintética em ``diretorio`` no formato que o app lê."""
+    df = dados.aplicar_schema(gerar_dataset(linhas))
+    dados.salvar_snapshot(df, dados.caminhos_dados(diretorio)['caminho_snapshot'])
+    dados.carregar_metadados(diretorio, lambda: df)
+    if backend == 'sql':
+        import banco
+        banco.criar_banco(df, os.path.join(diretorio, "df_limpo.sqlite"))
+    if gravar_visoes:
+        import visoes
+        visoes.gravar(diretorio, caminho_banco=os.path.join(diretorio, "df_limpo.sqlite"))
+
+
+def _pico_memoria_mb():
+    # No Linux, VmHWM: o ru_maxrss sobrevive ao exec e herdaria o pico do processo pai
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) / 2**10
+    except OSError:
+        pass
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return pico / 2**20 if sys.platform == 'darwin' else pico / 2**10
+
+
+def medir_cenario(cenario, timeout):
+    """Roda o cenário neste processo e retorna as medidas."""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, DIRETORIO_APP)
+    at = AppTest.from_file(os.path.join(DIRETORIO_APP, "app.py"), default_timeout=timeout)
+
+    inicio = time.perf_counter()
+    at.run()
+    tempo_inicial = time.perf_counter() - inicio
+
+    ajustar = CENARIOS[cenario]
+    if ajustar:
+        ajustar(at)
+    inicio = time.perf_counter()
+    at.run()
+    tempo_rerun = time.perf_counter() - inicio
+
+    figuras = [elemento.proto.spec for elemento in at.get('plotly_chart')]
+    return {
+        'tempo_inicial_s': round(tempo_inicial, 4),
+        'tempo_rerun_s': round(tempo_rerun, 4),
+        'pico_memoria_mb': round(_pico_memoria_mb(), 1),
+        'figuras': len(figuras),
+        'bytes_figuras': sum(len(spec.encode()) for spec in figuras),
+        'excecoes': [excecao.message for excecao in at.exception],
+    }
+
+
+def medir_importacao(modulo):
+    """Segundos para importar ``modulo`` (com dependências) num interpretador novo."""
+    codigo = (
+        f"import sys, time; sys.path.insert(0, {DIRETORIO_APP!r}); "
+        f"inicio = time.perf_counter(); import {modulo}; print(time.perf_counter() - inicio)"
+    )
+    processo = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    return round(float(processo.stdout), 4)
+
+
+def medir_inicio(timeout):
+    """Primeira execução do app neste processo, com o tempo até a sidebar."""
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, DIRETORIO_APP)
+    import perfil
+
+    reruns = []
+
+    class Coletor(logging.Handler):
+        def emit(self, registro):
+            reruns.append(json.loads(registro.getMessage()))
+
+    perfil.logger.addHandler(Coletor())
+    perfil.logger.setLevel(logging.INFO)
+    os.environ['MAPA_PERFIL'] = 'log'
+
+    inicio = time.time()
+    at = AppTest.from_file(os.path.join(DIRETORIO_APP, "app.py"), default_timeout=timeout)
+    at.run()
+    total = time.time() - inicio
+
+    # A carga dos dados começa logo depois que título e sidebar foram enviados
+    rerun = reruns[-1]
+    carga = next(secao for secao in rerun['secoes'] if secao['secao'] == 'carregar dados')
+    return {
+        'ate_sidebar_s': round(rerun['inicio_epoch'] - inicio + carga['inicio_ms'] / 1000, 4),
+        'primeira_execucao_s': round(total, 4),
+        'excecoes': [excecao.message for excecao in at.exception],
+    }
+
+
+def executar_inicializacao(linhas_por_base, saida, repeticoes=3, timeout=600):
+    """Mede importações e tempo até a sidebar para cada base e grava ``saida``."""
+    importacoes = {modulo: medir_importacao(modulo) for modulo in MODULOS_IMPORTACAO}
+    for modulo, segundos in importacoes.items():
+        print(f"import {modulo:<16} {segundos:6.2f}s", file=sys.stderr)
+
+    resultados = []
+    for linhas in linhas_por_base:
+        with tempfile.TemporaryDirectory(prefix="mapa_bench_") as diretorio:
+            preparar_dados(linhas, diretorio, 'pandas')
+            metadados = os.path.join(diretorio, dados.ARQUIVO_METADADOS)
+            copia = metadados + ".original"
+            os.replace(metadados, copia)
+            for variante in VARIANTES_INICIO:
+                medidas = []
+                for _ in range(repeticoes):
+                    if variante == 'com_metadados':
+                        with open(copia, "rb") as origem, open(metadados, "wb") as destino:
+                            destino.write(origem.read())
+                    elif os.path.exists(metadados):
+                        os.remove(metadados)
+                    processo = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "--medir-inicio", "--timeout", str(timeout)],
+                        env=dict(os.environ, MAPA_DADOS=diretorio), capture_output=True, text=True, check=True,
+                    )
+                    medidas.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+                resultado = {
+                    'linhas': linhas,
+                    'variante': variante,
+                    'ate_sidebar_s': float(np.median([m['ate_sidebar_s'] for m in medidas])),
+                    'primeira_execucao_s': float(np.median([m['primeira_execucao_s'] for m in medidas])),
+                    'repeticoes': medidas,
+                }
+                resultados.append(resultado)
+                print(
+                    f"{linhas:>10,} {variante:<14} até a sidebar {resultado['ate_sidebar_s']:6.2f}s  "
+                    f"primeira execução {resultado['primeira_execucao_s']:6.2f}s",
+                    file=sys.stderr,
+                )
+
+    relatorio = {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'ambiente': _ambiente(),
+        'importacoes_s': importacoes,
+        'inicializacao': resultados,
+    }
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+def executar(linhas_por_base, saida, backend='pandas', abas='tabs', timeout=600, trabalhadores=1, gravar_visoes=False):
+    """Roda todos os cenários para cada tamanho de base e grava ``saida``."""
+    resultados = []
+    for linhas in linhas_por_base:
+        with tempfile.TemporaryDirectory(prefix="mapa_bench_") as diretorio:
+            preparar_dados(linhas, diretorio, backend, gravar_visoes)
+            ambiente = dict(
+                os.environ,
+                MAPA_DADOS=diretorio,
+                MAPA_BANCO=os.path.join(diretorio, "df_limpo.sqlite"),
+                MAPA_BACKEND=backend,
+                MAPA_ABAS=abas,
+                MAPA_TRABALHADORES=str(trabalhadores),
+            )
+            for cenario in CENARIOS:
+                # Um processo por cenário: o pico de memória e os caches não se misturam
+                processo = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--medir", cenario, "--timeout", str(timeout)],
+                    env=ambiente, capture_output=True, text=True,
+                )
+                if processo.returncode != 0:
+                    medidas = {'excecoes': [processo.stderr.strip().splitlines()[-1]]}
+                else:
+                    medidas = json.loads(processo.stdout.strip().splitlines()[-1])
+                resultados.append({'linhas': linhas, 'cenario': cenario, **medidas})
+                print(_linha_relatorio(resultados[-1]), file=sys.stderr)
+
+    relatorio = {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'backend': backend,
+        'abas': abas,
+        'trabalhadores': trabalhadores,
+        'visoes': gravar_visoes,
+        'ambiente': _ambiente(),
+        'resultados': resultados,
+    }
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+def _versao(pacote):
+    from importlib.metadata import version
+    return version(pacote)
+
+
+def _ambiente():
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'pandas': pd.__version__,
+        'streamlit': _versao('streamlit'),
+        'plotly': _versao('plotly'),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _linha_relatorio(r):
+    if 'tempo_rerun_s' not in r:
+        return f"{r['linhas']:>10,} {r['cenario']:<13} ERRO {r['excecoes']}"
+    return (
+        f"{r['linhas']:>10,} {r['cenario']:<13} "
+        f"inicial {r['tempo_inicial_s']:7.2f}s  rerun {r['tempo_rerun_s']:7.2f}s  "
+        f"pico {r['pico_memoria_mb']:8.1f} MB  figuras {r['bytes_figuras'] / 2**10:8.1f} KB"
+        + (f"  ERRO {r['excecoes']}" if r['excecoes'] else "")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark headless do app.py por cenário de filtros")
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS_PADRAO, help="tamanhos das bases sintéticas")
+    parser.add_argument("--saida", default="benchmark.json")
+    parser.add_argument("--backend", choices=["pandas", "sql"], default="pandas")
+    parser.add_argument("--abas", choices=["tabs", "seletor"], default="tabs",
+                        help="tabs renderiza as quatro abas (mede todas as figuras)")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="workers do pool que monta as figuras (1: sequencial)")
+    parser.add_argument("--visoes", action="store_true",
+                        help="grava as visões pré-calculadas antes de medir (padrão, um ano e Júnior viram acertos)")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--inicializacao", action="store_true",
+                        help="mede importações e tempo até a sidebar (com e sem metadados)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="execuções por variante em --inicializacao")
+    parser.add_argument("--medir", choices=list(CENARIOS), help=argparse.SUPPRESS)
+    parser.add_argument("--medir-inicio", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir_cenario(args.medir, args.timeout)))
+    elif args.medir_inicio:
+        print(json.dumps(medir_inicio(args.timeout)))
+    elif args.inicializacao:
+        executar_inicializacao(args.linhas, args.saida, args.repeticoes, args.timeout)
+        print(f"Resultados salvos em {args.saida}")
+    else:
+        executar(args.linhas, args.saida, args.backend, args.abas, args.timeout, args.trabalhadores, args.visoes)
+        print(f"Resultados salvos em {args.saida}")
@@ -0,0 +1,84 @@
+"""Cache LRU de resultados do dashboard, limitado por memória.
+
+Fica à frente das funções de ``paineis``: a chave é a seção mais um hash
+canônico da seleção da sidebar (independente da ordem dos valores), então a
+mesma combinação de filtros é calculada uma vez e reaproveitada por todas as
+sessões do processo.
+"""
+import hashlib
+import json
+import pickle
+import threading
+from collections import OrderedDict
+
+
+def chave_selecao(selecoes):
+    """Hash canônico de ``{coluna: valores}``: ignora ordem de colunas e valores."""
+    canonica = {
+        coluna: sorted(str(valor) for valor in (valores or []))
+        for coluna, valores in selecoes.items()
+    }
+    texto = json.dumps(canonica, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(texto.encode()).hexdigest()
+
+
+def estimar_tamanho(valor):
+    """Tamanho aproximado de ``valor`` em bytes (tamanho serializado)."""
+    return len(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class CacheLRU:
+    """Mapa chave → resultado com despejo LRU quando passa de ``limite_bytes``.
+
+    Seguro para uso concorrente entre sessões. O cálculo de um resultado
+    ausente acontece fora do lock; duas sessões pedindo a mesma chave ao mesmo
+    tempo podem calcular em dobro, mas nunca bloqueiam uma à outra.
+    """
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def obter(self, chave, calcular):
+        """Retorna o resultado de ``chave``, chamando ``calcular()`` numa falha."""
+        with self._lock:
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return self._entradas[chave][0]
+            self.falhas += 1
+
+        valor = calcular()
+        tamanho = estimar_tamanho(valor)
+        if tamanho > self.limite_bytes:
+            return valor
+
+        with self._lock:
+            if chave in self._entradas:
+                self.bytes_usados -= self._entradas.pop(chave)[1]
+            self._entradas[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+            while self.bytes_usados > self.limite_bytes:
+                _, (_, tamanho_antigo) = self._entradas.popitem(last=False)
+                self.bytes_usados -= tamanho_antigo
+                self.despejos += 1
+        return valor
+
+    def estatisticas(self):
+        """Contadores de uso do cache."""
+        with self._lock:
+            total = self.acertos + self.falhas
+            return {
+                'entradas': len(self._entradas),
+                'bytes_usados': self.bytes_usados,
+                'limite_bytes': self.limite_bytes,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'despejos': self.despejos,
+                'taxa_acerto': self.acertos / total if total else 0.0,
+            }
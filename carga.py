@@ -0,0 +1,381 @@
+"""Teste de carga com sessões simultâneas num servidor Streamlit local.
+
+Sobe o ``app.py`` com ``streamlit run`` (sobre uma base sintética do
+``benchmark`` ou um diretório de dados existente) e abre N sessões pelo mesmo
+websocket que o navegador usa. Cada sessão abre a página e faz uma sequência
+de interações parecida com a de um usuário — trocar anos, senioridade, cargos
+e os demais filtros da sidebar, trocar de aba, voltar ao padrão — e mede cada
+rerun do envio do ``rerun_script`` até o ``script_finished``.
+
+Para cada número de sessões grava p50/p95/p99 da latência dos reruns, reruns
+por segundo e a memória (RSS) do processo do servidor antes, no pico e depois
+do nível: quantas sessões um worker aguenta e onde a latência dispara.
+
+Uso::
+
+    python carga.py                                      # 1, 2, 4, 8 e 16 sessões, 130k linhas
+    python carga.py --sessoes 1 4 16 32 --linhas 1000000 --saida carga.json
+    python carga.py --interacoes 20 --pausa 1            # 1 s de "leitura" entre cliques
+    python carga.py --dados . --abas tabs                # base do projeto, st.tabs
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+import benchmark
+
+DIRETORIO_APP = os.path.dirname(os.path.abspath(__file__))
+SESSOES_PADRAO = [1, 2, 4, 8, 16]
+PERCENTIS = [50, 95, 99]
+AMOSTRAGEM_MEMORIA_S = 0.1
+
+ANOS = "Selecione os anos:"
+SENIORIDADE = "Nível de Experiência:"
+CARGOS = "Cargos:"
+MODALIDADE = "Modalidade de Trabalho:"
+TAMANHO = "Tamanho da Empresa:"
+PERIODO = "Tipo de Contrato:"
+SECAO = "Seção"
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def subir_servidor(ambiente, porta, log, timeout=120):
+    """``streamlit run app.py`` em segundo plano; espera o health check responder."""
+    processo = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", os.path.join(DIRETORIO_APP, "app.py"),
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(porta),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        env=ambiente, stdout=log, stderr=subprocess.STDOUT,
+    )
+    limite = time.time() + timeout
+    while time.time() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"o servidor terminou com código {processo.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as resposta:
+                if resposta.read() == b"ok":
+                    return processo
+        except OSError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f"o servidor não respondeu em {timeout}s")
+
+
+def memoria_mb(pid):
+    """RSS atual e pico (VmRSS/VmHWM) do processo ``pid``, em MB; vazio fora do Linux."""
+    memoria = {}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for linha in status:
+                if linha.startswith(("VmRSS:", "VmHWM:")):
+                    chave = 'rss_mb' if linha.startswith("VmRSS:") else 'pico_mb'
+                    memoria[chave] = int(linha.split()[1]) / 2**10
+    except OSError:
+        pass
+    return memoria
+
+
+class Sessao:
+    """Uma aba do navegador: websocket próprio, widgets da página e valores atuais."""
+
+    def __init__(self, url, semente):
+        self.url = url
+        self.rng = random.Random(semente)
+        self.widgets = {}
+        self.valores = {}
+        self.excecoes = []
+        self._conexao = None
+
+    async def conectar(self):
+        self._conexao = await websocket_connect(self.url, subprotocols=["streamlit"], max_message_size=2**30)
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+
+    def _registrar_widget(self, elemento):
+        tipo = elemento.WhichOneof("type")
+        if tipo not in ("multiselect", "radio"):
+            return
+        widget = getattr(elemento, tipo)
+        rotulo = widget.label
+        if rotulo not in self.widgets:
+            self.widgets[rotulo] = widget
+            self.valores.setdefault(rotulo, list(widget.default) if tipo == "multiselect" else widget.default)
+
+    async def rerun(self):
+        """Pede um rerun com os valores atuais e espera o fim do script; devolve os segundos."""
+        mensagem = BackMsg()
+        estado = mensagem.rerun_script
+        estado.query_string = ""
+        for rotulo, valor in self.valores.items():
+            widget_estado = estado.widget_states.widgets.add()
+            widget_estado.id = self.widgets[rotulo].id
+            if isinstance(valor, list):
+                widget_estado.int_array_value.data.extend(valor)
+            else:
+                widget_estado.int_value = valor
+
+        inicio = time.perf_counter()
+        await self._conexao.write_message(mensagem.SerializeToString(), binary=True)
+        while True:
+            dados = await self._conexao.read_message()
+            if dados is None:
+                raise RuntimeError("o servidor fechou a conexão")
+            resposta = ForwardMsg()
+            resposta.ParseFromString(dados)
+            tipo = resposta.WhichOneof("type")
+            if tipo == "delta" and resposta.delta.WhichOneof("type") == "new_element":
+                elemento = resposta.delta.new_element
+                if elemento.WhichOneof("type") == "exception":
+                    self.excecoes.append(elemento.exception.message)
+                self._registrar_widget(elemento)
+            elif tipo == "script_finished":
+                return time.perf_counter() - inicio
+
+    def interagir(self):
+        """Muda um filtro ou a aba como um usuário faria; devolve o nome da ação."""
+        acoes = [acao for acao in INTERACOES if acao[2] is None or acao[2] in self.widgets]
+        nome, ajustar, _, _ = self.rng.choices(acoes, weights=[acao[3] for acao in acoes])[0]
+        ajustar(self)
+        return nome
+
+
+def _opcoes(sessao, rotulo):
+    return list(range(len(sessao.widgets[rotulo].options)))
+
+
+def _uma(rotulo):
+    def ajustar(sessao):
+        sessao.valores[rotulo] = [sessao.rng.choice(_opcoes(sessao, rotulo))]
+    return ajustar
+
+
+def _todas(rotulo):
+    def ajustar(sessao):
+        sessao.valores[rotulo] = _opcoes(sessao, rotulo)
+    return ajustar
+
+
+def _ultimos_anos(sessao):
+    anos = _opcoes(sessao, ANOS)
+    sessao.valores[ANOS] = anos[-sessao.rng.randint(1, min(3, len(anos))):]
+
+
+def _alternar_cargo(sessao):
+    # Adiciona um cargo fora da seleção ou tira um dela (sem esvaziar)
+    selecionados = sessao.valores[CARGOS]
+    fora = [opcao for opcao in _opcoes(sessao, CARGOS) if opcao not in selecionados]
+    if fora and (len(selecionados) <= 1 or sessao.rng.random() < 0.5):
+        sessao.valores[CARGOS] = selecionados + [sessao.rng.choice(fora)]
+    else:
+        removido = sessao.rng.choice(selecionados)
+        sessao.valores[CARGOS] = [opcao for opcao in selecionados if opcao != removido]
+
+
+def _trocar_aba(sessao):
+    sessao.valores[SECAO] = sessao.rng.choice(
+        [indice for indice in _opcoes(sessao, SECAO) if indice != sessao.valores[SECAO]]
+    )
+
+
+def _restaurar(sessao):
+    for rotulo, widget in sessao.widgets.items():
+        sessao.valores[rotulo] = list(widget.default) if isinstance(sessao.valores[rotulo], list) else widget.default
+
+
+# (nome, ajuste, widget necessário, peso): trocar de aba e mexer em ano,
+# senioridade e cargo são os cliques mais comuns
+INTERACOES = [
+    ('aba', _trocar_aba, SECAO, 4),
+    ('um_ano', _uma(ANOS), ANOS, 2),
+    ('ultimos_anos', _ultimos_anos, ANOS, 2),
+    ('todos_anos', _todas(ANOS), ANOS, 1),
+    ('uma_senioridade', _uma(SENIORIDADE), SENIORIDADE, 2),
+    ('todas_senioridades', _todas(SENIORIDADE), SENIORIDADE, 1),
+    ('alternar_cargo', _alternar_cargo, CARGOS, 3),
+    ('todos_cargos', _todas(CARGOS), CARGOS, 1),
+    ('uma_modalidade', _uma(MODALIDADE), MODALIDADE, 1),
+    ('um_tamanho', _uma(TAMANHO), TAMANHO, 1),
+    ('um_periodo', _uma(PERIODO), PERIODO, 1),
+    ('restaurar', _restaurar, None, 1),
+]
+
+
+async def _amostrar_memoria(pid, amostras, parar):
+    while not parar.is_set():
+        amostras.append(memoria_mb(pid).get('rss_mb', 0.0))
+        await asyncio.sleep(AMOSTRAGEM_MEMORIA_S)
+
+
+async def _usuario(url, semente, interacoes, pausa, latencias, aberturas, acoes):
+    sessao = Sessao(url, semente)
+    await sessao.conectar()
+    try:
+        aberturas.append(await sessao.rerun())
+        for _ in range(interacoes):
+            if pausa > 0:
+                await asyncio.sleep(sessao.rng.expovariate(1 / pausa))
+            acao = sessao.interagir()
+            latencias.append(await sessao.rerun())
+            acoes[acao] = acoes.get(acao, 0) + 1
+    finally:
+        sessao.fechar()
+    return sessao.excecoes
+
+
+async def medir_nivel(url, pid, sessoes, interacoes, pausa, semente):
+    """``sessoes`` usuários simultâneos fazendo ``interacoes`` cliques cada."""
+    latencias, aberturas, acoes, amostras = [], [], {}, []
+    antes = memoria_mb(pid)
+    parar = asyncio.Event()
+    amostragem = asyncio.create_task(_amostrar_memoria(pid, amostras, parar))
+
+    inicio = time.perf_counter()
+    excecoes = await asyncio.gather(*(
+        _usuario(url, semente * 10_000 + indice, interacoes, pausa, latencias, aberturas, acoes)
+        for indice in range(sessoes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    parar.set()
+    await amostragem
+    depois = memoria_mb(pid)
+    pico = max(amostras + [depois.get('rss_mb', 0.0)])
+    reruns = len(latencias) + len(aberturas)
+    return {
+        'sessoes': sessoes,
+        'reruns': reruns,
+        'duracao_s': round(duracao, 3),
+        'reruns_por_s': round(reruns / duracao, 2),
+        **{f'p{p}_s': round(float(np.percentile(latencias, p)), 4) if latencias else None for p in PERCENTIS},
+        'media_s': round(float(np.mean(latencias)), 4) if latencias else None,
+        'max_s': round(max(latencias), 4) if latencias else None,
+        'abertura_p50_s': round(float(np.percentile(aberturas, 50)), 4),
+        'rss_antes_mb': round(antes.get('rss_mb', 0.0), 1),
+        'rss_pico_mb': round(pico, 1),
+        'rss_depois_mb': round(depois.get('rss_mb', 0.0), 1),
+        'rss_por_sessao_mb': round((pico - antes.get('rss_mb', 0.0)) / sessoes, 2),
+        'acoes': dict(sorted(acoes.items())),
+        'excecoes': [mensagem for lista in excecoes for mensagem in lista],
+    }
+
+
+async def _executar_niveis(url, pid, niveis, interacoes, pausa, semente):
+    # Aquecimento: a primeira sessão do processo carrega a base e os caches
+    aquecimento = Sessao(url, semente)
+    await aquecimento.conectar()
+    carga_inicial = await aquecimento.rerun()
+    aquecimento.fechar()
+    print(f"carga inicial {carga_inicial:7.2f}s  rss {memoria_mb(pid).get('rss_mb', 0.0):8.1f} MB", file=sys.stderr)
+
+    resultados = []
+    for sessoes in niveis:
+        resultados.append(await medir_nivel(url, pid, sessoes, interacoes, pausa, semente + sessoes))
+        print(_linha_relatorio(resultados[-1]), file=sys.stderr)
+    return carga_inicial, resultados
+
+
+def executar(niveis, saida, linhas=130_000, dados_app=None, backend='pandas', abas='seletor',
+             interacoes=10, pausa=0.0, trabalhadores=1, semente=0):
+    """Sobe o servidor, roda os níveis de concorrência e grava ``saida``."""
+    sintetica = dados_app is None
+    with tempfile.TemporaryDirectory(prefix="mapa_carga_") as temporario:
+        if sintetica:
+            benchmark.preparar_dados(linhas, temporario, backend)
+            dados_app = temporario
+        ambiente = dict(
+            os.environ,
+            MAPA_DADOS=os.path.abspath(dados_app),
+            MAPA_BANCO=os.path.join(os.path.abspath(dados_app), "df_limpo.sqlite"),
+            MAPA_BACKEND=backend,
+            MAPA_ABAS=abas,
+            MAPA_TRABALHADORES=str(trabalhadores),
+        )
+        porta = _porta_livre()
+        caminho_log = os.path.join(temporario, "servidor.log")
+        with open(caminho_log, "wb") as log:
+            servidor = subir_servidor(ambiente, porta, log)
+            try:
+                carga_inicial, resultados = asyncio.run(_executar_niveis(
+                    f"ws://127.0.0.1:{porta}/_stcore/stream", servidor.pid, niveis, interacoes, pausa, semente
+                ))
+                memoria_final = memoria_mb(servidor.pid)
+            finally:
+                servidor.terminate()
+                servidor.wait(timeout=30)
+
+    relatorio = {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'linhas': linhas if sintetica else None,
+        'dados': None if sintetica else dados_app,
+        'backend': backend,
+        'abas': abas,
+        'trabalhadores': trabalhadores,
+        'interacoes_por_sessao': interacoes,
+        'pausa_media_s': pausa,
+        'ambiente': benchmark._ambiente(),
+        'carga_inicial_s': round(carga_inicial, 4),
+        'pico_servidor_mb': round(memoria_final.get('pico_mb', 0.0), 1),
+        'niveis': resultados,
+    }
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+def _linha_relatorio(r):
+    return (
+        f"{r['sessoes']:>4} sessões  p50 {r['p50_s']:6.3f}s  p95 {r['p95_s']:6.3f}s  p99 {r['p99_s']:6.3f}s  "
+        f"{r['reruns_por_s']:6.2f} reruns/s  rss {r['rss_antes_mb']:7.1f} → {r['rss_pico_mb']:7.1f} MB "
+        f"({r['rss_por_sessao_mb']:+.2f} MB/sessão)"
+        + (f"  ERRO {r['excecoes'][:3]}" if r['excecoes'] else "")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do app.py com sessões simultâneas")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=SESSOES_PADRAO,
+                        help="números de sessões simultâneas, um nível por valor")
+    parser.add_argument("--interacoes", type=int, default=10, help="cliques por sessão em cada nível")
+    parser.add_argument("--pausa", type=float, default=0.0,
+                        help="pausa média (s, exponencial) entre os cliques de uma sessão; 0 = sem pausa")
+    parser.add_argument("--linhas", type=int, default=130_000, help="tamanho da base sintética")
+    parser.add_argument("--dados", help="diretório com os dados do app (em vez da base sintética)")
+    parser.add_argument("--backend", choices=["pandas", "sql"], default="pandas")
+    parser.add_argument("--abas", choices=["seletor", "tabs"], default="seletor",
+                        help="seletor: trocar de aba gera rerun; tabs: as quatro abas a cada rerun")
+    parser.add_argument("--trabalhadores", type=int, default=1, help="MAPA_TRABALHADORES do servidor")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--saida", default="carga.json")
+    args = parser.parse_args()
+
+    executar(
+        args.sessoes, args.saida, args.linhas, args.dados, args.backend, args.abas,
+        args.interacoes, args.pausa, args.trabalhadores, args.semente,
+    )
+    print(f"Resultados salvos em {args.saida}")
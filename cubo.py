@@ -0,0 +1,329 @@
+"""Cubo de agregados do salário para KPIs e gráficos de médias/contagens.
+
+Cada célula do cubo é uma combinação observada das dimensões abaixo e guarda
+medidas aditivas do salário em USD (contagem, soma, soma dos quadrados, mínimo
+e máximo). Filtrar e reagrupar células dá os mesmos contagens, médias e
+desvios-padrão que um ``groupby`` nas linhas, mas com custo proporcional ao
+número de células, não de registros.
+
+Medianas e percentis vêm dos esboços de ``quantis``, guardados por combinação
+das dimensões de filtro e mesclados na consulta.
+
+``agregar_varios`` responde de uma vez todos os agrupamentos de uma seção:
+acumula as medidas com ``np.bincount`` sobre os códigos inteiros das
+categorias, num array denso por conjunto de dimensões, e tira cada agrupamento
+dele somando os eixos que não usa, em vez de um ``groupby`` por gráfico.
+Esses arrays (``SomasDensas``) também podem ser guardados entre seleções:
+``agregar_incremental`` leva as somas de uma seleção para a próxima quando
+só um filtro mudou, somando e subtraindo as células da diferença.
+"""
+import numpy as np
+import pandas as pd
+
+import quantis
+import resumos
+from filtros import COLUNAS_FILTRO, IndiceFiltros
+
+DIMENSOES_CUBO = COLUNAS_FILTRO + ['localizacao_empresa']
+MEDIDA = 'salario_em_dolar_americano'
+
+# Somas que cada estatística precisa (nomes das colunas das células)
+SOMAS_ESTATISTICAS = {
+    'count': ['contagem'],
+    'sum': ['contagem', 'soma'],
+    'mean': ['contagem', 'soma'],
+    'std': ['contagem', 'soma', 'soma_quadrados'],
+    'min': ['contagem', 'minimo'],
+    'max': ['contagem', 'maximo'],
+}
+# Maior array denso (produto das cardinalidades) de uma passada de agregar_varios
+LIMITE_DENSO = 2**16
+# Atualizações por diferença seguidas antes de somar tudo de novo (limita o arredondamento acumulado)
+MAXIMO_PASSOS = 64
+
+
+class CuboAgregado:
+    """Medidas aditivas de ``MEDIDA`` por combinação de ``DIMENSOES_CUBO``."""
+
+    def __init__(self, df, dimensoes=DIMENSOES_CUBO, medida=MEDIDA):
+        self.dimensoes = list(dimensoes)
+        valores = df[medida].astype('float64')
+        base = df[self.dimensoes].assign(_valor=valores, _quadrado=valores ** 2)
+        self.celulas = base.groupby(self.dimensoes, observed=True).agg(
+            contagem=('_valor', 'size'),
+            soma=('_valor', 'sum'),
+            soma_quadrados=('_quadrado', 'sum'),
+            minimo=('_valor', 'min'),
+            maximo=('_valor', 'max'),
+        ).reset_index()
+        # O mesmo índice de bitmaps dos registros, agora sobre as células
+        self.indice = IndiceFiltros(self.celulas, [d for d in COLUNAS_FILTRO if d in self.dimensoes])
+
+        # Esboços de quantis por combinação das dimensões de filtro
+        self.esbocos = quantis.esbocar(df, COLUNAS_FILTRO, medida)
+        self.indice_esbocos = IndiceFiltros(self.esbocos, COLUNAS_FILTRO)
+
+    def filtrar(self, selecoes):
+        """Células que atendem à seleção da sidebar (mesma semântica do índice)."""
+        return self.indice.filtrar(self.celulas, selecoes)
+
+    def filtrar_esbocos(self, selecoes):
+        """Esboços de quantis das combinações que atendem à seleção."""
+        return self.indice_esbocos.filtrar(self.esbocos, selecoes)
+
+
+def _estatisticas(somas, estatisticas=('mean', 'std', 'count', 'min', 'max')):
+    """Deriva count/mean/std/min/max/sum (nomes do pandas) a partir das somas."""
+    contagem = somas['contagem']
+    colunas = {}
+    for estatistica in estatisticas:
+        if estatistica == 'mean':
+            colunas['mean'] = somas['soma'] / contagem
+        elif estatistica == 'std':
+            # Variância amostral (ddof=1), como ``Series.std``; NaN para um único registro
+            variancia = (somas['soma_quadrados'] - somas['soma'] * (somas['soma'] / contagem)) / (contagem - 1)
+            colunas['std'] = np.sqrt(variancia.clip(lower=0).where(contagem > 1))
+        elif estatistica == 'count':
+            colunas['count'] = contagem
+        elif estatistica == 'sum':
+            colunas['sum'] = somas['soma']
+        else:
+            colunas[estatistica] = somas['minimo' if estatistica == 'min' else 'maximo']
+    return pd.DataFrame(colunas, index=somas.index)
+
+
+def _pesos(celulas, soma):
+    """Valores de ``soma`` por linha: colunas das células ou, em registros, derivados de ``MEDIDA``."""
+    if soma in celulas.columns:
+        return celulas[soma].to_numpy()
+    if soma == 'contagem':
+        return None
+    valores = celulas[MEDIDA].to_numpy(dtype='float64')
+    return valores ** 2 if soma == 'soma_quadrados' else valores
+
+
+def _bases(pedidos, cardinalidades, limite_denso):
+    """Junta as dimensões dos pedidos em poucas bases com até ``limite_denso`` posições."""
+    bases = []
+    for dimensoes in sorted((d for d, _ in pedidos.values()), key=len, reverse=True):
+        for base in bases:
+            novas = [d for d in dimensoes if d not in base]
+            if not novas:
+                break
+            if np.prod([cardinalidades[d] for d in base + novas]) <= limite_denso:
+                base.extend(novas)
+                break
+        else:
+            bases.append(list(dimensoes))
+    return bases
+
+
+def _indice(valores, tipos, dimensoes, posicoes):
+    """Índice (simples ou MultiIndex) das posições observadas, como o do ``groupby``."""
+    niveis = []
+    for dimensao, posicao in zip(dimensoes, posicoes):
+        if isinstance(tipos[dimensao], pd.CategoricalDtype):
+            niveis.append(pd.CategoricalIndex(pd.Categorical.from_codes(posicao, dtype=tipos[dimensao]), name=dimensao))
+        else:
+            niveis.append(pd.Index(valores[dimensao][posicao], name=dimensao))
+    if len(niveis) == 1:
+        return niveis[0]
+    return pd.MultiIndex.from_arrays(niveis)
+
+
+def _normalizar_pedidos(pedidos):
+    return {nome: ([dimensoes] if isinstance(dimensoes, str) else list(dimensoes), list(estatisticas))
+            for nome, (dimensoes, estatisticas) in pedidos.items()}
+
+
+class SomasDensas:
+    """Somas dos ``pedidos`` em arrays densos, o estado intermediário de ``agregar_varios``.
+
+    ``valores`` dá os valores de cada código por dimensão (as categorias, nas
+    colunas categóricas) e ``tipos`` o dtype das colunas. ``somar`` acumula
+    células nos arrays, ou as subtrai com ``sinal=-1`` (só sem mínimo/máximo,
+    que não são aditivos); ``resultados`` tira os agrupamentos deles.
+    """
+
+    def __init__(self, pedidos, valores, tipos, limite_denso=LIMITE_DENSO):
+        self.pedidos = _normalizar_pedidos(pedidos)
+        self.valores = valores
+        self.tipos = tipos
+        cardinalidades = {d: len(v) for d, v in valores.items()}
+        self.densos = {}
+        for base in _bases(self.pedidos, cardinalidades, limite_denso):
+            somas_base = sorted({soma for dimensoes, estatisticas in self.pedidos.values() if set(dimensoes) <= set(base)
+                                 for estatistica in estatisticas for soma in SOMAS_ESTATISTICAS[estatistica]})
+            forma = tuple(cardinalidades[d] for d in base)
+            self.densos[tuple(base)] = {
+                soma: np.full(forma, np.inf if soma == 'minimo' else -np.inf) if soma in ('minimo', 'maximo')
+                else np.zeros(forma, dtype='int64' if soma == 'contagem' else 'float64')
+                for soma in somas_base
+            }
+        self.aditivo = not any({'minimo', 'maximo'} & densos.keys() for densos in self.densos.values())
+
+    def copia(self):
+        """Cópia independente dos arrays (as atualizações por diferença não alteram o estado anterior)."""
+        copia = SomasDensas.__new__(SomasDensas)
+        copia.__dict__.update(self.__dict__)
+        copia.densos = {base: {soma: denso.copy() for soma, denso in densos.items()}
+                        for base, densos in self.densos.items()}
+        return copia
+
+    def codigos(self, celulas, dimensao):
+        """Códigos de ``dimensao`` nas ``celulas`` (−1 fora de ``valores``)."""
+        serie = celulas[dimensao]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie.cat.codes.to_numpy()
+        return self.valores[dimensao].get_indexer(serie)
+
+    def somar(self, celulas, sinal=1, codigos=None):
+        """Acumula ``celulas`` (ou as subtrai, com ``sinal=-1``) numa passada por base."""
+        if sinal < 0 and not self.aditivo:
+            raise ValueError("mínimo e máximo não podem ser subtraídos")
+        if codigos is None:
+            codigos = {d: self.codigos(celulas, d) for d in self.valores}
+        for base, densos in self.densos.items():
+            forma = next(iter(densos.values())).shape
+            # Uma posição do array denso por célula (linhas com dimensão nula ficam de fora)
+            validos = np.logical_and.reduce([codigos[d] >= 0 for d in base])
+            posicao = np.ravel_multi_index(tuple(codigos[d][validos] for d in base), forma)
+            tamanho = int(np.prod(forma))
+            for soma, denso in densos.items():
+                pesos = _pesos(celulas, soma)
+                if soma in ('minimo', 'maximo'):
+                    (np.minimum if soma == 'minimo' else np.maximum).at(denso.reshape(-1), posicao, pesos[validos])
+                    continue
+                acumulado = np.bincount(posicao, weights=None if pesos is None else pesos[validos], minlength=tamanho)
+                if soma == 'contagem':
+                    acumulado = acumulado.astype('int64')
+                denso += (acumulado if sinal > 0 else -acumulado).reshape(forma)
+
+    def resultados(self):
+        """``{nome: DataFrame}`` de cada pedido, só com os grupos de contagem positiva."""
+        resultados = {}
+        for base, densos in self.densos.items():
+            for nome, (dimensoes, estatisticas) in self.pedidos.items():
+                if not set(dimensoes) <= set(base) or nome in resultados:
+                    continue
+                eixos = tuple(i for i, d in enumerate(base) if d not in dimensoes)
+                ordem = [[d for d in base if d in dimensoes].index(d) for d in dimensoes]
+                reduzidos = {}
+                for soma, denso in densos.items():
+                    if soma == 'minimo':
+                        reduzido = np.min(denso, axis=eixos, initial=np.inf)
+                    elif soma == 'maximo':
+                        reduzido = np.max(denso, axis=eixos, initial=-np.inf)
+                    else:
+                        reduzido = np.sum(denso, axis=eixos)
+                    reduzidos[soma] = np.transpose(reduzido, ordem)
+                posicoes = np.nonzero(reduzidos['contagem'] > 0)
+                somas = pd.DataFrame(
+                    {soma: reduzido[posicoes] for soma, reduzido in reduzidos.items()},
+                    index=_indice(self.valores, self.tipos, dimensoes, posicoes),
+                )
+                resultados[nome] = _estatisticas(somas, estatisticas)
+        return {nome: resultados[nome] for nome in self.pedidos}
+
+
+def agregar_varios(celulas, pedidos, limite_denso=LIMITE_DENSO):
+    """Vários agrupamentos de ``celulas`` de uma vez, sobre os códigos das categorias.
+
+    ``pedidos`` é ``{nome: (dimensões, estatísticas)}``, com estatísticas entre
+    ``SOMAS_ESTATISTICAS``. As dimensões dos pedidos são juntadas em poucas bases
+    (arrays densos de até ``limite_denso`` posições); cada base é acumulada numa
+    passada pelas células, e cada pedido sai dela somando os eixos que não usa.
+    Retorna ``{nome: DataFrame}`` igual a ``groupby(dimensões)[MEDIDA].agg(estatísticas)``
+    nas linhas (só os grupos observados). Também aceita registros: sem as colunas do cubo,
+    cada linha conta uma vez com o valor de ``MEDIDA``.
+    """
+    todas = dict.fromkeys(d for dimensoes, _ in _normalizar_pedidos(pedidos).values() for d in dimensoes)
+    codigos = {d: resumos.codigos(celulas[d]) for d in todas}
+    somas = SomasDensas(
+        pedidos,
+        {d: valores for d, (_, valores) in codigos.items()},
+        {d: celulas[d].dtype for d in todas},
+        limite_denso,
+    )
+    somas.somar(celulas, codigos={d: codigos_dimensao for d, (codigos_dimensao, _) in codigos.items()})
+    return somas.resultados()
+
+
+def diferenca_selecao(anterior, atual):
+    """``(coluna, adicionados, removidos)`` quando só ``coluna`` mudou entre as seleções; senão ``None``.
+
+    Uma seleção vazia não filtra, então a passagem de ou para uma coluna vazia
+    não é tratada como diferença de valores.
+    """
+    mudancas = []
+    for coluna in atual.keys() | anterior.keys():
+        antes, depois = set(anterior.get(coluna) or ()), set(atual.get(coluna) or ())
+        if antes != depois:
+            if not antes or not depois:
+                return None
+            mudancas.append((coluna, depois - antes, antes - depois))
+    return mudancas[0] if len(mudancas) == 1 else None
+
+
+class EstadoIncremental:
+    """Seleção e ``SomasDensas`` de uma seção; ``passos`` conta as atualizações por diferença seguidas."""
+
+    def __init__(self, selecoes, somas, passos=0):
+        self.selecoes = {coluna: list(valores) for coluna, valores in selecoes.items()}
+        self.somas = somas
+        self.passos = passos
+
+
+def agregar_incremental(estado, pedidos, selecoes, celulas, filtrar_celulas, dominios, limite_denso=LIMITE_DENSO):
+    """``agregar_varios(celulas, pedidos)`` a partir do ``estado`` da seleção anterior, quando compensa.
+
+    Se só uma coluna da seleção mudou, as células dos valores adicionados são
+    somadas e as dos removidos subtraídas (``filtrar_celulas`` com os demais
+    filtros), com custo proporcional a essa fatia e não à seleção inteira. As
+    somas são acumuladas de novo a partir de ``celulas`` (as da seleção atual)
+    sem estado, quando mais de uma coluna mudou, quando a fatia tem mais células
+    que a seleção nova ou a cada ``MAXIMO_PASSOS`` diferenças seguidas.
+
+    ``dominios`` dá os valores possíveis das dimensões não categóricas (ex.:
+    ``ano``), para que células de seleções diferentes tenham os mesmos códigos.
+    Retorna ``(novo estado, resultados)``; o estado recebido não é alterado.
+    """
+    diferenca = None
+    if estado is not None and estado.somas.aditivo and estado.passos < MAXIMO_PASSOS:
+        diferenca = diferenca_selecao(estado.selecoes, selecoes)
+    if diferenca is not None:
+        coluna, adicionados, removidos = diferenca
+        fatias = [(filtrar_celulas({**selecoes, coluna: sorted(valores)}), sinal)
+                  for valores, sinal in ((adicionados, 1), (removidos, -1)) if valores]
+        if sum(len(fatia) for fatia, _ in fatias) <= len(celulas):
+            somas = estado.somas.copia()
+            for fatia, sinal in fatias:
+                somas.somar(fatia, sinal)
+            novo = EstadoIncremental(selecoes, somas, estado.passos + 1)
+            return novo, somas.resultados()
+
+    todas = dict.fromkeys(d for dimensoes, _ in _normalizar_pedidos(pedidos).values() for d in dimensoes)
+    valores = {}
+    for d in todas:
+        tipo = celulas[d].dtype
+        if isinstance(tipo, pd.CategoricalDtype):
+            valores[d] = tipo.categories
+        else:
+            valores[d] = pd.Index(sorted(dominios[d]), dtype=tipo)
+    somas = SomasDensas(pedidos, valores, {d: celulas[d].dtype for d in todas}, limite_denso)
+    somas.somar(celulas)
+    return EstadoIncremental(selecoes, somas), somas.resultados()
+
+
+def resumo(celulas):
+    """Estatísticas de ``MEDIDA`` para o conjunto inteiro de células."""
+    somas = celulas[['contagem', 'soma', 'soma_quadrados']].sum().to_frame().T
+    somas['minimo'] = celulas['minimo'].min()
+    somas['maximo'] = celulas['maximo'].max()
+    return _estatisticas(somas).iloc[0]
+
+
+def percentual_linhas(contagens, colunas):
+    """Contagens por (linha, ``colunas``) → percentual de cada coluna dentro da linha."""
+    tabela = contagens.unstack(colunas, fill_value=0)
+    return tabela.div(tabela.sum(axis=1), axis=0) * 100
@@ -0,0 +1,382 @@
+"""Carregamento do dataset limpo a partir de um snapshot colunar (Arrow IPC).
+
+O ETL grava ``df_limpo.arrow`` ao lado do CSV tratado. O snapshot é lido com
+memory map, sem parse de texto, e carrega nos metadados do schema uma versão
+de formato e o hash SHA-256 do CSV que o originou, para detectar snapshots
+desatualizados. O CSV (local ou remoto) só é usado quando não há snapshot.
+
+O ETL incremental (``python etl.py --incremental``) grava, em vez de um único
+snapshot, uma partição Arrow por ano em ``df_limpo/`` e um manifesto com o
+checksum de origem de cada ano; quando esse diretório existe ele tem
+prioridade.
+
+Qualquer que seja a origem, o DataFrame sai com o schema compacto declarado em
+``aplicar_schema``: colunas de texto como categóricas e numéricas reduzidas.
+
+Ao lado dos dados fica ``df_limpo.meta.json``, com as opções dos filtros e as
+contagens do rodapé. Ele leva a assinatura dos dados de que saiu (hash de
+origem do snapshot ou checksums do manifesto), então a sidebar pode ser
+montada sem carregar a base, e é recalculado quando a assinatura não bate.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from filtros import COLUNAS_FILTRO
+
+URL_CSV = "https://raw.githubusercontent.com/heldjow/ImersaoDadosAlura/main/df_limpo.csv"
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_CSV = os.path.join(DIRETORIO, "df_limpo.csv")
+CAMINHO_SNAPSHOT = os.path.join(DIRETORIO, "df_limpo.arrow")
+DIRETORIO_PARTICOES = os.path.join(DIRETORIO, "df_limpo")
+ARQUIVO_MANIFESTO = "_manifesto.json"
+ARQUIVO_METADADOS = "df_limpo.meta.json"
+CAMINHO_METADADOS = os.path.join(DIRETORIO, ARQUIVO_METADADOS)
+# Colunas cujos valores distintos entram nos metadados (opções dos filtros e contagens do rodapé)
+COLUNAS_METADADOS = COLUNAS_FILTRO + ['localizacao_empresa', 'moeda_salario']
+
+# Incrementar sempre que o formato gravado no snapshot mudar
+VERSAO_SNAPSHOT = "2"
+CHAVE_VERSAO = b"mapa_carreira.versao"
+CHAVE_HASH = b"mapa_carreira.hash_origem"
+
+# Schema do dataset limpo
+ORDEM_SENORIDADE = ['Júnior', 'Pleno', 'Sênior', 'Executivo']
+ORDEM_MODALIDADE = ['Presencial', 'Híbrido', 'Remoto']
+ORDEM_TAMANHO_EMPRESA = ['Pequeno', 'Médio', 'Grande']
+
+CATEGORICAS_ORDENADAS = {
+    'senoridade': ORDEM_SENORIDADE,
+    'modalidade': ORDEM_MODALIDADE,
+    'tamanho_empresa': ORDEM_TAMANHO_EMPRESA,
+}
+CATEGORICAS = ['cargo', 'periodo', 'moeda_salario']
+# Mesmo conjunto de categorias nas duas colunas de país, para que possam ser
+# comparadas diretamente (trabalho internacional)
+PAISES = ['residencia', 'localizacao_empresa']
+NUMERICAS = ['ano', 'salario', 'salario_em_dolar_americano']
+
+# Colunas derivadas que os painéis usam, calculadas uma vez na carga (não vão
+# para o snapshot nem para o CSV)
+SENIORIDADE_NUMERICA = {'Júnior': 1, 'Pleno': 2, 'Sênior': 3, 'Executivo': 4}
+
+# Colunas dos registros lidas pelos painéis (o filtro do app não copia as demais)
+COLUNAS_REGISTROS = [
+    'senoridade', 'salario_em_dolar_americano', 'modalidade', 'cargo', 'tamanho_empresa',
+    'residencia', 'localizacao_empresa', 'senoridade_numerico', 'trabalho_internacional',
+]
+
+
+def hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    """Retorna o SHA-256 (hex) do conteúdo de um arquivo, lido em blocos."""
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(tamanho_bloco), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _texto(valor):
+    return valor if isinstance(valor, str) or pd.isna(valor) else str(valor)
+
+
+def _como_texto(serie):
+    """``serie`` com os valores não nulos que não são texto convertidos com ``str``."""
+    valores = serie.cat.categories if isinstance(serie.dtype, pd.CategoricalDtype) else serie
+    if pd.api.types.infer_dtype(valores, skipna=True) in ('string', 'empty'):
+        return serie
+    return serie.astype(str).where(serie.notna())
+
+
+def aplicar_schema(df, categorias=None):
+    """Converte ``df`` para o schema compacto do dashboard.
+
+    Categóricas ordenadas seguem a ordem declarada; valores fora dela são
+    anexados ao final em ordem alfabética, para nunca virarem nulos. Valores
+    de outro tipo nas colunas categóricas (ex.: ``remote_ratio`` 25 sem
+    tradução em ``modalidade``) viram texto, como ficariam no CSV; o Arrow
+    não aceita categorias de tipos misturados. As numéricas são reduzidas ao
+    menor tipo que comporta os valores.
+
+    ``categorias`` (coluna → valores da base inteira) fixa as categorias quando
+    ``df`` é só um recorte, para que saiam iguais às do dataset completo.
+    """
+    categorias = {coluna: [_texto(valor) for valor in valores] for coluna, valores in (categorias or {}).items()}
+    df = df.copy(deep=False)
+    for coluna in list(CATEGORICAS_ORDENADAS) + CATEGORICAS + PAISES:
+        if coluna in df.columns:
+            df[coluna] = _como_texto(df[coluna])
+
+    def valores(coluna):
+        if coluna in categorias:
+            return set(categorias[coluna])
+        return set(df[coluna].dropna().unique())
+
+    for coluna, ordem in CATEGORICAS_ORDENADAS.items():
+        if coluna in df.columns:
+            extras = sorted(valores(coluna) - set(ordem))
+            df[coluna] = df[coluna].astype(pd.CategoricalDtype(ordem + extras, ordered=True))
+    for coluna in CATEGORICAS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype(pd.CategoricalDtype(sorted(valores(coluna))))
+    paises = [coluna for coluna in PAISES if coluna in df.columns]
+    if paises:
+        todos = sorted(set().union(*(valores(coluna) for coluna in paises)))
+        for coluna in paises:
+            df[coluna] = df[coluna].astype(pd.CategoricalDtype(todos))
+    for coluna in NUMERICAS:
+        if coluna in df.columns:
+            tipo = 'integer' if pd.api.types.is_integer_dtype(df[coluna]) else 'float'
+            df[coluna] = pd.to_numeric(df[coluna], downcast=tipo)
+    return df
+
+
+def derivar_colunas(df):
+    """Acrescenta ``senoridade_numerico`` e ``trabalho_internacional`` sem copiar as demais colunas."""
+    df = df.copy(deep=False)
+    if 'senoridade' in df.columns:
+        df['senoridade_numerico'] = df['senoridade'].map(SENIORIDADE_NUMERICA)
+    if 'residencia' in df.columns and 'localizacao_empresa' in df.columns:
+        df['trabalho_internacional'] = df['residencia'] != df['localizacao_empresa']
+    return df
+
+
+def uso_memoria(df):
+    """Retorna o tamanho em bytes de ``df``, incluindo o conteúdo das strings."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def salvar_snapshot(df, caminho=CAMINHO_SNAPSHOT, hash_origem=""):
+    """Grava ``df`` como Arrow IPC sem compressão (apto a memory map).
+
+    A escrita é feita em arquivo temporário e renomeada no final, para que um
+    leitor concorrente nunca veja um snapshot pela metade.
+    """
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    metadados = dict(tabela.schema.metadata or {})
+    metadados[CHAVE_VERSAO] = VERSAO_SNAPSHOT.encode()
+    metadados[CHAVE_HASH] = hash_origem.encode()
+    tabela = tabela.replace_schema_metadata(metadados)
+
+    temporario = caminho + ".tmp"
+    feather.write_feather(tabela, temporario, compression="uncompressed")
+    os.replace(temporario, caminho)
+
+
+def ler_metadados_snapshot(caminho=CAMINHO_SNAPSHOT):
+    """Lê apenas o schema do snapshot e retorna ``(versao, hash_origem)``."""
+    with pa.memory_map(caminho, "r") as origem:
+        metadados = pa.ipc.open_file(origem).schema.metadata or {}
+    return (
+        metadados.get(CHAVE_VERSAO, b"").decode(),
+        metadados.get(CHAVE_HASH, b"").decode(),
+    )
+
+
+def snapshot_valido(caminho_snapshot=CAMINHO_SNAPSHOT, caminho_csv=CAMINHO_CSV):
+    """Indica se o snapshot existe, tem a versão atual e bate com o CSV local.
+
+    Sem CSV local não há como comparar o conteúdo, então só a versão conta.
+    """
+    if not os.path.exists(caminho_snapshot):
+        return False
+    try:
+        versao, hash_origem = ler_metadados_snapshot(caminho_snapshot)
+    except (OSError, pa.ArrowInvalid):
+        return False
+    if versao != VERSAO_SNAPSHOT:
+        return False
+    if os.path.exists(caminho_csv):
+        return hash_origem == hash_arquivo(caminho_csv)
+    return True
+
+
+def ler_snapshot(caminho=CAMINHO_SNAPSHOT):
+    """Lê o snapshot via memory map e converte para DataFrame."""
+    return aplicar_schema(feather.read_table(caminho, memory_map=True).to_pandas())
+
+
+def caminho_particao(diretorio, ano):
+    """Arquivo Arrow da partição de ``ano``."""
+    return os.path.join(diretorio, f"ano={ano}.arrow")
+
+
+def ler_manifesto(diretorio=DIRETORIO_PARTICOES):
+    """Manifesto das partições por ano, ou ``{}`` se ainda não existe."""
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return {}
+
+
+def salvar_manifesto(manifesto, diretorio=DIRETORIO_PARTICOES):
+    """Grava o manifesto de forma atômica (temporário + rename)."""
+    caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+    with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(caminho + ".tmp", caminho)
+
+
+def ler_particoes(diretorio=DIRETORIO_PARTICOES):
+    """Concatena as partições por ano (via memory map) e aplica o schema."""
+    anos = ler_manifesto(diretorio).get("anos", {})
+    tabelas = [
+        feather.read_table(caminho_particao(diretorio, ano), memory_map=True)
+        for ano in sorted(anos, key=int)
+        if anos[ano]["linhas"] > 0
+    ]
+    tabela = pa.concat_tables(tabelas, promote_options="permissive")
+    return aplicar_schema(tabela.to_pandas())
+
+
+def assinatura_dados(caminho_snapshot=CAMINHO_SNAPSHOT, diretorio_particoes=DIRETORIO_PARTICOES):
+    """Identifica a versão dos dados que ``carregar_dados`` vai ler, sem lê-los.
+
+    Partições: hash dos checksums do manifesto. Snapshot: hash do CSV de
+    origem guardado no schema. ``None`` quando não há nenhum dos dois.
+    """
+    anos = ler_manifesto(diretorio_particoes).get("anos")
+    if anos:
+        texto = json.dumps(anos, sort_keys=True)
+        return "particoes:" + hashlib.sha256(texto.encode()).hexdigest()
+    try:
+        return ler_metadados_snapshot(caminho_snapshot)[1] or None
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def valores_metadados(bloco):
+    """Valores distintos (sem nulos) de cada coluna de ``COLUNAS_METADADOS`` em ``bloco``."""
+    return {coluna: set(bloco[coluna].dropna().unique().tolist()) for coluna in COLUNAS_METADADOS}
+
+
+def montar_metadados(valores, registros, assinatura=None):
+    """Metadados a partir dos valores distintos de cada coluna e do número de registros."""
+    opcoes = {coluna: sorted(valores[coluna]) for coluna in COLUNAS_FILTRO}
+    return {
+        'assinatura': assinatura,
+        'opcoes': opcoes,
+        'resumo': {
+            'registros': registros,
+            'ano_min': min(opcoes['ano'], default=None),
+            'ano_max': max(opcoes['ano'], default=None),
+            'anos': len(opcoes['ano']),
+            'cargos': len(opcoes['cargo']),
+            'paises_empresa': len(valores['localizacao_empresa']),
+            'moedas': len(valores['moeda_salario']),
+        },
+    }
+
+
+def metadados_dataset(blocos, assinatura=None):
+    """Opções dos filtros e contagens do dataset (um DataFrame ou blocos dele)."""
+    if isinstance(blocos, pd.DataFrame):
+        blocos = [blocos]
+    valores = {coluna: set() for coluna in COLUNAS_METADADOS}
+    registros = 0
+    for bloco in blocos:
+        registros += len(bloco)
+        for coluna, valores_bloco in valores_metadados(bloco).items():
+            valores[coluna] |= valores_bloco
+    return montar_metadados(valores, registros, assinatura)
+
+
+def ler_metadados(caminho=CAMINHO_METADADOS):
+    """Metadados gravados pelo ETL, ou ``None`` se o arquivo não existe."""
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def salvar_metadados(metadados, caminho=CAMINHO_METADADOS):
+    """Grava os metadados de forma atômica (temporário + rename)."""
+    with open(caminho + ".tmp", "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+    os.replace(caminho + ".tmp", caminho)
+
+
+def carregar_metadados(diretorio=DIRETORIO, carregar=None):
+    """Metadados válidos para os dados de ``diretorio``.
+
+    Usa o arquivo gravado pelo ETL quando a assinatura confere; senão carrega
+    a base (``carregar()``, ou ``carregar_dados``), recalcula e regrava.
+    """
+    caminhos = caminhos_dados(diretorio)
+    caminho = os.path.join(diretorio, ARQUIVO_METADADOS)
+    metadados = ler_metadados(caminho)
+    assinatura = assinatura_dados(caminhos['caminho_snapshot'], caminhos['diretorio_particoes'])
+    if metadados and assinatura and metadados.get('assinatura') == assinatura:
+        return metadados
+
+    df = carregar() if carregar else carregar_dados(**caminhos)
+    # A carga pode ter regenerado o snapshot: assinatura lida de novo
+    assinatura = assinatura_dados(caminhos['caminho_snapshot'], caminhos['diretorio_particoes'])
+    metadados = metadados_dataset(df, assinatura)
+    try:
+        salvar_metadados(metadados, caminho)
+    except OSError:
+        pass
+    return metadados
+
+
+def gerar_snapshot(caminho_csv=CAMINHO_CSV, caminho_snapshot=CAMINHO_SNAPSHOT):
+    """Reconstrói o snapshot (e os metadados) a partir do CSV tratado e retorna o DataFrame."""
+    df = aplicar_schema(pd.read_csv(caminho_csv))
+    hash_origem = hash_arquivo(caminho_csv)
+    try:
+        salvar_snapshot(df, caminho_snapshot, hash_origem)
+        caminho_metadados = os.path.join(os.path.dirname(os.path.abspath(caminho_snapshot)), ARQUIVO_METADADOS)
+        salvar_metadados(metadados_dataset(df, hash_origem), caminho_metadados)
+    except OSError:
+        # Diretório somente leitura (ex.: deploy): segue com o CSV em memória
+        pass
+    return df
+
+
+def caminhos_dados(diretorio=DIRETORIO):
+    """Argumentos de ``carregar_dados`` para um dataset guardado em ``diretorio``."""
+    return {
+        'caminho_snapshot': os.path.join(diretorio, os.path.basename(CAMINHO_SNAPSHOT)),
+        'caminho_csv': os.path.join(diretorio, os.path.basename(CAMINHO_CSV)),
+        'diretorio_particoes': os.path.join(diretorio, os.path.basename(DIRETORIO_PARTICOES)),
+    }
+
+
+def carregar_dados(caminho_snapshot=CAMINHO_SNAPSHOT, caminho_csv=CAMINHO_CSV, url=URL_CSV,
+                   diretorio_particoes=DIRETORIO_PARTICOES):
+    """Carrega o dataset limpo priorizando o snapshot colunar.
+
+    Ordem: partições do ETL incremental → snapshot válido → snapshot
+    regenerado a partir do CSV local → CSV remoto, este último só quando não
+    há snapshot utilizável.
+    """
+    if ler_manifesto(diretorio_particoes).get("anos"):
+        return ler_particoes(diretorio_particoes)
+    if snapshot_valido(caminho_snapshot, caminho_csv):
+        return ler_snapshot(caminho_snapshot)
+    if os.path.exists(caminho_csv):
+        return gerar_snapshot(caminho_csv, caminho_snapshot)
+    return aplicar_schema(pd.read_csv(url))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o snapshot Arrow do df_limpo.csv")
+    parser.add_argument("csv", nargs="?", default=CAMINHO_CSV)
+    parser.add_argument("snapshot", nargs="?", default=CAMINHO_SNAPSHOT)
+    args = parser.parse_args()
+
+    df = gerar_snapshot(args.csv, args.snapshot)
+    versao, hash_origem = ler_metadados_snapshot(args.snapshot)
+    print(f"Snapshot salvo em {args.snapshot} (versão {versao}, sha256 {hash_origem[:12]})")
+
+    antes = uso_memoria(pd.read_csv(args.csv))
+    depois = uso_memoria(df)
+    print(f"Memória: {antes / 2**20:.1f} MB (CSV) → {depois / 2**20:.1f} MB (schema), {antes / depois:.1f}x menor")
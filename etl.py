@@ -0,0 +1,402 @@
+"""Pipeline de limpeza da base de salários (versão script do etl_colab.ipynb).
+
+Executa, sem notebook, as mesmas etapas do Colab: tradução das colunas,
+substituição de códigos por rótulos em português, remoção de nulos, ``ano``
+inteiro, ``percentual_remoto`` → ``modalidade`` e conversão dos países de
+ISO-2 para ISO-3. Todas as substituições são feitas sobre os valores únicos
+de cada coluna e depois expandidas pelos códigos, em vez de linha a linha.
+
+No modo em blocos a origem é lida em pedaços de tamanho limitado (definido
+por um orçamento de memória), cada bloco passa pelas mesmas etapas (todas são
+linha a linha) e é anexado ao CSV de saída, então o pico de memória não
+depende do tamanho da origem.
+
+No modo incremental a saída é particionada por ano (``df_limpo/ano=AAAA.arrow``)
+e um manifesto guarda o checksum das linhas de origem de cada ano. Só os anos
+novos ou alterados passam pelas etapas de limpeza; anos que sumiram da origem
+têm a partição removida. A origem continua sendo um CSV único, lido inteiro
+quando muda (só um hash dos bytes, sem parse, quando não muda).
+
+Uso::
+
+    python etl.py                          # base pública → df_limpo.csv + df_limpo.arrow
+    python etl.py --origem salaries.csv    # a partir de um arquivo local
+    python etl.py --incremental            # só reprocessa os anos que mudaram
+    python etl.py --em-blocos --memoria-mb 128 --origem dump_grande.csv
+    python etl.py --banco                  # também grava o banco SQLite (MAPA_BACKEND=sql)
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+import pycountry
+
+import banco
+import dados
+from mapeamentos import (
+    MAPEAMENTO_COLUNAS,
+    MAPEAMENTO_MODALIDADE,
+    SUBSTITUIR_CARGO,
+    SUBSTITUIR_PERIODO,
+    SUBSTITUIR_SENORIDADE,
+    SUBSTITUIR_TAMANHO_EMPRESA,
+)
+
+URL_ORIGEM = "https://raw.githubusercontent.com/guilhermeonrails/data-jobs/refs/heads/main/salaries.csv"
+
+# Tipos do CSV tratado, usados para converter a saída em blocos para Arrow
+ESQUEMA_LIMPO = pa.schema([
+    ('ano', pa.int64()),
+    ('senoridade', pa.string()),
+    ('periodo', pa.string()),
+    ('cargo', pa.string()),
+    ('salario', pa.int64()),
+    ('moeda_salario', pa.string()),
+    ('salario_em_dolar_americano', pa.int64()),
+    ('residencia', pa.string()),
+    ('modalidade', pa.string()),
+    ('localizacao_empresa', pa.string()),
+    ('tamanho_empresa', pa.string()),
+])
+
+# Fator entre o tamanho de um bloco lido e o pico durante a limpeza (cópias intermediárias)
+FATOR_MEMORIA_BLOCO = 4
+
+# ISO-2 → ISO-3 montado uma vez a partir do pycountry
+ISO2_PARA_ISO3 = {pais.alpha_2: pais.alpha_3 for pais in pycountry.countries}
+
+
+def mapear_valores(serie, mapeamento, manter_ausentes=True):
+    """Aplica ``mapeamento`` aos valores únicos de ``serie`` e expande pelos códigos.
+
+    Com ``manter_ausentes=True`` equivale a ``serie.replace(mapeamento)``
+    (valores fora do dicionário ficam como estão); com ``False`` equivale a
+    ``serie.map(mapeamento)`` (viram nulos).
+    """
+    codigos, unicos = pd.factorize(serie)
+    unicos = pd.Series(unicos, dtype=object)
+    traduzidos = unicos.map(mapeamento)
+    if manter_ausentes:
+        traduzidos = traduzidos.where(traduzidos.notna(), unicos)
+    # O código -1 (nulo na origem) aponta para o None anexado no final
+    tabela = np.append(traduzidos.to_numpy(dtype=object), None)
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name).infer_objects()
+
+
+def converter_iso2_para_iso3(serie):
+    """Versão vetorizada do ``converter_iso2_para_iso3`` do notebook."""
+    return mapear_valores(serie, ISO2_PARA_ISO3)
+
+
+class Cronometro:
+    """Registra a duração e o número de linhas ao fim de cada etapa.
+
+    Etapas repetidas (uma por bloco, no modo em blocos) são acumuladas.
+    """
+
+    def __init__(self):
+        self.etapas = []
+        self._inicio = time.perf_counter()
+
+    def marcar(self, etapa, df):
+        agora = time.perf_counter()
+        segundos, linhas = agora - self._inicio, len(df)
+        for posicao, (nome, acumulado, total) in enumerate(self.etapas):
+            if nome == etapa:
+                self.etapas[posicao] = (nome, acumulado + segundos, total + linhas)
+                break
+        else:
+            self.etapas.append((etapa, segundos, linhas))
+        self._inicio = agora
+
+    def relatorio(self):
+        linhas = [f"{etapa:<28} {segundos * 1000:>9.1f} ms {total:>10,} linhas" for etapa, segundos, total in self.etapas]
+        linhas.append(f"{'total':<28} {sum(s for _, s, _ in self.etapas) * 1000:>9.1f} ms")
+        return "\n".join(linhas)
+
+
+def limpar(df, cronometro=None):
+    """Aplica as etapas de limpeza do notebook a um DataFrame da base original."""
+    cronometro = cronometro or Cronometro()
+
+    df = df.rename(columns=MAPEAMENTO_COLUNAS)
+    cronometro.marcar("traduzir colunas", df)
+
+    df = df.assign(
+        senoridade=mapear_valores(df['senoridade'], SUBSTITUIR_SENORIDADE),
+        periodo=mapear_valores(df['periodo'], SUBSTITUIR_PERIODO, manter_ausentes=False),
+        cargo=mapear_valores(df['cargo'], SUBSTITUIR_CARGO),
+        tamanho_empresa=mapear_valores(df['tamanho_empresa'], SUBSTITUIR_TAMANHO_EMPRESA),
+    )
+    cronometro.marcar("traduzir valores", df)
+
+    df = df.dropna()
+    df = df.assign(ano=df['ano'].astype('int64'))
+    cronometro.marcar("remover nulos", df)
+
+    df = df.assign(percentual_remoto=mapear_valores(df['percentual_remoto'], MAPEAMENTO_MODALIDADE))
+    df = df.rename(columns={'percentual_remoto': 'modalidade'})
+    cronometro.marcar("modalidade", df)
+
+    df = df.assign(
+        residencia=converter_iso2_para_iso3(df['residencia']),
+        localizacao_empresa=converter_iso2_para_iso3(df['localizacao_empresa']),
+    )
+    cronometro.marcar("países ISO-3", df)
+    return df
+
+
+def caminho_metadados(caminho_saida):
+    """Arquivo de metadados gravado ao lado de ``caminho_saida``."""
+    return os.path.join(os.path.dirname(os.path.abspath(caminho_saida)), dados.ARQUIVO_METADADOS)
+
+
+def executar(origem=URL_ORIGEM, caminho_csv=dados.CAMINHO_CSV, caminho_snapshot=dados.CAMINHO_SNAPSHOT,
+             caminho_banco=None):
+    """Lê a base original, limpa e grava o CSV tratado, o snapshot Arrow, os metadados e (opcional) o banco."""
+    cronometro = Cronometro()
+    df = pd.read_csv(origem)
+    cronometro.marcar("ler origem", df)
+
+    df_limpo = limpar(df, cronometro)
+
+    df_limpo.to_csv(caminho_csv, index=False)
+    cronometro.marcar("gravar CSV", df_limpo)
+
+    hash_origem = dados.hash_arquivo(caminho_csv)
+    if caminho_snapshot:
+        dados.salvar_snapshot(dados.aplicar_schema(df_limpo), caminho_snapshot, hash_origem)
+        cronometro.marcar("gravar snapshot", df_limpo)
+
+    dados.salvar_metadados(dados.metadados_dataset(df_limpo, hash_origem), caminho_metadados(caminho_csv))
+    cronometro.marcar("gravar metadados", df_limpo)
+
+    if caminho_banco:
+        banco.criar_banco(df_limpo, caminho_banco)
+        cronometro.marcar("gravar banco", df_limpo)
+    return df_limpo, cronometro
+
+
+def linhas_por_bloco(origem, memoria_mb, amostra=1000):
+    """Tamanho de bloco que mantém a limpeza dentro de ``memoria_mb``.
+
+    Estima os bytes por linha a partir das primeiras ``amostra`` linhas.
+    """
+    df = pd.read_csv(origem, nrows=amostra)
+    bytes_por_linha = df.memory_usage(deep=True).sum() / max(len(df), 1)
+    return max(amostra, int(memoria_mb * 2**20 / (bytes_por_linha * FATOR_MEMORIA_BLOCO)))
+
+
+def csv_para_snapshot(caminho_csv, caminho_snapshot, memoria_mb, hash_origem=None):
+    """Converte o CSV tratado em snapshot Arrow lendo em lotes (memória limitada)."""
+    esquema = ESQUEMA_LIMPO.with_metadata({
+        dados.CHAVE_VERSAO: dados.VERSAO_SNAPSHOT.encode(),
+        dados.CHAVE_HASH: (hash_origem or dados.hash_arquivo(caminho_csv)).encode(),
+    })
+    leitor = pa_csv.open_csv(
+        caminho_csv,
+        read_options=pa_csv.ReadOptions(block_size=max(1 << 20, memoria_mb * 2**20 // FATOR_MEMORIA_BLOCO)),
+        convert_options=pa_csv.ConvertOptions(column_types=ESQUEMA_LIMPO),
+    )
+    temporario = caminho_snapshot + ".tmp"
+    with pa.ipc.new_file(temporario, esquema) as escritor:
+        for lote in leitor:
+            escritor.write_batch(lote.select(esquema.names).cast(ESQUEMA_LIMPO))
+    os.replace(temporario, caminho_snapshot)
+
+
+def executar_em_blocos(origem=URL_ORIGEM, caminho_csv=dados.CAMINHO_CSV, caminho_snapshot=dados.CAMINHO_SNAPSHOT,
+                       memoria_mb=256, tamanho_bloco=None, caminho_banco=None):
+    """Mesma saída de ``executar``, processando a origem em blocos.
+
+    ``tamanho_bloco`` (linhas) tem precedência sobre ``memoria_mb``. Retorna
+    ``(linhas_lidas, linhas_gravadas, cronometro)``.
+    """
+    tamanho_bloco = tamanho_bloco or linhas_por_bloco(origem, memoria_mb)
+    cronometro = Cronometro()
+    linhas_lidas = linhas_gravadas = 0
+
+    def blocos_limpos(saida):
+        nonlocal linhas_lidas, linhas_gravadas
+        for bloco in pd.read_csv(origem, chunksize=tamanho_bloco):
+            cronometro.marcar("ler origem", bloco)
+            bloco_limpo = limpar(bloco, cronometro)
+            bloco_limpo.to_csv(saida, header=linhas_lidas == 0, index=False)
+            cronometro.marcar("gravar CSV", bloco_limpo)
+            linhas_lidas += len(bloco)
+            linhas_gravadas += len(bloco_limpo)
+            yield bloco_limpo
+
+    # Os metadados são acumulados enquanto os blocos passam
+    with open(caminho_csv, "w", encoding="utf-8", newline="") as saida:
+        metadados = dados.metadados_dataset(blocos_limpos(saida))
+
+    metadados['assinatura'] = hash_origem = dados.hash_arquivo(caminho_csv)
+    dados.salvar_metadados(metadados, caminho_metadados(caminho_csv))
+
+    if caminho_snapshot:
+        csv_para_snapshot(caminho_csv, caminho_snapshot, memoria_mb, hash_origem)
+        cronometro.marcar("gravar snapshot", range(linhas_gravadas))
+
+    if caminho_banco:
+        banco.criar_banco(pd.read_csv(caminho_csv, chunksize=tamanho_bloco), caminho_banco)
+        cronometro.marcar("gravar banco", range(linhas_gravadas))
+    return linhas_lidas, linhas_gravadas, cronometro
+
+
+def versao_regras():
+    """Hash dos mapeamentos de limpeza; se mudar, todos os anos são reprocessados."""
+    regras = [
+        MAPEAMENTO_COLUNAS, SUBSTITUIR_SENORIDADE, SUBSTITUIR_PERIODO, SUBSTITUIR_CARGO,
+        SUBSTITUIR_TAMANHO_EMPRESA, MAPEAMENTO_MODALIDADE, ISO2_PARA_ISO3,
+    ]
+    texto = json.dumps(regras, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+
+def checksums_por_ano(df):
+    """Checksum das linhas de origem de cada ``work_year``, independente da ordem.
+
+    Cada linha vira um hash de 64 bits; o checksum do ano é o SHA-256 desses
+    hashes ordenados. Linhas sem ano são ignoradas (caem no ``dropna``).
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return {
+        str(int(ano)): hashlib.sha256(np.sort(hashes[posicoes]).tobytes()).hexdigest()
+        for ano, posicoes in df.groupby('work_year').indices.items()
+    }
+
+
+def ler_origem(origem):
+    """SHA-256 do CSV de origem e o que passar ao ``read_csv``: o caminho local ou o conteúdo baixado."""
+    if os.path.exists(origem):
+        return dados.hash_arquivo(origem), origem
+    with urllib.request.urlopen(origem) as resposta:
+        conteudo = resposta.read()
+    return hashlib.sha256(conteudo).hexdigest(), io.BytesIO(conteudo)
+
+
+def _valores_particao(diretorio, ano):
+    # Manifestos antigos não guardam os valores de cada ano: lidos da partição
+    tabela = dados.aplicar_schema(feather.read_table(dados.caminho_particao(diretorio, ano)).to_pandas())
+    return {coluna: sorted(valores) for coluna, valores in dados.valores_metadados(tabela).items()}
+
+
+def executar_incremental(origem=URL_ORIGEM, diretorio=dados.DIRETORIO_PARTICOES):
+    """Atualiza as partições por ano reprocessando só os anos alterados.
+
+    A origem é um CSV único: se o hash dos bytes não mudou desde a última
+    execução, nada é lido nem gravado. Senão ela é lida inteira para achar os
+    anos alterados (checksum por ano), e só eles passam pela limpeza e são
+    gravados. Os metadados saem dos valores distintos de cada ano guardados no
+    manifesto, sem reler as partições.
+
+    Retorna ``(alterados, removidos, cronometro)``.
+    """
+    cronometro = Cronometro()
+    os.makedirs(diretorio, exist_ok=True)
+    manifesto = dados.ler_manifesto(diretorio)
+    regras = versao_regras()
+    hash_origem, fonte = ler_origem(origem)
+    cronometro.marcar("hash da origem", ())
+    if manifesto.get("versao_regras") == regras and manifesto.get("hash_origem") == hash_origem:
+        return [], [], cronometro
+
+    df = pd.read_csv(fonte)
+    cronometro.marcar("ler origem", df)
+
+    checksums = checksums_por_ano(df)
+    cronometro.marcar("checksums por ano", df)
+
+    anteriores = manifesto.get("anos", {}) if manifesto.get("versao_regras") == regras else {}
+    alterados = sorted(ano for ano, checksum in checksums.items() if anteriores.get(ano, {}).get("checksum") != checksum)
+    removidos = sorted(set(manifesto.get("anos", {})) - set(checksums))
+
+    anos = {ano: info for ano, info in anteriores.items() if ano in checksums}
+    if alterados:
+        delta = df[df['work_year'].isin([int(ano) for ano in alterados])]
+        df_limpo = limpar(delta, cronometro)
+        partes = dict(tuple(df_limpo.groupby('ano')))
+        for ano in alterados:
+            parte = partes.get(int(ano))
+            caminho = dados.caminho_particao(diretorio, ano)
+            if parte is None:
+                # Todas as linhas do ano caíram na limpeza
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+                anos[ano] = {"checksum": checksums[ano], "linhas": 0, "valores": {}}
+                continue
+            dados.salvar_snapshot(parte.reset_index(drop=True), caminho, checksums[ano])
+            anos[ano] = {
+                "checksum": checksums[ano],
+                "linhas": len(parte),
+                "valores": {coluna: sorted(valores) for coluna, valores in dados.valores_metadados(parte).items()},
+            }
+        cronometro.marcar("gravar partições", df_limpo)
+
+    for ano in removidos:
+        caminho = dados.caminho_particao(diretorio, ano)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+    for ano, info in anos.items():
+        if "valores" not in info:
+            info["valores"] = _valores_particao(diretorio, ano) if info["linhas"] > 0 else {}
+
+    dados.salvar_manifesto({"versao_regras": regras, "hash_origem": hash_origem, "anos": anos}, diretorio)
+
+    if anos:
+        valores = {coluna: set() for coluna in dados.COLUNAS_METADADOS}
+        for info in anos.values():
+            for coluna, valores_ano in info["valores"].items():
+                valores[coluna].update(valores_ano)
+        metadados = dados.montar_metadados(
+            valores, sum(info["linhas"] for info in anos.values()), dados.assinatura_dados(diretorio_particoes=diretorio)
+        )
+        dados.salvar_metadados(metadados, caminho_metadados(diretorio))
+        cronometro.marcar("gravar metadados", range(metadados['resumo']['registros']))
+    return alterados, removidos, cronometro
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Limpa a base de salários e gera df_limpo.csv/df_limpo.arrow")
+    parser.add_argument("--origem", default=URL_ORIGEM, help="CSV original (URL ou caminho local)")
+    parser.add_argument("--saida-csv", default=dados.CAMINHO_CSV)
+    parser.add_argument("--saida-snapshot", default=dados.CAMINHO_SNAPSHOT, help="vazio para não gerar o snapshot")
+    parser.add_argument("--incremental", action="store_true", help="grava partições por ano e só reprocessa os anos alterados")
+    parser.add_argument("--saida-particoes", default=dados.DIRETORIO_PARTICOES)
+    parser.add_argument("--em-blocos", action="store_true", help="lê e grava em blocos, com memória limitada")
+    parser.add_argument("--memoria-mb", type=int, default=256, help="orçamento de memória do modo em blocos")
+    parser.add_argument("--linhas-por-bloco", type=int, help="tamanho fixo de bloco (ignora --memoria-mb)")
+    parser.add_argument("--banco", action="store_true", help="também grava o banco SQLite em esquema estrela")
+    parser.add_argument("--saida-banco", default=banco.CAMINHO_BANCO)
+    args = parser.parse_args()
+    caminho_banco = args.saida_banco if args.banco else None
+
+    if args.em_blocos:
+        linhas_lidas, linhas_gravadas, cronometro = executar_em_blocos(
+            args.origem, args.saida_csv, args.saida_snapshot, args.memoria_mb, args.linhas_por_bloco, caminho_banco
+        )
+        print(cronometro.relatorio())
+        segundos = sum(s for _, s, _ in cronometro.etapas)
+        print(f"{linhas_lidas:,} linhas lidas, {linhas_gravadas:,} gravadas, {linhas_lidas / segundos:,.0f} linhas/s")
+    elif args.incremental:
+        alterados, removidos, cronometro = executar_incremental(args.origem, args.saida_particoes)
+        print(cronometro.relatorio())
+        print(f"Anos reprocessados: {', '.join(alterados) or 'nenhum'}")
+        print(f"Anos removidos: {', '.join(removidos) or 'nenhum'}")
+        if caminho_banco:
+            # O banco não é particionado: é recarregado a partir das partições
+            banco.criar_banco(dados.ler_particoes(args.saida_particoes), caminho_banco)
+    else:
+        df_limpo, cronometro = executar(args.origem, args.saida_csv, args.saida_snapshot, caminho_banco)
+        print(cronometro.relatorio())
+        print(f"DataFrame df_limpo salvo como {args.saida_csv}")
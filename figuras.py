@@ -0,0 +1,93 @@
+"""Cache do JSON das figuras Plotly, compartilhado entre sessões.
+
+Montar e validar uma figura Plotly e serializá-la em JSON custa mais que as
+agregações pequenas que a alimentam. Aqui cada figura é guardada já como o
+JSON enviado ao navegador, com a chave (id da figura, hash dos dados agregados
+que a alimentam, opções de layout): seleções diferentes que resultam nos
+mesmos números reaproveitam a figura, e o ``app.py`` envia o JSON sem recriar
+o modelo de objetos do Plotly.
+
+O cache é um ``CacheLRU`` (limite em bytes, despejo LRU), criado uma vez por
+processo no ``app.py``; sem cache, as figuras são serializadas a cada cálculo.
+"""
+import hashlib
+import json
+import pickle
+
+import pandas as pd
+import plotly.io as pio
+
+# Mesmo config que o st.plotly_chart envia por padrão
+CONFIG_PLOTLY = json.dumps({"showLink": False, "linkText": False})
+
+
+def hash_dados(dados):
+    """Hash estável de DataFrames/Series (valores, índice e nomes) e objetos simples."""
+    hash_ = hashlib.sha1()
+    for parte in dados if isinstance(dados, tuple) else (dados,):
+        if isinstance(parte, (pd.DataFrame, pd.Series)):
+            hash_.update(pd.util.hash_pandas_object(parte, index=True).to_numpy().tobytes())
+            nomes = list(parte.columns) if isinstance(parte, pd.DataFrame) else [parte.name]
+            hash_.update(repr((nomes, list(parte.index.names))).encode())
+        else:
+            hash_.update(pickle.dumps(parte, protocol=pickle.HIGHEST_PROTOCOL))
+    return hash_.hexdigest()
+
+
+def figura_json(cache, id_figura, dados, construir, **layout):
+    """JSON da figura ``id_figura``, montada por ``construir()`` só numa falha do cache.
+
+    ``dados`` são os agregados que alimentam a figura (DataFrame, Series,
+    escalar ou tupla deles) e ``layout`` vai para ``update_layout``; os dois
+    entram na chave junto com o id.
+    """
+    def serializar():
+        figura = construir()
+        figura.update_layout(**layout)
+        return pio.to_json(figura, validate=False)
+
+    if cache is None:
+        return serializar()
+    chave = ('figura', id_figura, hash_dados(dados), json.dumps(layout, sort_keys=True, default=str))
+    return cache.obter(chave, serializar)
+
+
+def plotly_json(spec):
+    """Equivalente de ``st.plotly_chart(figura)`` a partir do JSON já serializado.
+
+    O ``st.plotly_chart`` recria e valida a figura a partir de um dict; aqui o
+    elemento é montado como ele faz (tema do Streamlit, largura do container),
+    mas com o JSON pronto. Usa funções internas do Streamlit (versão fixada no
+    ``requirements.txt``): se alguma sumir ou mudar de assinatura, cai no
+    ``st.plotly_chart``.
+    """
+    import streamlit as st
+
+    try:
+        from streamlit.elements.lib.form_utils import current_form_id
+        from streamlit.elements.lib.utils import compute_and_register_element_id
+        from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+        # Antes de registrar o id: uma falha depois dele faria o fallback repetir o id
+        enfileirar = st._main._enqueue
+        proto = PlotlyChartProto()
+        proto.use_container_width = True
+        proto.theme = "streamlit"
+        proto.form_id = current_form_id(st._main)
+        proto.spec = spec
+        proto.config = CONFIG_PLOTLY
+        proto.id = compute_and_register_element_id(
+            "plotly_chart",
+            user_key=None,
+            form_id=proto.form_id,
+            plotly_spec=proto.spec,
+            plotly_config=proto.config,
+            selection_mode=("points", "box", "lasso"),
+            is_selection_activated=False,
+            theme="streamlit",
+            use_container_width=True,
+        )
+    except (ImportError, AttributeError, TypeError):
+        st.plotly_chart(json.loads(spec), use_container_width=True)
+        return
+    enfileirar("plotly_chart", proto)
@@ -0,0 +1,76 @@
+"""Índice de bitmaps para os filtros da sidebar.
+
+Construído uma única vez por processo: para cada coluna filtrável guarda um
+bitmap (bits empacotados em palavras de 64 bits) por valor distinto. Uma
+seleção vira OR entre os bitmaps dos valores escolhidos na mesma coluna e AND
+entre colunas, seguido de um único ``take`` no DataFrame original.
+"""
+import numpy as np
+import pandas as pd
+
+COLUNAS_FILTRO = ['ano', 'senoridade', 'cargo', 'modalidade', 'tamanho_empresa', 'periodo']
+
+
+class IndiceFiltros:
+    """Bitmaps por valor distinto das colunas de filtro de um DataFrame."""
+
+    def __init__(self, df, colunas=COLUNAS_FILTRO):
+        self.total = len(df)
+        self.palavras = -(-self.total // 64)
+        self.bitmaps = {}
+        for coluna in colunas:
+            serie = df[coluna]
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                codigos = serie.cat.codes.to_numpy()
+                valores = serie.cat.categories
+            else:
+                codigos, valores = pd.factorize(serie, sort=True)
+            self.bitmaps[coluna] = {
+                valor: self._empacotar(codigos == codigo)
+                for codigo, valor in enumerate(valores)
+            }
+
+    def _empacotar(self, mascara):
+        """Empacota uma máscara booleana em palavras uint64."""
+        bits = np.packbits(mascara, bitorder='little')
+        bits = np.pad(bits, (0, self.palavras * 8 - len(bits)))
+        return bits.view(np.uint64)
+
+    def bitmap(self, selecoes):
+        """Resolve ``{coluna: valores}`` em um bitmap empacotado.
+
+        Colunas com seleção vazia (ou ``None``) não restringem o resultado,
+        como nos ``if selecionados:`` do dashboard.
+        """
+        resultado = np.full(self.palavras, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for coluna, selecionados in selecoes.items():
+            if not selecionados:
+                continue
+            bitmaps = self.bitmaps[coluna]
+            uniao = np.zeros(self.palavras, dtype=np.uint64)
+            for valor in selecionados:
+                if valor in bitmaps:
+                    uniao |= bitmaps[valor]
+            resultado &= uniao
+        return resultado
+
+    def mascara(self, selecoes):
+        """Máscara booleana (uma posição por linha) da seleção."""
+        bits = np.unpackbits(self.bitmap(selecoes).view(np.uint8), count=self.total, bitorder='little')
+        return bits.view(bool)
+
+    def posicoes(self, selecoes):
+        """Posições (``iloc``) das linhas que atendem à seleção."""
+        return np.flatnonzero(self.mascara(selecoes))
+
+    def filtrar(self, df, selecoes):
+        """Aplica a seleção a ``df`` com um único ``take``.
+
+        Quando a seleção cobre todas as linhas, devolve o próprio ``df``, sem
+        cópia (o app roda com copy-on-write, então quem recebe não o altera).
+        """
+        posicoes = self.posicoes(selecoes)
+        if len(posicoes) == self.total:
+            return df
+        return df.take(posicoes)
+
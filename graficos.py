@@ -0,0 +1,123 @@
+"""Figuras Plotly montadas a partir de estatísticas calculadas no servidor.
+
+``px.box`` serializa cada salário no JSON da figura e deixa o Plotly.js
+calcular os quartis no navegador. Aqui os quartis, as cercas (whiskers) e uma
+amostra limitada de outliers por grupo são calculados com pandas/numpy, e a
+figura leva só esses números. Pelo mesmo motivo, o scatter usa WebGL acima de
+um limite de linhas e uma amostra estratificada de tamanho fixo.
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Máximo de outliers desenhados por grupo (amostra que preserva os extremos)
+MAX_OUTLIERS = 100
+
+# Scatter: acima de LIMITE_WEBGL linhas usa Scattergl; acima de MAX_PONTOS_SCATTER
+# desenha uma amostra estratificada, com pelo menos MIN_POR_ESTRATO pontos por estrato
+LIMITE_WEBGL = 1000
+MAX_PONTOS_SCATTER = 5000
+MIN_POR_ESTRATO = 50
+
+
+def estatisticas_box(df, grupo, valor, ordem=None, max_outliers=MAX_OUTLIERS):
+    """Quartis, cercas e outliers de ``valor`` por ``grupo``.
+
+    Segue as regras do Plotly: quartis por interpolação linear e cercas no
+    dado mais extremo dentro de 1,5 × IQR. Retorna ``(estatisticas, outliers)``,
+    onde ``estatisticas`` tem uma linha por grupo (na ``ordem`` dada, ou na
+    ordem do groupby) e ``outliers`` mapeia grupo → array ordenado com no
+    máximo ``max_outliers`` valores, sempre incluindo o menor e o maior.
+    """
+    valores = df[valor].astype('float64')
+    agrupado = valores.groupby(df[grupo], observed=True)
+
+    # reindex garante as três colunas mesmo quando não há registros
+    estatisticas = agrupado.quantile([0.25, 0.5, 0.75]).unstack().reindex(columns=[0.25, 0.5, 0.75])
+    estatisticas.columns = ['q1', 'median', 'q3']
+    if ordem is not None:
+        estatisticas = estatisticas.reindex([g for g in ordem if g in estatisticas.index])
+
+    iqr = estatisticas['q3'] - estatisticas['q1']
+    limite_inferior = (estatisticas['q1'] - 1.5 * iqr).reindex(df[grupo]).to_numpy()
+    limite_superior = (estatisticas['q3'] + 1.5 * iqr).reindex(df[grupo]).to_numpy()
+    dentro = (valores.to_numpy() >= limite_inferior) & (valores.to_numpy() <= limite_superior)
+
+    internos = valores[dentro].groupby(df[grupo][dentro], observed=True)
+    estatisticas['lowerfence'] = internos.min()
+    estatisticas['upperfence'] = internos.max()
+
+    fora = ~dentro & ~np.isnan(limite_inferior)
+    externos = pd.DataFrame({'grupo': df[grupo][fora], 'valor': valores[fora]}).sort_values(['grupo', 'valor'])
+    outliers = {}
+    for nome, pontos in externos.groupby('grupo', observed=True)['valor']:
+        pontos = pontos.to_numpy()
+        if len(pontos) > max_outliers:
+            pontos = pontos[np.linspace(0, len(pontos) - 1, max_outliers).round().astype(int)]
+        outliers[nome] = pontos
+    return estatisticas, outliers
+
+
+def box_de_estatisticas(estatisticas, outliers, grupo, valor, titulo, labels, cores):
+    """Figura de caixas a partir do resultado de ``estatisticas_box``."""
+    fig = go.Figure()
+    for posicao, (nome, linha) in enumerate(estatisticas.iterrows()):
+        cor = cores[posicao % len(cores)]
+        fig.add_trace(go.Box(
+            name=str(nome),
+            x=[nome],
+            q1=[linha['q1']],
+            median=[linha['median']],
+            q3=[linha['q3']],
+            lowerfence=[linha['lowerfence']],
+            upperfence=[linha['upperfence']],
+            marker_color=cor,
+            boxpoints=False,
+        ))
+        if nome in outliers:
+            fig.add_trace(go.Scatter(
+                name=str(nome),
+                x=[nome] * len(outliers[nome]),
+                y=outliers[nome],
+                mode='markers',
+                marker=dict(color=cor, size=4),
+                hoverinfo='y',
+                showlegend=False,
+            ))
+
+    fig.update_layout(
+        title=titulo,
+        xaxis_title=labels.get(grupo, grupo),
+        yaxis_title=labels.get(valor, valor),
+        boxmode='overlay',
+    )
+    return fig
+
+
+def amostra_estratificada(df, estratos, max_pontos=MAX_PONTOS_SCATTER, min_por_estrato=MIN_POR_ESTRATO, semente=0):
+    """Amostra de ~``max_pontos`` linhas proporcional ao tamanho de cada estrato.
+
+    Estratos pequenos mantêm até ``min_por_estrato`` linhas, para não sumirem
+    do gráfico. A semente fixa deixa a amostra estável entre reruns.
+    """
+    if len(df) <= max_pontos:
+        return df
+    embaralhado = df.sample(frac=1, random_state=semente)
+    grupos = embaralhado.groupby(estratos, observed=True)
+    posicao = grupos.cumcount().to_numpy()
+    tamanho = grupos[estratos[0]].transform('size').to_numpy()
+    cota = np.maximum(np.ceil(tamanho * max_pontos / len(df)), np.minimum(tamanho, min_por_estrato))
+    return embaralhado[posicao < cota].sort_index()
+
+
+def scatter_de_amostra(amostra, total, title, limite_webgl=LIMITE_WEBGL, **kwargs):
+    """``px.scatter`` da ``amostra`` de um conjunto com ``total`` linhas."""
+    if len(amostra) < total:
+        title = f"{title}<br><sup>Amostra estratificada de {len(amostra):,} de {total:,} registros</sup>"
+    return px.scatter(
+        amostra,
+        title=title,
+        render_mode='webgl' if total > limite_webgl else 'svg',
+        **kwargs
+    )
@@ -0,0 +1,436 @@
+"""Mapeamentos de tradução da base de salários (extraídos do etl_colab.ipynb)."""
+
+# Colunas da base original → nomes em português
+MAPEAMENTO_COLUNAS = {
+    'work_year': 'ano',
+    'experience_level': 'senoridade',
+    'employment_type': 'periodo',
+    'job_title': 'cargo',
+    'salary': 'salario',
+    'salary_currency': 'moeda_salario',
+    'salary_in_usd': 'salario_em_dolar_americano',
+    'employee_residence': 'residencia',
+    'remote_ratio': 'percentual_remoto',
+    'company_location': 'localizacao_empresa',
+    'company_size': 'tamanho_empresa'
+}
+
+SUBSTITUIR_SENORIDADE = {
+    'MI': 'Pleno',
+    'SE': 'Sênior',
+    'EN': 'Júnior',
+    'EX': 'Executivo'
+}
+
+# Aplicado com ``map``: tipos de contrato fora da lista viram nulos (e caem no dropna)
+SUBSTITUIR_PERIODO = {
+    'FT': 'Horário integral',
+    'PT': 'Meio período',
+    'FL': 'FreeLancer',
+    'CT': 'Contrato'
+}
+
+SUBSTITUIR_TAMANHO_EMPRESA = {
+    'S': 'Pequeno',
+    'M': 'Médio',
+    'L': 'Grande'
+}
+
+MAPEAMENTO_MODALIDADE = {
+    0: 'Presencial',
+    50: 'Híbrido',
+    100: 'Remoto'
+}
+
+SUBSTITUIR_CARGO = {
+    'Solutions Engineer': 'Engenheiro de Soluções',
+    'Data Engineer': 'Engenheiro de Dados',
+    'Data Scientist': 'Cientista de Dados',
+    'BI Developer': 'Desenvolvedor BI',
+    'Data Analyst': 'Analista de Dados',
+    'Applied Scientist': 'Cientista Aplicado',
+    'Systems Engineer': 'Engenheiro de Sistemas',
+    'Director': 'Diretor',
+    'Associate': 'Associado',
+    'Software Engineer': 'Engenheiro de Software',
+    'Consultant': 'Consultor',
+    'Analyst': 'Analista',
+    'Product Manager': 'Gerente de Produto',
+    'Software Developer': 'Desenvolvedor de Software',
+    'Engineer': 'Engenheiro',
+    'Developer': 'Desenvolvedor',
+    'Data Specialist': 'Especialista em Dados',
+    'Manager': 'Gerente',
+    'Research Scientist': 'Cientista de Pesquisa',
+    'Software Architect': 'Arquiteto de Software',
+    'Data Management Analyst': 'Analista de Gestão de Dados',
+    'Data Reporter': 'Repórter de Dados',
+    'Computational Biologist': 'Biólogo Computacional',
+    'Product Designer': 'Designer de Produto',
+    'Software Development Engineer': 'Engenheiro de Desenvolvimento de Software',
+    'Architect': 'Arquiteto',
+    'Data Analytics Manager': 'Gerente de Análise de Dados',
+    'Principal Statistical Programmer': 'Programador Estatístico Principal',
+    'Cloud Engineer': 'Engenheiro de Cloud',
+    'Data Architect': 'Arquiteto de Dados',
+    'Product Owner': 'Dono do Produto',
+    'Executive': 'Executivo',
+    'Business Intelligence Engineer': 'Engenheiro de Business Intelligence',
+    'Data Governance Lead': 'Líder de Governança de Dados',
+    'Data Governance Specialist': 'Especialista em Governança de Dados',
+    'AI Engineer': 'Engenheiro de IA',
+    'Solutions Architect': 'Arquiteto de Soluções',
+    'AI Researcher': 'Pesquisador de IA',
+    'Machine Learning Engineer': 'Engenheiro de Aprendizado de Máquina',
+    'Bear Robotics': 'Bear Robotics',  # (nome próprio)
+    'Data Strategist': 'Estrategista de Dados',
+    'Research Engineer': 'Engenheiro de Pesquisa',
+    'Researcher': 'Pesquisador',
+    'Business Analyst': 'Analista de Negócios',
+    'Solution Engineer': 'Engenheiro de Soluções',
+    'Full Stack Developer': 'Desenvolvedor Full Stack',
+    'Product Analyst': 'Analista de Produto',
+    'Full Stack Engineer': 'Engenheiro Full Stack',
+    'Backend Engineer': 'Engenheiro Backend',
+    'Sales Engineer': 'Engenheiro de Vendas',
+    'Prompt Engineer': 'Engenheiro de Prompt',
+    'Head of AI': 'Chefe de IA',
+    'Platform Engineer': 'Engenheiro de Plataforma',
+    'Analytics Engineer': 'Engenheiro de Análise',
+    'Engineering Manager': 'Gerente de Engenharia',
+    'BI Engineer': 'Engenheiro BI',
+    'Systems Administrator': 'Administrador de Sistemas',
+    'Data Platform Engineer': 'Engenheiro de Plataforma de Dados',
+    'Site Reliability Engineer': 'Engenheiro de Confiabilidade de Site',
+    'Computer Vision Engineer': 'Engenheiro de Visão Computacional',
+    'Data Operations Analyst': 'Analista de Operações de Dados',
+    'MLOps Engineer': 'Engenheiro MLOps',
+    'Solution Architect': 'Arquiteto de Soluções',
+    'Data Product Owner': 'Dono do Produto de Dados',
+    'Data Analytics Specialist': 'Especialista em Análise de Dados',
+    'Artificial Intelligence Engineer': 'Engenheiro de Inteligência Artificial',
+    'ML Scientist': 'Cientista de Aprendizado de Máquina',
+    'Data Governance Manager': 'Gerente de Governança de Dados',
+    'Data Manager': 'Gerente de Dados',
+    'Machine Learning Scientist': 'Cientista de Aprendizado de Máquina',
+    'Data Management': 'Gestão de Dados',
+    'Data Lead': 'Líder de Dados',
+    'System Engineer': 'Engenheiro de Sistema',
+    'Research Assistant': 'Assistente de Pesquisa',
+    'Statistical Programmer': 'Programador Estatístico',
+    'Data Analysis': 'Análise de Dados',
+    'Data Quality Lead': 'Líder de Qualidade de Dados',
+    'Tech Lead': 'Líder Técnico',
+    'Head of Data': 'Chefe de Dados',
+    'Data Quality Analyst': 'Analista de Qualidade de Dados',
+    'Quantitative Analyst': 'Analista Quantitativo',
+    'AI Developer': 'Desenvolvedor de IA',
+    'Business Intelligence Specialist': 'Especialista em Business Intelligence',
+    'Business Intelligence Analyst': 'Analista de Business Intelligence',
+    'Data Modeler': 'Modelador de Dados',
+    'Analytics Lead': 'Líder de Análise',
+    'Business Intelligence Developer': 'Desenvolvedor de Business Intelligence',
+    'Creative Technologist': 'Tecnólogo Criativo',
+    'Member of Technical Staff': 'Membro da Equipe Técnica',
+    'Quantitative Researcher': 'Pesquisador Quantitativo',
+    'Data Integration Engineer': 'Engenheiro de Integração de Dados',
+    'Data Management Specialist': 'Especialista em Gestão de Dados',
+    'Postdoctoral Fellow': 'Pós-Doutor',
+    'Power BI Developer': 'Desenvolvedor Power BI',
+    'Data Product Manager': 'Gerente de Produto de Dados',
+    'Technical Architect': 'Arquiteto Técnico',
+    'Data Governance': 'Governança de Dados',
+    'Actuary': 'Atuário',
+    'Big Data Developer': 'Desenvolvedor Big Data',
+    'Lead Engineer': 'Engenheiro Líder',
+    'Technical Lead': 'Líder Técnico',
+    'Encounter Data Management Professional': 'Profissional de Gestão de Dados de Encontros',
+    'Data and Reporting Professional': 'Profissional de Dados e Relatórios',
+    'Cloud Database Engineer': 'Engenheiro de Banco de Dados em Cloud',
+    'Tableau Developer': 'Desenvolvedor Tableau',
+    'Bioinformatics Specialist': 'Especialista em Bioinformática',
+    'Business Intelligence': 'Business Intelligence',
+    'Research Associate': 'Associado de Pesquisa',
+    'Data Analytics Lead': 'Líder de Análise de Dados',
+    'AI Specialist': 'Especialista em IA',
+    'Data Visualization Specialist': 'Especialista em Visualização de Dados',
+    'Computational Scientist': 'Cientista Computacional',
+    'Data Developer': 'Desenvolvedor de Dados',
+    'Data Governance Analyst': 'Analista de Governança de Dados',
+    'DevOps Engineer': 'Engenheiro DevOps',
+    'Data Governance Engineer': 'Engenheiro de Governança de Dados',
+    'AI Architect': 'Arquiteto de IA',
+    'Data Operations': 'Operações de Dados',
+    'Data Integrity Specialist': 'Especialista em Integridade de Dados',
+    'Postdoctoral Researcher': 'Pesquisador Pós-Doutor',
+    'Statistician': 'Estatístico',
+    'Principal Researcher': 'Pesquisador Principal',
+    'QA Engineer': 'Engenheiro de QA',
+    'Data Operations Lead': 'Líder de Operações de Dados',
+    'Quantitative Developer': 'Desenvolvedor Quantitativo',
+    'Account Executive': 'Executivo de Contas',
+    'AI Scientist': 'Cientista de IA',
+    'Data Management Lead': 'Líder de Gestão de Dados',
+    'Machine Learning Specialist': 'Especialista em Aprendizado de Máquina',
+    'AI Content Writer': 'Redator de Conteúdo de IA',
+    'Psychometrician': 'Psicometrista',
+    'Director of Product Management': 'Diretor de Gestão de Produto',
+    'Python Developer': 'Desenvolvedor Python',
+    'Product Specialist': 'Especialista de Produto',
+    'Automation Engineer': 'Engenheiro de Automação',
+    'Decision Scientist': 'Cientista de Decisão',
+    'AI Governance Specialist': 'Especialista em Governança de IA',
+    'Data Steward': 'Administrador de Dados',
+    'Sales Development Representative': 'Representante de Desenvolvimento de Vendas',
+    'Machine Learning Researcher': 'Pesquisador de Aprendizado de Máquina',
+    'AI Research Scientist': 'Cientista de Pesquisa em IA',
+    'Insight Analyst': 'Analista de Insights',
+    'Data Quality Engineer': 'Engenheiro de Qualidade de Dados',
+    'Data & Analytics Analyst': 'Analista de Dados e Análise',
+    'Technical Specialist': 'Especialista Técnico',
+    'Postdoctoral Research Fellow': 'Bolsista de Pesquisa Pós-Doutorado',
+    'Power BI': 'Power BI',  # (nome próprio)
+    'Director of Machine Learning': 'Diretor de Aprendizado de Máquina',
+    'Bioinformatician': 'Bioinformata',
+    'Principal Scientist': 'Cientista Principal',
+    'AI Data Scientist': 'Cientista de Dados de IA',
+    'Research Professional': 'Profissional de Pesquisa',
+    'Power BI Administrator': 'Administrador Power BI',
+    'Data Consultant': 'Consultor de Dados',
+    'Research Analyst': 'Analista de Pesquisa',
+    'ETL Developer': 'Desenvolvedor ETL',
+    'Analytics Specialist': 'Especialista em Análise',
+    'Economist': 'Economista',
+    'Cheminformatics Scientist': 'Cientista de Quimioinformática',
+    'Algorithm Developer': 'Desenvolvedor de Algoritmos',
+    'Data Team Lead': 'Líder da Equipe de Dados',
+    'Data Analist': 'Analista de Dados',  # (nota: provável erro ortográfico no original)
+    'Technical Recruiter': 'Recrutador Técnico',
+    'Data Governance Consultant': 'Consultor de Governança de Dados',
+    'Web Developer': 'Desenvolvedor Web',
+    'Data Visualization Engineer': 'Engenheiro de Visualização de Dados',
+    'Head of Marketing': 'Chefe de Marketing',
+    'Technical Support Specialist': 'Especialista em Suporte Técnico',
+    'Post Doctoral Fellow': 'Pós-Doutor',
+    'Security Researcher': 'Pesquisador de Segurança',
+    'AI Lead': 'Líder de IA',
+    'Cientista de Dados': 'Cientista de Dados',  # (já está em português)
+    'AI Tech Lead': 'Líder Técnico de IA',
+    'Bioinformatics Scientist': 'Cientista de Bioinformática',
+    'Clinical Aide': 'Auxiliar Clínico',
+    'System Administrator': 'Administrador de Sistema',
+    'Data Operations Engineer': 'Engenheiro de Operações de Dados',
+    'Data Infrastructure Engineer': 'Engenheiro de Infraestrutura de Dados',
+    'AI Strategist': 'Estrategista de IA',
+    'DataOps Engineer': 'Engenheiro DataOps',
+    'Application Developer': 'Desenvolvedor de Aplicativos',
+    'AI Product Lead': 'Líder de Produto de IA',
+    'AI Solutions Specialist': 'Especialista em Soluções de IA',
+    'Enterprise Account Executive': 'Executivo de Contas Corporativas',
+    'Software Development Director': 'Diretor de Desenvolvimento de Software',
+    'BI Analyst': 'Analista BI',
+    'Advanced Data Analyst': 'Analista de Dados Avançado',
+    'Head of Machine Learning': 'Chefe de Aprendizado de Máquina',
+    'Cloud Database Administrator': 'Administrador de Banco de Dados em Cloud',
+    'AI Engineering Lead': 'Líder de Engenharia de IA',
+    'Data Reporting Specialist': 'Especialista em Relatórios de Dados',
+    'Quant Trader': 'Trader Quantitativo',
+    'Data Strategy Lead': 'Líder de Estratégia de Dados',
+    'Copywriter': 'Redator',
+    'Integration Specialist': 'Especialista em Integração',
+    'Database Administrator': 'Administrador de Banco de Dados',
+    'Backend Developer': 'Desenvolvedor Backend',
+    'Business Development Representative': 'Representante de Desenvolvimento de Negócios',
+    'Technical Writer': 'Redator Técnico',
+    'AI Product Owner': 'Dono do Produto de IA',
+    'Technical Support Engineer': 'Engenheiro de Suporte Técnico',
+    'Trainee': 'Estagiário',
+    'Head of Applied AI': 'Chefe de IA Aplicada',
+    'Machine Learning Architect': 'Arquiteto de Aprendizado de Máquina',
+    'Java Developer': 'Desenvolvedor Java',
+    'Principal Engineer': 'Engenheiro Principal',
+    'Business Intelligence Lead': 'Líder de Business Intelligence',
+    'Data Visualization Developer': 'Desenvolvedor de Visualização de Dados',
+    'Data Integration Specialist': 'Especialista em Integração de Dados',
+    'Data Management Associate': 'Associado de Gestão de Dados',
+    'Power BI Expert': 'Especialista Power BI',
+    'Marketing Science Partner': 'Parceiro de Ciência de Marketing',
+    'Data Operations Specialist': 'Especialista em Operações de Dados',
+    'Salesforce Administrator': 'Administrador Salesforce',
+    'Chatbot Developer': 'Desenvolvedor de Chatbot',
+    'Cloud Developer': 'Desenvolvedor Cloud',
+    'Data Analytics Business Partner': 'Parceiro de Negócios de Análise de Dados',
+    'Data Quality Expert': 'Especialista em Qualidade de Dados',
+    'Data Integrator': 'Integrador de Dados',
+    'Data Operator': 'Operador de Dados',
+    'BI & Data Analyst': 'Analista BI e Dados',
+    'Network Engineer': 'Engenheiro de Redes',
+    'Risk Analyst': 'Analista de Risco',
+    'Data Integration Lead': 'Líder de Integração de Dados',
+    'DevOps Lead': 'Líder DevOps',
+    'Data Product Lead': 'Líder de Produto de Dados',
+    'Cloud Architect': 'Arquiteto Cloud',
+    'Data Scientist Manager': 'Gerente de Cientista de Dados',
+    'Robotics Engineer': 'Engenheiro de Robótica',
+    'Power BI Specialist': 'Especialista Power BI',
+    'Data Management Consultant': 'Consultor de Gestão de Dados',
+    'Stage': 'Estágio',  # (contexto profissional)
+    'Data and Analytics Consultant': 'Consultor de Dados e Análise',
+    'Alternance': 'Alternância',  # (contexto educacional/profissional)
+    'Big Data Engineer': 'Engenheiro Big Data',
+    'LLM Engineer': 'Engenheiro LLM',
+    'Quantitative Trader': 'Trader Quantitativo',
+    'Machine Learning Lead': 'Líder de Aprendizado de Máquina',
+    'Data Integration Developer': 'Desenvolvedor de Integração de Dados',
+    'Data Operations Manager': 'Gerente de Operações de Dados',
+    'Data Archivist': 'Arquivista de Dados',
+    'Developer Advocate': 'Defensor do Desenvolvedor',
+    'RPA Developer': 'Desenvolvedor RPA',
+    'Research Team Lead': 'Líder da Equipe de Pesquisa',
+    'Data Analytics Developer': 'Desenvolvedor de Análise de Dados',
+    'Quant Options Trader': 'Trader de Opções Quantitativo',
+    'Data Management Expert': 'Especialista em Gestão de Dados',
+    'Conversational AI Designer': 'Designer de IA Conversacional',
+    'Scala Spark Developer': 'Desenvolvedor Scala Spark',
+    'Business Intelligence Manager': 'Gerente de Business Intelligence',
+    'Data Scientist Expert': 'Especialista em Ciência de Dados',
+    'Customer Success Engineer': 'Engenheiro de Sucesso do Cliente',
+    'Data Visualization Designer': 'Designer de Visualização de Dados',
+    'Experienced Quantitative Strategist': 'Estrategista Quantitativo Experiente',
+    'Tech Lead Data': 'Líder Técnico de Dados',
+    'Data and Reporting Analyst': 'Analista de Dados e Relatórios',
+    'AI Programmer': 'Programador de IA',
+    'Data Analysis Specialist': 'Especialista em Análise de Dados',
+    'GenAI Architect': 'Arquiteto GenAI',
+    'Machine Learning Developer': 'Desenvolvedor de Aprendizado de Máquina',
+    'Data Reporting Analyst': 'Analista de Relatórios de Dados',
+    'Data Integrity Analyst': 'Analista de Integridade de Dados',
+    'Data Visualization Analyst': 'Analista de Visualização de Dados',
+    'Lead Data Analysis': 'Líder de Análise de Dados',
+    'Data Visualization Expert': 'Especialista em Visualização de Dados',
+    'Customer Success Manager': 'Gerente de Sucesso do Cliente',
+    'Actuarial Analyst': 'Analista Atuarial',
+    'AI Governance Lead': 'Líder de Governança de IA',
+    'Data Quality Specialist': 'Especialista em Qualidade de Dados',
+    'AI Data Engineer': 'Engenheiro de Dados de IA',
+    'Technology Integrator': 'Integrador de Tecnologia',
+    'Principal Software Architect': 'Arquiteto de Software Principal',
+    'Master Data Management': 'Gestão de Dados Mestre',
+    'Staff Data Scientist': 'Cientista de Dados Sênior',
+    'AI Machine Learning Engineer': 'Engenheiro de IA e Aprendizado de Máquina',
+    'Lead Analyst': 'Analista Líder',
+    'Data Analytics Consultant': 'Consultor de Análise de Dados',
+    'Data Scientist Associate': 'Associado de Ciência de Dados',
+    'Clinical Data Operator': 'Operador de Dados Clínicos',
+    'Research Data Manager': 'Gerente de Dados de Pesquisa',
+    'Applied Research Scientist': 'Cientista de Pesquisa Aplicada',
+    'Lead Data Management': 'Líder de Gestão de Dados',
+    'Data Integration Analyst': 'Analista de Integração de Dados',
+    'Safety Data Management Specialist': 'Especialista em Gestão de Dados de Segurança',
+    'Big Data Analyst': 'Analista Big Data',
+    'Pricing Analyst': 'Analista de Preços',
+    'Lead Data Engineer': 'Engenheiro de Dados Líder',
+    'AI Engineering Manager': 'Gerente de Engenharia de IA',
+    'Data Management Coordinator': 'Coordenador de Gestão de Dados',
+    'Analytics Analyst': 'Analista de Análise',
+    'Controls Engineer': 'Engenheiro de Controle',
+    'Machine Learning Tech Lead': 'Líder Técnico de Aprendizado de Máquina',
+    'Business Development Manager': 'Gerente de Desenvolvimento de Negócios',
+    'Business Insights Manager': 'Gerente de Insights de Negócios',
+    'Platform Data Engineer': 'Engenheiro de Dados de Plataforma',
+    'Principal Application Delivery Consultant': 'Consultor Principal de Entrega de Aplicações',
+    'Data Governance Architect': 'Arquiteto de Governança de Dados',
+    'Power BI Consultant': 'Consultor Power BI',
+    'Backend Software Engineer': 'Engenheiro de Software Backend',
+    'AI Product Manager': 'Gerente de Produto de IA',
+    'Data Operations Associate': 'Associado de Operações de Dados',
+    'ML Infrastructure Engineer': 'Engenheiro de Infraestrutura de ML',
+    'Fullstack Engineer': 'Engenheiro Fullstack',
+    'Machine Learning Quality Engineer': 'Engenheiro de Qualidade de Aprendizado de Máquina',
+    'Security Engineer': 'Engenheiro de Segurança',
+    'Databricks Engineer': 'Engenheiro Databricks',
+    'Infrastructure Engineer': 'Engenheiro de Infraestrutura',
+    'Machine Learning Performance Engineer': 'Engenheiro de Performance de Aprendizado de Máquina',
+    'Data Analytics Associate': 'Associado de Análise de Dados',
+    'Power BI Architect': 'Arquiteto Power BI',
+    'Machine Learning Platform Engineer': 'Engenheiro de Plataforma de Aprendizado de Máquina',
+    'AI Solution Architect': 'Arquiteto de Solução de IA',
+    'Data Scientist Lead': 'Líder de Cientista de Dados',
+    'Machine Vision Engineer': 'Engenheiro de Visão de Máquina',
+    'Machine Learning Model Engineer': 'Engenheiro de Modelos de Aprendizado de Máquina',
+    'Marketing Analyst': 'Analista de Marketing',
+    'Data Management Manager': 'Gerente de Gestão de Dados',
+    'Marketing Analytics Manager': 'Gerente de Análise de Marketing',
+    'Applied AI ML Lead': 'Líder de IA e Aprendizado de Máquina Aplicados',
+    'Data Strategy Manager': 'Gerente de Estratégia de Dados',
+    'Machine Learning Manager': 'Gerente de Aprendizado de Máquina',
+    'Data Product Analyst': 'Analista de Produto de Dados',
+    'Data Quality Manager': 'Gerente de Qualidade de Dados',
+    'Elasticsearch Administrator': 'Administrador Elasticsearch',
+    'Machine Learning Infrastructure Engineer': 'Engenheiro de Infraestrutura de Aprendizado de Máquina',
+    'People Data Analyst': 'Analista de Dados de Pessoas',
+    'Frontend Engineer': 'Engenheiro Frontend',
+    'NLP Engineer': 'Engenheiro de PLN',
+    'SAS Developer': 'Desenvolvedor SAS',
+    'Data Analytics Team Lead': 'Líder da Equipe de Análise de Dados',
+    'Machine Learning Modeler': 'Modelador de Aprendizado de Máquina',
+    'Data Integration Coordinator': 'Coordenador de Integração de Dados',
+    'Admin & Data Analyst': 'Administrador e Analista de Dados',
+    'Head of Business Intelligence': 'Chefe de Business Intelligence',
+    'ETL Engineer': 'Engenheiro ETL',
+    'AI Research Engineer': 'Engenheiro de Pesquisa em IA',
+    'Business Intelligence Consultant': 'Consultor de Business Intelligence',
+    'Robotics Software Engineer': 'Engenheiro de Software de Robótica',
+    'AI Software Engineer': 'Engenheiro de Software de IA',
+    'Lead AI Engineer': 'Engenheiro Líder de IA',
+    'AI Software Development Engineer': 'Engenheiro de Desenvolvimento de Software de IA',
+    'Master Data Specialist': 'Especialista em Dados Mestre',
+    'Consultant Data Engineer': 'Engenheiro de Dados Consultor',
+    'Manager Data Management': 'Gerente de Gestão de Dados',
+    'Director of Business Intelligence': 'Diretor de Business Intelligence',
+    'Lead Data Scientist': 'Cientista de Dados Líder',
+    'CRM Data Analyst': 'Analista de Dados de CRM',
+    'BI Data Analyst': 'Analista de Dados BI',
+    'Applied Data Scientist': 'Cientista de Dados Aplicado',
+    'Data DevOps Engineer': 'Engenheiro Data DevOps',
+    'Quantitative Research Analyst': 'Analista de Pesquisa Quantitativa',
+    'Lead Machine Learning Engineer': 'Engenheiro Líder de Aprendizado de Máquina',
+    'Machine Learning Research Engineer': 'Engenheiro de Pesquisa em Aprendizado de Máquina',
+    'Data Analyst Lead': 'Líder de Analista de Dados',
+    'Data Pipeline Engineer': 'Engenheiro de Pipeline de Dados',
+    'Lead Data Analyst': 'Analista de Dados Líder',
+    'Business Data Analyst': 'Analista de Dados de Negócios',
+    'Marketing Data Scientist': 'Cientista de Dados de Marketing',
+    'Deep Learning Engineer': 'Engenheiro de Aprendizado Profundo',
+    'Financial Data Analyst': 'Analista de Dados Financeiros',
+    'Azure Data Engineer': 'Engenheiro de Dados Azure',
+    'Principal Data Scientist': 'Cientista de Dados Principal',
+    'Staff Data Analyst': 'Analista de Dados Sênior',
+    'Machine Learning Software Engineer': 'Engenheiro de Software de Aprendizado de Máquina',
+    'Applied Machine Learning Scientist': 'Cientista de Aprendizado de Máquina Aplicado',
+    'Principal Machine Learning Engineer': 'Engenheiro Principal de Aprendizado de Máquina',
+    'Principal Data Engineer': 'Engenheiro de Dados Principal',
+    'Staff Machine Learning Engineer': 'Engenheiro de Aprendizado de Máquina Sênior',
+    'Business Intelligence Data Analyst': 'Analista de Dados de Business Intelligence',
+    'Finance Data Analyst': 'Analista de Dados Financeiros',
+    'Software Data Engineer': 'Engenheiro de Dados de Software',
+    'Compliance Data Analyst': 'Analista de Dados de Conformidade',
+    'Cloud Data Engineer': 'Engenheiro de Dados em Cloud',
+    'Analytics Engineering Manager': 'Gerente de Engenharia de Análise',
+    'AWS Data Architect': 'Arquiteto de Dados AWS',
+    'Product Data Analyst': 'Analista de Dados de Produto',
+    'Autonomous Vehicle Technician': 'Técnico de Veículos Autônomos',
+    'Sales Data Analyst': 'Analista de Dados de Vendas',
+    'Applied Machine Learning Engineer': 'Engenheiro de Aprendizado de Máquina Aplicado',
+    'BI Data Engineer': 'Engenheiro de Dados BI',
+    'Deep Learning Researcher': 'Pesquisador de Aprendizado Profundo',
+    'Big Data Architect': 'Arquiteto Big Data',
+    'Computer Vision Software Engineer': 'Engenheiro de Software de Visão Computacional',
+    'Marketing Data Engineer': 'Engenheiro de Dados de Marketing',
+    'Data Science Tech Lead': 'Líder Técnico de Ciência de Dados',
+    'Marketing Data Analyst': 'Analista de Dados de Marketing',
+    'Principal Data Architect': 'Arquiteto de Dados Principal',
+    'Data Analytics Engineer': 'Engenheiro de Análise de Dados',
+    'Cloud Data Architect': 'Arquiteto de Dados Cloud',
+    'Principal Data Analyst': 'Analista de Dados Principal'
+}
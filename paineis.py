@@ -0,0 +1,474 @@
+"""Agregações e figuras de cada seção do dashboard.
+
+Cada função recebe os dados já filtrados (registros e/ou células do cubo) e
+devolve um dicionário com as figuras Plotly e tabelas prontas para o
+``app.py`` renderizar. Nada aqui chama Streamlit nem altera o DataFrame
+recebido, então os resultados podem ser cacheados e compartilhados entre
+sessões.
+
+Cada seção é dividida em tarefas independentes (uma por figura ou tabela, em
+funções privadas) que ``paralelo.executar`` roda em sequência ou, com um
+executor, concorrentemente. As figuras saem já em JSON, via
+``figuras.figura_json``: com um ``cache_figuras``, uma figura cujos dados
+agregados não mudaram não é montada de novo.
+
+As médias e contagens de cada seção saem de uma única chamada a
+``cubo.agregar_varios`` (uma passada pelas células do cubo), e as tarefas
+recebem os agrupamentos prontos. Os pedidos de cada seção ficam em
+``PEDIDOS``; quem já tem os agrupamentos (o ``app.py``, atualizando-os por
+diferença com ``cubo.agregar_incremental``) os passa em ``agregados``.
+
+Os registros filtrados trazem só ``dados.COLUNAS_REGISTROS``, já com as
+colunas derivadas de ``dados.derivar_colunas`` calculadas uma vez na carga.
+"""
+from functools import partial
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import cubo
+import figuras
+import graficos
+import paralelo
+import perfil
+import quantis
+import resumos
+from dados import ORDEM_SENORIDADE
+
+# Agrupamentos das células do cubo que cada seção usa (pedidos de ``cubo.agregar_varios``)
+PEDIDOS = {
+    'kpis': {
+        'modalidade': ('modalidade', ['count', 'sum']),
+        'senoridade': ('senoridade', ['count']),
+    },
+    'analise_salarial': {
+        'cargo': ('cargo', ['mean', 'count']),
+        'modalidade': ('modalidade', ['mean', 'count']),
+    },
+    'localizacao_empresas': {
+        'pais': ('localizacao_empresa', ['mean', 'count']),
+        'tamanho': ('tamanho_empresa', ['mean', 'count']),
+    },
+    'tendencias': {
+        'ano': ('ano', ['mean', 'std', 'count']),
+        'ano_modalidade': (['ano', 'modalidade'], ['count']),
+        'ano_tamanho': (['ano', 'tamanho_empresa'], ['count']),
+        'senoridade_ano': (['senoridade', 'ano'], ['mean']),
+    },
+}
+
+
+def kpis(celulas, celulas_total, agregados=None):
+    """Valores da linha de KPIs."""
+    if agregados is None:
+        agregados = cubo.agregar_varios(celulas, PEDIDOS['kpis'])
+    por_modalidade = agregados['modalidade']
+    total = por_modalidade['count'].sum()
+    return {
+        'salario_medio': por_modalidade['sum'].sum() / total,
+        'salario_medio_geral': cubo.resumo(celulas_total)['mean'],
+        'total_registros': int(total),
+        'perc_remoto': por_modalidade['count'].get('Remoto', 0) / total * 100,
+        'perc_junior': agregados['senoridade']['count'].get('Júnior', 0) / total * 100,
+    }
+
+
+def _top_cargos(cache_figuras, por_cargo):
+    # Top 10 cargos melhor pagos
+    top_cargos = por_cargo.reset_index()
+    top_cargos = top_cargos.sort_values('mean', ascending=False).head(10)
+
+    fig1 = figuras.figura_json(cache_figuras, 'fig1', top_cargos, lambda: px.bar(
+        top_cargos,
+        x='mean',
+        y='cargo',
+        orientation='h',
+        title='Top 10 Cargos Melhor Remunerados',
+        labels={'mean': 'Salário Médio (USD)', 'cargo': 'Cargo'},
+        color='mean',
+        color_continuous_scale='Viridis',
+        hover_data=['count']
+    ), height=500)
+    return {'fig1': fig1}
+
+
+def _distribuicao_senioridade(cache_figuras, df_filtrado):
+    # Distribuição salarial por senioridade (quartis calculados no servidor)
+    with perfil.secao('quartis senoridade'):
+        caixas = graficos.estatisticas_box(df_filtrado, 'senoridade', 'salario_em_dolar_americano', ordem=ORDEM_SENORIDADE)
+    fig2 = figuras.figura_json(cache_figuras, 'fig2', caixas, lambda: graficos.box_de_estatisticas(
+        *caixas,
+        'senoridade',
+        'salario_em_dolar_americano',
+        titulo='Distribuição Salarial por Nível de Senioridade',
+        labels={'senoridade': 'Nível', 'salario_em_dolar_americano': 'Salário (USD)'},
+        cores=px.colors.qualitative.Set2
+    ), height=500, showlegend=False)
+    return {'fig2': fig2}
+
+
+def _salario_modalidade(cache_figuras, por_modalidade, esbocos):
+    # Salário médio por modalidade
+    # Médias e contagens vêm do cubo; a mediana, dos esboços de quantis mesclados
+    salario_modalidade = por_modalidade[['mean', 'count']]
+    salario_modalidade.insert(1, 'median', quantis.quantis(esbocos, 'modalidade', [0.5])[0.5])
+    salario_modalidade = salario_modalidade.reset_index()
+    salario_modalidade = salario_modalidade.sort_values('mean', ascending=False)
+
+    fig3 = figuras.figura_json(cache_figuras, 'fig3', salario_modalidade, lambda: px.bar(
+        salario_modalidade,
+        x='modalidade',
+        y='mean',
+        title='Salário Médio por Modalidade de Trabalho',
+        labels={'mean': 'Salário Médio (USD)', 'modalidade': 'Modalidade'},
+        color='mean',
+        color_continuous_scale='Blues',
+        hover_data=['count']
+    ), height=400)
+    return {'fig3': fig3}
+
+
+def _scatter_senioridade(cache_figuras, df_filtrado):
+    # Scatter plot: experiência vs salário colorido por modalidade
+    # Só as colunas usadas; senoridade_numerico (1=Júnior ... 4=Executivo) vem calculada da carga
+    df_scatter = df_filtrado[['senoridade', 'salario_em_dolar_americano', 'modalidade', 'cargo', 'tamanho_empresa', 'senoridade_numerico']]
+
+    # WebGL e amostra estratificada por (senoridade, modalidade) em seleções grandes
+    with perfil.secao('amostra scatter'):
+        amostra = graficos.amostra_estratificada(df_scatter, ['senoridade', 'modalidade'])
+    fig4 = figuras.figura_json(cache_figuras, 'fig4', (amostra, len(df_scatter)), lambda: graficos.scatter_de_amostra(
+        amostra,
+        len(df_scatter),
+        x='senoridade_numerico',
+        y='salario_em_dolar_americano',
+        color='modalidade',
+        size='salario_em_dolar_americano',
+        hover_data=['cargo', 'tamanho_empresa'],
+        title='Relação: Senioridade vs Salário vs Modalidade',
+        labels={
+            'senoridade_numerico': 'Nível de Senioridade (1=Júnior, 4=Executivo)',
+            'salario_em_dolar_americano': 'Salário (USD)',
+            'modalidade': 'Modalidade'
+        },
+        category_orders={'modalidade': ['Presencial', 'Híbrido', 'Remoto']}
+    ), height=400)
+    return {'fig4': fig4}
+
+
+def analise_salarial(df_filtrado, celulas, esbocos, executor=None, cache_figuras=None, agregados=None):
+    """Tab 1: Análise Salarial."""
+    if agregados is None:
+        agregados = cubo.agregar_varios(celulas, PEDIDOS['analise_salarial'])
+    return paralelo.executar([
+        partial(_top_cargos, cache_figuras, agregados['cargo']),
+        partial(_distribuicao_senioridade, cache_figuras, df_filtrado),
+        partial(_salario_modalidade, cache_figuras, agregados['modalidade'], esbocos),
+        partial(_scatter_senioridade, cache_figuras, df_filtrado),
+    ], executor)
+
+
+def _top_paises(cache_figuras, por_pais):
+    # Top países das empresas com maiores salários
+    top_paises = por_pais.reset_index()
+    top_paises = top_paises[top_paises['count'] >= 5]  # Filtra países com pelo menos 5 registros
+    top_paises = top_paises.sort_values('mean', ascending=False).head(15)
+
+    fig5 = figuras.figura_json(cache_figuras, 'fig5', top_paises, lambda: px.bar(
+        top_paises,
+        x='mean',
+        y='localizacao_empresa',
+        orientation='h',
+        title='Top 15 Países (Empresa) com Maiores Salários',
+        labels={'mean': 'Salário Médio (USD)', 'localizacao_empresa': 'País da Empresa'},
+        color='mean',
+        color_continuous_scale='Blues',
+        hover_data=['count']
+    ), height=500)
+    return {'fig5': fig5}
+
+
+def _distribuicao_tamanho(cache_figuras, por_tamanho):
+    # Distribuição por tamanho da empresa (contagens do cubo: uma fatia por porte, não um valor por registro)
+    contagem_tamanho = por_tamanho['count'].rename('contagem').reset_index()
+
+    fig6 = figuras.figura_json(cache_figuras, 'fig6', contagem_tamanho, lambda: px.pie(
+        contagem_tamanho,
+        names='tamanho_empresa',
+        values='contagem',
+        title='Distribuição por Tamanho da Empresa',
+        hole=0.4,
+        color='tamanho_empresa',
+        category_orders={'tamanho_empresa': ['Pequeno', 'Médio', 'Grande']}
+    ), height=400)
+    return {'fig6': fig6}
+
+
+def _salario_tamanho(por_tamanho, esbocos):
+    # Salário médio por tamanho da empresa
+    salario_tamanho = por_tamanho[['mean', 'count']]
+    salario_tamanho.insert(1, 'median', quantis.quantis(esbocos, 'tamanho_empresa', [0.5])[0.5])
+    salario_tamanho = salario_tamanho.round(0)
+    salario_tamanho = salario_tamanho.sort_values('mean', ascending=False)
+    return {'salario_tamanho': salario_tamanho}
+
+
+def _trabalho_internacional(cache_figuras, df_filtrado):
+    resultado = {'fig7': None, 'fig8': None}
+
+    # Análise de residência vs localização da empresa
+    if 'trabalho_internacional' in df_filtrado.columns:
+        # Casos onde residência ≠ local empresa (trabalho remoto internacional), calculados na carga.
+        # Contagem e salário médio de cada grupo numa passada pelos registros
+        por_tipo = cubo.agregar_varios(df_filtrado, {
+            'tipo': ('trabalho_internacional', ['mean', 'count']),
+        })['tipo']
+        total = por_tipo['count'].sum()
+
+        # Percentual de trabalho internacional
+        perc_internacional = por_tipo['count'].get(True, 0) / total * 100 if total else float('nan')
+
+        fig7 = figuras.figura_json(cache_figuras, 'fig7', perc_internacional, lambda: go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=perc_internacional,
+            title={'text': "% Trabalho Internacional"},
+            gauge={
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "darkgreen"},
+                'steps': [
+                    {'range': [0, 33], 'color': "lightgreen"},
+                    {'range': [33, 66], 'color': "yellow"},
+                    {'range': [66, 100], 'color': "orange"}
+                ]
+            }
+        )), height=250)
+
+        # Salário comparativo: internacional vs local
+        salario_comparativo = por_tipo['mean'].rename('salario_em_dolar_americano').reset_index()
+        salario_comparativo['trabalho_internacional'] = salario_comparativo['trabalho_internacional'].map({True: 'Internacional', False: 'Local'})
+
+        fig8 = figuras.figura_json(cache_figuras, 'fig8', salario_comparativo, lambda: px.bar(
+            salario_comparativo,
+            x='trabalho_internacional',
+            y='salario_em_dolar_americano',
+            title='Salário: Trabalho Internacional vs Local',
+            labels={'salario_em_dolar_americano': 'Salário Médio (USD)', 'trabalho_internacional': 'Tipo'},
+            color='trabalho_internacional',
+            color_discrete_sequence=['green', 'blue']
+        ), height=250, showlegend=False)
+
+        resultado.update(fig7=fig7, fig8=fig8)
+
+    return resultado
+
+
+def localizacao_empresas(df_filtrado, celulas, esbocos, executor=None, cache_figuras=None, agregados=None):
+    """Tab 2: Localização e Empresas."""
+    if agregados is None:
+        agregados = cubo.agregar_varios(celulas, PEDIDOS['localizacao_empresas'])
+    return paralelo.executar([
+        partial(_top_paises, cache_figuras, agregados['pais']),
+        partial(_distribuicao_tamanho, cache_figuras, agregados['tamanho']),
+        partial(_salario_tamanho, agregados['tamanho'], esbocos),
+        partial(_trabalho_internacional, cache_figuras, df_filtrado),
+    ], executor)
+
+
+def _evolucao_salario(cache_figuras, por_ano):
+    # Evolução salarial ao longo dos anos
+    evolucao_salario = por_ano.reset_index()
+    fig9 = figuras.figura_json(cache_figuras, 'fig9', evolucao_salario, lambda: _figura_evolucao_salario(evolucao_salario), height=400)
+    return {'fig9': fig9}
+
+
+def _figura_evolucao_salario(evolucao_salario):
+    fig9 = px.line(
+        evolucao_salario,
+        x='ano',
+        y='mean',
+        title='Evolução do Salário Médio (USD)',
+        labels={'ano': 'Ano', 'mean': 'Salário Médio (USD)'},
+        markers=True,
+        line_shape='spline'
+    )
+
+    # Adicionar banda de desvio padrão
+    fig9.add_trace(go.Scatter(
+        x=evolucao_salario['ano'].tolist() + evolucao_salario['ano'].tolist()[::-1],
+        y=(evolucao_salario['mean'] + evolucao_salario['std']).tolist() +
+           (evolucao_salario['mean'] - evolucao_salario['std']).tolist()[::-1],
+        fill='toself',
+        fillcolor='rgba(0,100,80,0.2)',
+        line=dict(color='rgba(255,255,255,0)'),
+        name='Desvio Padrão'
+    ))
+    return fig9
+
+
+def _evolucao_modalidade(cache_figuras, por_ano_modalidade):
+    # Evolução da modalidade de trabalho
+    evolucao_modalidade = cubo.percentual_linhas(por_ano_modalidade['count'], 'modalidade')
+
+    fig10 = figuras.figura_json(cache_figuras, 'fig10', evolucao_modalidade, lambda: px.area(
+        evolucao_modalidade,
+        title='Evolução das Modalidades de Trabalho (%)',
+        labels={'value': 'Percentual (%)', 'ano': 'Ano', 'modalidade': 'Modalidade'},
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    ), height=350)
+    return {'fig10': fig10}
+
+
+def _evolucao_tamanho(cache_figuras, por_ano_tamanho):
+    # Evolução da distribuição por tamanho da empresa
+    evolucao_tamanho = cubo.percentual_linhas(por_ano_tamanho['count'], 'tamanho_empresa')
+
+    fig11 = figuras.figura_json(cache_figuras, 'fig11', evolucao_tamanho, lambda: px.line(
+        evolucao_tamanho,
+        title='Evolução do Tamanho das Empresas (%)',
+        markers=True,
+        color_discrete_sequence=px.colors.qualitative.Bold
+    ), height=350)
+    return {'fig11': fig11}
+
+
+def _heatmap_senioridade(cache_figuras, por_senioridade_ano):
+    # Heatmap: Salário por ano e senioridade
+    heatmap_data = por_senioridade_ano['mean'].unstack('ano')
+
+    # Reordenar as linhas
+    heatmap_data = heatmap_data.reindex(['Júnior', 'Pleno', 'Sênior', 'Executivo'])
+    fig12 = figuras.figura_json(cache_figuras, 'fig12', heatmap_data, lambda: _figura_heatmap(heatmap_data), height=300)
+    return {'fig12': fig12}
+
+
+def _figura_heatmap(heatmap_data):
+    fig12 = px.imshow(
+        heatmap_data,
+        title='Salário Médio por Ano e Senioridade (USD)',
+        labels=dict(x="Ano", y="Senioridade", color="Salário (USD)"),
+        color_continuous_scale='RdBu_r',
+        aspect="auto"
+    )
+
+    # Adicionar valores no heatmap
+    fig12.update_traces(text=heatmap_data.round(0), texttemplate="%{text}")
+    return fig12
+
+
+def tendencias(celulas, executor=None, cache_figuras=None, agregados=None):
+    """Tab 3: Tendências Temporais (só depende das células do cubo)."""
+    if agregados is None:
+        agregados = cubo.agregar_varios(celulas, PEDIDOS['tendencias'])
+    return paralelo.executar([
+        partial(_evolucao_salario, cache_figuras, agregados['ano']),
+        partial(_evolucao_modalidade, cache_figuras, agregados['ano_modalidade']),
+        partial(_evolucao_tamanho, cache_figuras, agregados['ano_tamanho']),
+        partial(_heatmap_senioridade, cache_figuras, agregados['senoridade_ano']),
+    ], executor)
+
+
+def _top_cargos_junior(cache_figuras, df_junior):
+    # Top cargos para juniors
+    top_junior_cargos = resumos.contagens(df_junior['cargo']).head(15).reset_index()
+    top_junior_cargos.columns = ['Cargo', 'Quantidade']
+
+    fig13 = figuras.figura_json(cache_figuras, 'fig13', top_junior_cargos, lambda: px.bar(
+        top_junior_cargos,
+        x='Quantidade',
+        y='Cargo',
+        orientation='h',
+        title='Top 15 Cargos para Iniciantes',
+        color='Quantidade',
+        color_continuous_scale='Greens',
+        hover_data=['Quantidade']
+    ), height=500)
+    return {'fig13': fig13}
+
+
+def _distribuicao_junior(cache_figuras, df_junior):
+    # Box plot salarial para juniors por cargo (top 5, quartis calculados no servidor)
+    top_5_cargos_junior = resumos.contagens(df_junior['cargo']).head(5).index.tolist()
+    df_top5_junior = df_junior[df_junior['cargo'].isin(top_5_cargos_junior)]
+
+    with perfil.secao('quartis júnior'):
+        caixas = graficos.estatisticas_box(df_top5_junior, 'cargo', 'salario_em_dolar_americano', ordem=top_5_cargos_junior)
+    fig14 = figuras.figura_json(cache_figuras, 'fig14', caixas, lambda: graficos.box_de_estatisticas(
+        *caixas,
+        'cargo',
+        'salario_em_dolar_americano',
+        titulo='Distribuição Salarial - Top 5 Cargos Júnior',
+        labels={'salario_em_dolar_americano': 'Salário (USD)', 'cargo': 'Cargo'},
+        cores=px.colors.qualitative.Set3
+    ), height=500, showlegend=False)
+    return {'fig14': fig14}
+
+
+def _estatisticas_junior(df_junior):
+    # Calcular estatísticas para cargos júnior
+    with perfil.secao('stats_junior'):
+        stats_junior = resumos.resumo_por_grupo(
+            df_junior, 'cargo', 'salario_em_dolar_americano', modas=['modalidade', 'tamanho_empresa']
+        ).round(0)
+
+    # Renomear colunas
+    stats_junior.columns = ['Média', 'Mediana', 'Mínimo', 'Máximo', 'Quantidade', 'Modalidade_Mais_Comum', 'Tamanho_Empresa_Mais_Comum']
+    stats_junior = stats_junior.sort_values('Quantidade', ascending=False).head(10)
+
+    return {
+        'stats_junior': stats_junior,
+        # Cargo com melhor salário médio para juniors
+        'melhor_salario_junior': stats_junior.sort_values('Média', ascending=False).iloc[0],
+        # Cargo com mais oportunidades
+        'mais_oportunidades': stats_junior.sort_values('Quantidade', ascending=False).iloc[0],
+        # Modalidade mais comum para juniors (empate: a que aparece primeiro, como na coluna de texto)
+        'modalidade_junior': resumos.contagens(df_junior['modalidade'], normalize=True).head(1),
+    }
+
+
+def _comparacao_mercado(cache_figuras, df_junior, df_filtrado):
+    # Comparação Júnior vs Mercado Total
+    comparacao = pd.DataFrame({
+        'Métrica': ['Salário Médio', '% Remoto', '% Híbrido', '% Presencial', 'Empresas Médias/Grandes'],
+        'Júnior': [
+            df_junior['salario_em_dolar_americano'].mean(),
+            (df_junior['modalidade'] == 'Remoto').mean() * 100,
+            (df_junior['modalidade'] == 'Híbrido').mean() * 100,
+            (df_junior['modalidade'] == 'Presencial').mean() * 100,
+            (df_junior['tamanho_empresa'].isin(['Médio', 'Grande'])).mean() * 100
+        ],
+        'Mercado Total': [
+            df_filtrado['salario_em_dolar_americano'].mean(),
+            (df_filtrado['modalidade'] == 'Remoto').mean() * 100,
+            (df_filtrado['modalidade'] == 'Híbrido').mean() * 100,
+            (df_filtrado['modalidade'] == 'Presencial').mean() * 100,
+            (df_filtrado['tamanho_empresa'].isin(['Médio', 'Grande'])).mean() * 100
+        ]
+    })
+
+    fig15 = figuras.figura_json(cache_figuras, 'fig15', comparacao, lambda: px.bar(
+        comparacao.melt(id_vars='Métrica'),
+        x='Métrica',
+        y='value',
+        color='variable',
+        barmode='group',
+        title='Comparação: Iniciantes vs Mercado Total',
+        labels={'value': 'Valor', 'variable': 'Grupo'},
+        color_discrete_sequence=['green', 'blue']
+    ), height=400, xaxis_tickangle=-45)
+    return {'fig15': fig15}
+
+
+def iniciantes(df_filtrado, executor=None, cache_figuras=None):
+    """Tab 4: Para Iniciantes. Retorna ``None`` quando não há vagas Júnior."""
+    # Filtrar apenas vagas Júnior (cópia compartilhada, só lida pelas tarefas)
+    df_junior = df_filtrado[df_filtrado['senoridade'] == 'Júnior']
+
+    if len(df_junior) == 0:
+        return None
+
+    return paralelo.executar([
+        partial(_top_cargos_junior, cache_figuras, df_junior),
+        partial(_distribuicao_junior, cache_figuras, df_junior),
+        partial(_estatisticas_junior, df_junior),
+        partial(_comparacao_mercado, cache_figuras, df_junior, df_filtrado),
+    ], executor)
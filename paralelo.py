@@ -0,0 +1,67 @@
+"""Execução concorrente das agregações e figuras independentes do dashboard.
+
+As funções de ``paineis`` são divididas em tarefas sem dependência entre si
+(cada uma devolve um pedaço do dicionário de resultados). Com um executor, as
+tarefas rodam num pool de threads e os pedaços são juntados na ordem em que
+foram declarados, então o ``app.py`` renderiza na ordem da página; sem
+executor, rodam em sequência na thread que chamou.
+
+Threads e não processos: os dados filtrados e as células do cubo são
+compartilhados sem cópia nem serialização, e as tarefas só leem o que
+recebem: as colunas derivadas já vêm prontas de ``dados.derivar_colunas`` e
+o que uma tarefa altera são os seus próprios agregados. Cada tarefa roda
+numa cópia do contexto de quem a submeteu, então as seções do ``perfil``
+continuam sendo medidas dentro dos workers.
+
+Número de workers em ``MAPA_TRABALHADORES`` (padrão 1: sequencial).
+"""
+import contextvars
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+TRABALHADORES = int(os.environ.get("MAPA_TRABALHADORES", "1"))
+
+_local = threading.local()
+
+
+def criar_executor(trabalhadores=TRABALHADORES):
+    """Pool de threads com ``trabalhadores`` workers, ou ``None`` se for 1 ou menos."""
+    if trabalhadores <= 1:
+        return None
+    return ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="mapa_paralelo")
+
+
+def _rodar_no_worker(funcao):
+    _local.no_worker = True
+    try:
+        return funcao()
+    finally:
+        _local.no_worker = False
+
+
+def submeter(funcao, executor=None):
+    """Agenda ``funcao()`` no executor e devolve um ``Future``.
+
+    Sem executor, ou quando chamada de dentro de um worker (o pool poderia
+    ficar esperando por ele mesmo), roda na hora e devolve o ``Future`` já
+    resolvido.
+    """
+    if executor is None or getattr(_local, 'no_worker', False):
+        futuro = Future()
+        try:
+            futuro.set_result(funcao())
+        except BaseException as erro:
+            futuro.set_exception(erro)
+        return futuro
+    contexto = contextvars.copy_context()
+    return executor.submit(contexto.run, _rodar_no_worker, funcao)
+
+
+def executar(tarefas, executor=None):
+    """Roda ``tarefas`` (funções que devolvem dicionários) e junta os resultados na ordem."""
+    futuros = [submeter(tarefa, executor) for tarefa in tarefas]
+    resultado = {}
+    for futuro in futuros:
+        resultado.update(futuro.result())
+    return resultado
@@ -0,0 +1,143 @@
+"""Medição opcional do tempo de cada seção do dashboard.
+
+Desligada por padrão. Liga com ``MAPA_PERFIL``, com um ou mais modos
+separados por vírgula:
+
+- ``painel`` (ou ``1``): tabela de tempos num expander no fim da página;
+- ``log``: um registro JSON por rerun (nível INFO) no logger ``perfil``;
+- ``cprofile``: dump do ``cProfile`` do rerun inteiro em ``MAPA_PERFIL_DIR``.
+
+O query param ``?perfil=`` só liga os modos de ``MODOS_URL`` (o painel): log
+e arquivos ``.prof`` ficam a cargo de quem configura o servidor. O
+``cProfile`` é um só por processo (no Python 3.12+ um segundo ``enable`` falha):
+enquanto um rerun está sendo perfilado, os outros seguem só com os tempos.
+
+As seções são marcadas com ``with perfil.secao(nome)`` em qualquer módulo
+(inclusive ``paineis``, que não conhece o Streamlit): o perfilador do rerun
+fica numa ``ContextVar`` da thread da sessão (copiada para os workers de
+``paralelo``, onde as seções medem em paralelo e podem se sobrepor). Sem
+perfilador ativo, ``secao`` devolve um contexto vazio.
+"""
+import contextlib
+import contextvars
+import cProfile
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+MODOS = ('painel', 'log', 'cprofile')
+# Modos que qualquer visitante pode ligar pela URL
+MODOS_URL = ('painel',)
+DIRETORIO_CPROFILE = os.environ.get("MAPA_PERFIL_DIR", tempfile.gettempdir())
+
+logger = logging.getLogger(__name__)
+
+_perfilador = contextvars.ContextVar("perfilador", default=None)
+# Seções abertas no contexto atual (cada worker tem o seu caminho)
+_caminho = contextvars.ContextVar("caminho_secao", default=())
+# Um cProfile ativo por processo
+_lock_cprofile = threading.Lock()
+
+
+def modos_ativos(valor):
+    """Interpreta o valor de ``MAPA_PERFIL``/``?perfil=`` como conjunto de modos."""
+    modos = {modo.strip().lower() for modo in str(valor or "").split(",") if modo.strip()}
+    if modos & {'1', 'true', 'sim'}:
+        modos = (modos - {'1', 'true', 'sim'}) | {'painel'}
+    return modos & set(MODOS)
+
+
+class Perfilador:
+    """Tempos das seções de um rerun, na ordem em que começaram."""
+
+    def __init__(self, modos):
+        self.modos = set(modos)
+        self.tempos = []
+        self.total = None
+        self.arquivo_cprofile = None
+        _caminho.set(())
+        self.inicio_epoch = time.time()
+        self._inicio = time.perf_counter()
+        self._cprofile = None
+        if 'cprofile' in self.modos and _lock_cprofile.acquire(blocking=False):
+            try:
+                self._cprofile = cProfile.Profile()
+                self._cprofile.enable()
+            except ValueError:
+                # Outra ferramenta de profiling já está ativa (sys.monitoring, Python 3.12+)
+                self._cprofile = None
+                _lock_cprofile.release()
+        _perfilador.set(self)
+
+    @contextlib.contextmanager
+    def secao(self, nome):
+        caminho = _caminho.get() + (nome,)
+        token = _caminho.set(caminho)
+        inicio = time.perf_counter()
+        registro = [" › ".join(caminho), inicio - self._inicio, None]
+        self.tempos.append(registro)
+        try:
+            yield
+        finally:
+            registro[2] = time.perf_counter() - inicio
+            _caminho.reset(token)
+
+    def finalizar(self):
+        """Encerra a medição, grava log/cProfile e retorna o tempo total (s); só a primeira chamada tem efeito."""
+        if self.total is not None:
+            return self.total
+        total = time.perf_counter() - self._inicio
+        self.total = total
+        _perfilador.set(None)
+        if self._cprofile is not None:
+            try:
+                self._cprofile.disable()
+                self.arquivo_cprofile = os.path.join(DIRETORIO_CPROFILE, f"mapa_perfil_{time.time_ns()}.prof")
+                self._cprofile.dump_stats(self.arquivo_cprofile)
+            finally:
+                self._cprofile = None
+                _lock_cprofile.release()
+        if 'log' in self.modos:
+            logger.info(json.dumps({
+                'evento': 'rerun',
+                'inicio_epoch': self.inicio_epoch,
+                'total_ms': round(total * 1000, 2),
+                'secoes': [
+                    {'secao': nome, 'inicio_ms': round(comeco * 1000, 2), 'ms': round(segundos * 1000, 2)}
+                    for nome, comeco, segundos in self.tempos
+                ],
+                'cprofile': self.arquivo_cprofile,
+            }, ensure_ascii=False))
+        return total
+
+    def tabela(self):
+        """Tempos como DataFrame (seção, início, ms, % do rerun)."""
+        tabela = pd.DataFrame(self.tempos, columns=['Seção', 'início (ms)', 'ms'])
+        tabela[['início (ms)', 'ms']] = tabela[['início (ms)', 'ms']] * 1000
+        tabela['% do rerun'] = tabela['ms'] / (self.total * 1000) * 100
+        return tabela
+
+
+def iniciar(valor, valor_url=None):
+    """Perfilador para o rerun atual, ou ``None`` se nenhum modo está ativo.
+
+    ``valor`` vem da configuração do servidor (``MAPA_PERFIL``); de ``valor_url``
+    (``?perfil=``) valem só os ``MODOS_URL``.
+    """
+    modos = modos_ativos(valor) | (modos_ativos(valor_url) & set(MODOS_URL))
+    if not modos:
+        # Descarta um perfilador de rerun anterior interrompido (mesma thread)
+        _perfilador.set(None)
+        return None
+    return Perfilador(modos)
+
+
+def secao(nome):
+    """Contexto que mede ``nome`` no perfilador ativo (vazio se não houver)."""
+    perfilador = _perfilador.get()
+    return perfilador.secao(nome) if perfilador is not None else contextlib.nullcontext()
@@ -0,0 +1,84 @@
+"""Esboços de quantis mescláveis para medianas e percentis sob qualquer filtro.
+
+Mediana e quartis não saem de contagens e somas, então o cubo guarda também,
+por combinação das dimensões de filtro, um histograma logarítmico do salário
+(a ideia do DDSketch): o valor ``x`` cai no balde ``ceil(log_γ x)``, com
+``γ = (1 + α) / (1 − α)``. Mesclar esboços é somar as contagens de cada balde,
+então os esboços das células selecionadas são combinados na consulta com um
+``groupby`` cujo custo depende do número de baldes, não de registros.
+
+Garantia de erro: para qualquer posto, o valor devolvido (o ponto médio
+geométrico do balde, ``2γ^i / (γ + 1)``) difere do valor exato daquele posto
+em no máximo ``α`` relativo (``ERRO_RELATIVO`` = 0,5%). Os quantis interpolam
+linearmente entre os dois postos vizinhos, como o ``Series.quantile`` padrão,
+e a interpolação preserva o limite: uma mediana de US$ 120.000 sai entre
+US$ 119.400 e US$ 120.600. Valores menores que ``VALOR_MINIMO`` contam no
+balde de ``VALOR_MINIMO``.
+"""
+import numpy as np
+import pandas as pd
+
+ERRO_RELATIVO = 0.005
+GAMMA = (1 + ERRO_RELATIVO) / (1 - ERRO_RELATIVO)
+VALOR_MINIMO = 1.0
+
+
+def balde(valores):
+    """Índice do balde logarítmico de cada valor."""
+    valores = np.maximum(np.asarray(valores, dtype='float64'), VALOR_MINIMO)
+    return np.ceil(np.log(valores) / np.log(GAMMA)).astype('int32')
+
+
+def valor_balde(baldes):
+    """Valor representante de cada balde (erro relativo ≤ ``ERRO_RELATIVO``)."""
+    return 2 * GAMMA ** np.asarray(baldes, dtype='float64') / (GAMMA + 1)
+
+
+def esbocar(df, dimensoes, valor):
+    """Esboço de ``valor`` por combinação de ``dimensoes``.
+
+    Retorna uma linha por (combinação, balde) com as colunas das dimensões,
+    ``balde`` e ``contagem``; os valores nulos são ignorados.
+    """
+    valores = df[valor]
+    presentes = valores.notna()
+    base = df.loc[presentes, dimensoes].assign(balde=balde(valores[presentes]))
+    esbocos = base.groupby(dimensoes + ['balde'], observed=True).size().rename('contagem').reset_index()
+    esbocos['contagem'] = esbocos['contagem'].astype('int64')
+    return esbocos
+
+
+def quantis(esbocos, por, qs=(0.25, 0.5, 0.75, 0.9)):
+    """Quantis ``qs`` de cada grupo de ``por``, mesclando os esboços do grupo.
+
+    Equivalente aproximado de ``groupby(por)[valor].quantile(qs).unstack()``:
+    índice com os grupos presentes e uma coluna por quantil.
+    """
+    qs = list(qs)
+    mesclado = esbocos.groupby([por, 'balde'], observed=True)['contagem'].sum()
+    mesclado = mesclado[mesclado > 0]
+    if mesclado.empty:
+        return pd.DataFrame(columns=qs, index=mesclado.index.droplevel('balde').unique(), dtype='float64')
+
+    grupos = mesclado.index.get_level_values(por)
+    representantes = valor_balde(mesclado.index.get_level_values('balde'))
+    acumulado = np.cumsum(mesclado.to_numpy())
+
+    # Contagem acumulada antes de cada grupo e total de cada grupo
+    codigos, nomes = pd.factorize(grupos, sort=False)
+    fim = np.zeros(len(nomes), dtype='int64')
+    np.maximum.at(fim, codigos, acumulado)
+    inicio = np.r_[0, fim[:-1]]
+    total = fim - inicio
+
+    def valor_no_posto(posto):
+        # Primeiro balde cuja contagem acumulada passa do posto (0-based) dentro do grupo
+        return representantes[np.searchsorted(acumulado, inicio + posto, side='right')]
+
+    resultado = {}
+    for q in qs:
+        posto = q * (total - 1)
+        abaixo, acima = np.floor(posto), np.ceil(posto)
+        inferior, superior = valor_no_posto(abaixo), valor_no_posto(acima)
+        resultado[q] = inferior + (superior - inferior) * (posto - abaixo)
+    return pd.DataFrame(resultado, index=nomes.rename(por))
@@ -0,0 +1,79 @@
+"""Resumo por grupo (estatísticas do salário e categoria mais comum) vetorizado.
+
+Substitui ``groupby(grupo).agg({valor: [...], coluna: lambda x: x.mode()[0]})``:
+as estatísticas usam as agregações nativas do ``groupby`` e a moda de cada
+coluna categórica sai de uma contagem por (grupo, código da categoria) com
+``np.bincount`` e ``argmax``, sem chamar Python por grupo.
+
+A moda segue o ``Series.mode`` das colunas de texto: valores nulos são
+ignorados, empates ficam com o primeiro valor em ordem alfabética (também nas
+categóricas ordenadas, cuja ordem das categorias não é alfabética) e um grupo
+sem valores recebe ``'N/A'``.
+"""
+import numpy as np
+import pandas as pd
+
+ESTATISTICAS = ['mean', 'median', 'min', 'max', 'count']
+SEM_MODA = 'N/A'
+
+
+def codigos(serie):
+    """Códigos inteiros (−1 para nulos) e valores de ``serie``, na ordem do ``mode``."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie, sort=True)
+
+
+def contagens(serie, normalize=False):
+    """``serie.value_counts(normalize)`` com empates na ordem da primeira aparição.
+
+    É o desempate do ``value_counts`` numa coluna de texto; numa categórica ele
+    segue a ordem das categorias (e lista as que não aparecem). Aqui só entram
+    os valores presentes, na ordem em que aparecem em ``serie``.
+    """
+    codigos_serie, valores = pd.factorize(serie)
+    quantidades = np.bincount(codigos_serie[codigos_serie >= 0], minlength=len(valores))
+    ordem = np.argsort(-quantidades, kind='stable')
+    resultado = pd.Series(quantidades[ordem], index=pd.Index(valores.take(ordem), name=serie.name), name='count')
+    if normalize:
+        resultado = (resultado / resultado.sum()).rename('proportion')
+    return resultado
+
+
+def moda_por_grupo(codigos_grupo, n_grupos, serie):
+    """Categoria mais frequente de ``serie`` em cada grupo (``codigos_grupo`` de 0 a n−1)."""
+    codigos_serie, valores = codigos(serie)
+    validos = codigos_serie >= 0
+    contagens = np.bincount(
+        codigos_grupo[validos] * len(valores) + codigos_serie[validos],
+        minlength=n_grupos * len(valores),
+    ).reshape(n_grupos, len(valores))
+
+    com_valores = contagens.any(axis=1)
+    # argmax fica com o primeiro máximo: percorre os valores em ordem alfabética
+    alfabetica = np.argsort(np.asarray(valores, dtype=str), kind='stable')
+    mais_frequente = alfabetica[contagens[:, alfabetica].argmax(axis=1)]
+    if com_valores.all() and isinstance(serie.dtype, pd.CategoricalDtype):
+        # Como no agg com lambda, a coluna mantém o dtype categórico
+        return pd.Categorical.from_codes(mais_frequente, dtype=serie.dtype)
+    moda = np.full(n_grupos, SEM_MODA, dtype=object)
+    moda[com_valores] = np.asarray(valores, dtype=object)[mais_frequente[com_valores]]
+    return moda
+
+
+def resumo_por_grupo(df, grupo, valor, modas=()):
+    """Estatísticas de ``valor`` e moda de cada coluna de ``modas`` por ``grupo``.
+
+    Mesmo resultado de ``df.groupby(grupo, observed=True).agg(...)`` com
+    ``ESTATISTICAS`` para ``valor`` e ``x.mode()[0]`` para as ``modas``:
+    colunas em ``MultiIndex`` (coluna, estatística), modas com o rótulo
+    ``<lambda>``.
+    """
+    agrupado = df.groupby(grupo, observed=True)
+    resumo = agrupado[valor].agg(ESTATISTICAS)
+    resumo.columns = pd.MultiIndex.from_product([[valor], ESTATISTICAS])
+
+    codigos_grupo = agrupado.ngroup().to_numpy()
+    for coluna in modas:
+        resumo[(coluna, '<lambda>')] = moda_por_grupo(codigos_grupo, len(resumo), df[coluna])
+    return resumo
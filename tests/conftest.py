@@ -0,0 +1,66 @@
+"""Bases pequenas e determinísticas para comparar os motores com o pandas puro."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Os módulos do app ficam na raiz do repositório, ao lado do app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dados  # noqa: E402
+
+pd.set_option("mode.copy_on_write", True)
+
+ANOS = [2021, 2022, 2023, 2024]
+CARGOS = ['Cientista de Dados', 'Engenheiro de Dados', 'Analista de Dados', 'Engenheiro de ML', 'Arquiteto de Dados']
+PERIODOS = ['Integral', 'Meio período', 'Contrato']
+PAISES = ['BRA', 'USA', 'DEU', 'PRT']
+
+
+@pytest.fixture(scope="session")
+def df():
+    """Base limpa com o schema do dashboard (categóricas e colunas derivadas)."""
+    rng = np.random.default_rng(7)
+    n = 600
+    salario = rng.integers(20_000, 400_000, n)
+    base = pd.DataFrame({
+        'ano': rng.choice(ANOS, n),
+        'senoridade': rng.choice(dados.ORDEM_SENORIDADE, n),
+        'periodo': rng.choice(PERIODOS, n),
+        'cargo': rng.choice(CARGOS, n, p=[0.4, 0.3, 0.2, 0.08, 0.02]),
+        'salario': salario,
+        'moeda_salario': rng.choice(['USD', 'EUR', 'BRL'], n),
+        'salario_em_dolar_americano': salario,
+        'residencia': rng.choice(PAISES, n),
+        'modalidade': rng.choice(dados.ORDEM_MODALIDADE, n),
+        'localizacao_empresa': rng.choice(PAISES, n),
+        'tamanho_empresa': rng.choice(dados.ORDEM_TAMANHO_EMPRESA, n),
+    })
+    return dados.derivar_colunas(dados.aplicar_schema(base))
+
+
+@pytest.fixture
+def origem(tmp_path):
+    """CSV no formato da base original (colunas em inglês, códigos e países ISO-2)."""
+    rng = np.random.default_rng(11)
+    n = 400
+    bruto = pd.DataFrame({
+        'work_year': rng.choice(ANOS, n).astype('float64'),
+        'experience_level': rng.choice(['EN', 'MI', 'SE', 'EX'], n),
+        'employment_type': rng.choice(['FT', 'PT', 'CT', 'FL'], n),
+        'job_title': rng.choice(['Data Scientist', 'Data Engineer', 'Data Analyst'], n),
+        'salary': rng.integers(20_000, 400_000, n),
+        'salary_currency': rng.choice(['USD', 'EUR'], n),
+        'salary_in_usd': rng.integers(20_000, 400_000, n),
+        'employee_residence': rng.choice(['US', 'BR', 'DE'], n),
+        'remote_ratio': rng.choice([0, 50, 100], n),
+        'company_location': rng.choice(['US', 'BR', 'DE'], n),
+        'company_size': rng.choice(['S', 'M', 'L'], n),
+    })
+    # Algumas linhas sem ano, que a limpeza descarta
+    bruto.loc[::97, 'work_year'] = np.nan
+    caminho = tmp_path / "salaries.csv"
+    bruto.to_csv(caminho, index=False)
+    return caminho
@@ -0,0 +1,136 @@
+"""Cubo de agregados e ``agregar_varios`` contra ``groupby`` nas linhas."""
+import pandas as pd
+import pytest
+
+import cubo
+from filtros import IndiceFiltros
+
+MEDIDA = cubo.MEDIDA
+ESTATISTICAS = ['mean', 'std', 'count', 'min', 'max', 'sum']
+
+PEDIDOS = {
+    'ano': ('ano', ESTATISTICAS),
+    'cargo': ('cargo', ['mean', 'count']),
+    'ano_modalidade': (['ano', 'modalidade'], ['count', 'mean']),
+    'senoridade_ano': (['senoridade', 'ano'], ['mean', 'std']),
+    'pais_tamanho': (['localizacao_empresa', 'tamanho_empresa'], ['min', 'max']),
+}
+
+SELECOES = [
+    {},
+    {'ano': [2023]},
+    {'senoridade': ['Júnior'], 'modalidade': ['Remoto', 'Híbrido']},
+    {'cargo': ['Arquiteto de Dados'], 'tamanho_empresa': ['Pequeno']},
+]
+
+
+def agrupar_pandas(registros, dimensoes, estatisticas):
+    return registros.groupby(dimensoes, observed=True)[MEDIDA].agg(estatisticas)
+
+
+def comparar(obtido, esperado):
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("selecoes", SELECOES)
+def test_agregar_varios_das_celulas_igual_a_groupby(df, selecoes):
+    cubo_salarios = cubo.CuboAgregado(df)
+    registros = IndiceFiltros(df).filtrar(df, selecoes)
+    resultados = cubo.agregar_varios(cubo_salarios.filtrar(selecoes), PEDIDOS)
+    assert list(resultados) == list(PEDIDOS)
+    for nome, (dimensoes, estatisticas) in PEDIDOS.items():
+        comparar(resultados[nome], agrupar_pandas(registros, dimensoes, estatisticas))
+
+
+@pytest.mark.parametrize("limite_denso", [cubo.LIMITE_DENSO, 8])
+def test_agregar_varios_dos_registros_igual_a_groupby(df, limite_denso):
+    # Sem as colunas do cubo, cada linha conta uma vez; limite baixo força uma base por pedido
+    resultados = cubo.agregar_varios(df, PEDIDOS, limite_denso)
+    for nome, (dimensoes, estatisticas) in PEDIDOS.items():
+        comparar(resultados[nome], agrupar_pandas(df, dimensoes, estatisticas))
+
+
+def test_selecao_sem_registros(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    celulas = cubo_salarios.filtrar({'ano': [1999]})
+    assert celulas.empty
+    for resultado in cubo.agregar_varios(celulas, PEDIDOS).values():
+        assert resultado.empty
+
+
+def test_ano_unico(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    resultado = cubo.agregar_varios(cubo_salarios.filtrar({'ano': [2022]}), PEDIDOS)['ano']
+    assert list(resultado.index) == [2022]
+    comparar(resultado, agrupar_pandas(df[df['ano'] == 2022], 'ano', ESTATISTICAS))
+
+
+def test_resumo_igual_a_serie(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    resumo = cubo.resumo(cubo_salarios.celulas)
+    salarios = df[MEDIDA]
+    assert resumo['count'] == len(salarios)
+    assert resumo['mean'] == pytest.approx(salarios.mean(), rel=1e-12)
+    assert resumo['std'] == pytest.approx(salarios.std(), rel=1e-9)
+    assert (resumo['min'], resumo['max']) == (salarios.min(), salarios.max())
+
+
+# Só estatísticas aditivas: mínimo e máximo desligam a atualização por diferença
+PEDIDOS_ADITIVOS = {
+    'ano': ('ano', ['mean', 'std', 'count', 'sum']),
+    'ano_modalidade': (['ano', 'modalidade'], ['count']),
+    'senoridade_ano': (['senoridade', 'ano'], ['mean']),
+    'cargo': ('cargo', ['mean', 'count']),
+}
+
+
+def test_incremental_soma_e_subtrai_de_volta_exato(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    dominios = {'ano': sorted(df['ano'].unique())}
+    base = {'ano': [2021, 2022], 'senoridade': ['Pleno', 'Sênior']}
+    com_ano = {**base, 'ano': [2021, 2022, 2024]}
+
+    def passo(estado, selecoes):
+        return cubo.agregar_incremental(
+            estado, PEDIDOS_ADITIVOS, selecoes, cubo_salarios.filtrar(selecoes), cubo_salarios.filtrar, dominios
+        )
+
+    estado, inicial = passo(None, base)
+    estado, somado = passo(estado, com_ano)
+    assert estado.passos == 1
+    estado, devolvido = passo(estado, base)
+    assert estado.passos == 2
+
+    # Salários inteiros: as somas em float64 são exatas e a volta reproduz o estado inicial
+    registros = IndiceFiltros(df).filtrar(df, com_ano)
+    for nome, (dimensoes, estatisticas) in PEDIDOS_ADITIVOS.items():
+        pd.testing.assert_frame_equal(devolvido[nome], inicial[nome])
+        comparar(somado[nome], agrupar_pandas(registros, dimensoes, estatisticas))
+
+
+def test_incremental_passando_por_selecao_vazia(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    dominios = {'ano': sorted(df['ano'].unique())}
+    selecoes = [
+        {'cargo': ['Arquiteto de Dados'], 'ano': [2023]},
+        {'cargo': ['Arquiteto de Dados'], 'ano': [2023, 1999]},
+        {'cargo': ['Arquiteto de Dados'], 'ano': [1999]},
+        {'cargo': ['Arquiteto de Dados'], 'ano': [1999, 2021]},
+        {'cargo': ['Arquiteto de Dados'], 'ano': []},
+    ]
+    estado = None
+    for selecao in selecoes:
+        celulas = cubo_salarios.filtrar(selecao)
+        estado, resultados = cubo.agregar_incremental(
+            estado, PEDIDOS_ADITIVOS, selecao, celulas, cubo_salarios.filtrar, dominios
+        )
+        esperado = cubo.agregar_varios(celulas, PEDIDOS_ADITIVOS)
+        for nome in PEDIDOS_ADITIVOS:
+            comparar(resultados[nome], esperado[nome])
+
+
+def test_diferenca_selecao():
+    assert cubo.diferenca_selecao({'ano': [2021]}, {'ano': [2021, 2022]}) == ('ano', {2022}, set())
+    assert cubo.diferenca_selecao({'ano': [2021], 'cargo': ['a']}, {'ano': [2022], 'cargo': ['b']}) is None
+    # Seleção vazia não filtra: não é uma diferença de valores
+    assert cubo.diferenca_selecao({'ano': [2021]}, {'ano': []}) is None
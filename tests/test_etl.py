@@ -0,0 +1,103 @@
+"""Modos do ETL contra a limpeza da origem inteira de uma vez (``etl.limpar``)."""
+import pandas as pd
+import pytest
+
+import dados
+import etl
+
+
+def limpo_pandas(origem):
+    return etl.limpar(pd.read_csv(origem)).reset_index(drop=True)
+
+
+def metadados_sem_assinatura(metadados):
+    return {chave: valor for chave, valor in metadados.items() if chave != 'assinatura'}
+
+
+@pytest.mark.parametrize("tamanho_bloco", [7, 37, 10_000])
+def test_em_blocos_igual_a_execucao_inteira(origem, tmp_path, tamanho_bloco):
+    (tmp_path / "inteiro").mkdir()
+    (tmp_path / "blocos").mkdir()
+    csv_inteiro, csv_blocos = tmp_path / "inteiro" / "df_limpo.csv", tmp_path / "blocos" / "df_limpo.csv"
+
+    df_limpo, _ = etl.executar(str(origem), str(csv_inteiro), str(tmp_path / "inteiro" / "df_limpo.arrow"))
+    lidas, gravadas, _ = etl.executar_em_blocos(
+        str(origem), str(csv_blocos), str(tmp_path / "blocos" / "df_limpo.arrow"), tamanho_bloco=tamanho_bloco
+    )
+
+    assert lidas == len(pd.read_csv(origem))
+    assert gravadas == len(df_limpo)
+    assert csv_blocos.read_bytes() == csv_inteiro.read_bytes()
+    pd.testing.assert_frame_equal(pd.read_csv(csv_blocos), limpo_pandas(origem), check_dtype=False)
+    pd.testing.assert_frame_equal(
+        dados.ler_snapshot(str(tmp_path / "blocos" / "df_limpo.arrow")),
+        dados.ler_snapshot(str(tmp_path / "inteiro" / "df_limpo.arrow")),
+    )
+    assert dados.ler_metadados(str(tmp_path / "blocos" / dados.ARQUIVO_METADADOS)) == \
+        dados.ler_metadados(str(tmp_path / "inteiro" / dados.ARQUIVO_METADADOS))
+
+
+def test_em_blocos_origem_sem_linhas_validas(origem, tmp_path):
+    bruto = pd.read_csv(origem)
+    bruto['work_year'] = float('nan')
+    vazia = tmp_path / "vazia.csv"
+    bruto.to_csv(vazia, index=False)
+
+    lidas, gravadas, _ = etl.executar_em_blocos(str(vazia), str(tmp_path / "df_limpo.csv"), None, tamanho_bloco=50)
+    assert (lidas, gravadas) == (len(bruto), 0)
+    assert dados.ler_metadados(str(tmp_path / dados.ARQUIVO_METADADOS))['resumo']['registros'] == 0
+
+
+def particoes_esperadas(origem):
+    """Limpeza inteira na ordem das partições: por ano, mantendo a ordem da origem dentro dele."""
+    limpo = etl.limpar(pd.read_csv(origem)).sort_values('ano', kind='stable').reset_index(drop=True)
+    return dados.aplicar_schema(limpo)
+
+
+def conferir_particoes(origem, diretorio):
+    pd.testing.assert_frame_equal(dados.ler_particoes(str(diretorio)), particoes_esperadas(origem))
+    metadados = dados.ler_metadados(str(diretorio.parent / dados.ARQUIVO_METADADOS))
+    assert metadados['assinatura'] == dados.assinatura_dados(diretorio_particoes=str(diretorio))
+    assert metadados_sem_assinatura(metadados) == \
+        metadados_sem_assinatura(dados.metadados_dataset(etl.limpar(pd.read_csv(origem))))
+
+
+def test_incremental_reprocessa_so_os_anos_alterados(origem, tmp_path):
+    diretorio = tmp_path / "df_limpo"
+    alterados, removidos, _ = etl.executar_incremental(str(origem), str(diretorio))
+    assert (alterados, removidos) == (['2021', '2022', '2023', '2024'], [])
+    conferir_particoes(origem, diretorio)
+
+    # Origem igual: nada é lido nem gravado
+    assert etl.executar_incremental(str(origem), str(diretorio))[:2] == ([], [])
+
+    # Uma linha de 2022 alterada, e 2021 some da origem
+    bruto = pd.read_csv(origem)
+    bruto.loc[bruto.index[bruto['work_year'] == 2022][0], 'salary_in_usd'] += 1
+    bruto = bruto[bruto['work_year'] != 2021]
+    bruto.to_csv(origem, index=False)
+    modificado_em = (diretorio / "ano=2023.arrow").stat().st_mtime_ns
+
+    alterados, removidos, _ = etl.executar_incremental(str(origem), str(diretorio))
+    assert (alterados, removidos) == (['2022'], ['2021'])
+    assert (diretorio / "ano=2023.arrow").stat().st_mtime_ns == modificado_em
+    assert not (diretorio / "ano=2021.arrow").exists()
+    conferir_particoes(origem, diretorio)
+
+
+def test_incremental_ida_e_volta_igual_a_execucao_inicial(origem, tmp_path):
+    diretorio = tmp_path / "df_limpo"
+    original = pd.read_csv(origem)
+    etl.executar_incremental(str(origem), str(diretorio))
+    inicial = dados.ler_particoes(str(diretorio))
+
+    # Um ano novo entra e depois sai: as partições voltam a ser as da primeira execução
+    novo = original[original['work_year'] == 2024].assign(work_year=2025.0)
+    pd.concat([original, novo]).to_csv(origem, index=False)
+    assert etl.executar_incremental(str(origem), str(diretorio))[:2] == (['2025'], [])
+    conferir_particoes(origem, diretorio)
+
+    original.to_csv(origem, index=False)
+    assert etl.executar_incremental(str(origem), str(diretorio))[:2] == ([], ['2025'])
+    pd.testing.assert_frame_equal(dados.ler_particoes(str(diretorio)), inicial)
+    conferir_particoes(origem, diretorio)
@@ -0,0 +1,48 @@
+"""``IndiceFiltros`` contra a máscara booleana equivalente do pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from filtros import COLUNAS_FILTRO, IndiceFiltros
+
+
+def mascara_pandas(df, selecoes):
+    """Os ``if selecionados: df = df[df[coluna].isin(selecionados)]`` do dashboard original."""
+    mascara = pd.Series(True, index=df.index)
+    for coluna, selecionados in selecoes.items():
+        if selecionados:
+            mascara &= df[coluna].isin(selecionados)
+    return mascara.to_numpy()
+
+
+SELECOES = [
+    {},
+    {coluna: [] for coluna in COLUNAS_FILTRO},
+    {'ano': [2023]},
+    {'ano': [2022, 2024], 'senoridade': ['Júnior', 'Sênior']},
+    {'cargo': ['Arquiteto de Dados'], 'modalidade': ['Remoto'], 'tamanho_empresa': ['Pequeno']},
+    {'ano': [2023], 'cargo': ['Cargo inexistente']},
+    {'ano': [1999]},
+]
+
+
+@pytest.mark.parametrize("selecoes", SELECOES)
+def test_filtrar_igual_a_mascara(df, selecoes):
+    indice = IndiceFiltros(df)
+    esperado = df[mascara_pandas(df, selecoes)]
+    pd.testing.assert_frame_equal(indice.filtrar(df, selecoes), esperado)
+    np.testing.assert_array_equal(indice.mascara(selecoes), mascara_pandas(df, selecoes))
+
+
+def test_selecao_vazia_devolve_a_propria_base(df):
+    indice = IndiceFiltros(df)
+    assert indice.filtrar(df, {}) is df
+    assert indice.filtrar(df, {'ano': [], 'cargo': None}) is df
+
+
+def test_total_fora_de_multiplo_de_64(df):
+    # Os bits de preenchimento da última palavra não podem virar linhas
+    parte = df.iloc[:130]
+    indice = IndiceFiltros(parte)
+    assert len(indice.posicoes({})) == 130
+    pd.testing.assert_frame_equal(indice.filtrar(parte, {'ano': [2021]}), parte[parte['ano'] == 2021])
@@ -0,0 +1,56 @@
+"""Esboços de quantis contra ``groupby(...).quantile`` nas linhas, dentro do erro garantido."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import cubo
+import quantis
+from filtros import IndiceFiltros
+
+QS = [0.1, 0.25, 0.5, 0.75, 0.9]
+# Erro relativo garantido, com folga só para o arredondamento do float
+TOLERANCIA = quantis.ERRO_RELATIVO * (1 + 1e-9)
+
+
+def quantis_pandas(registros, por):
+    return registros.groupby(por, observed=True)[cubo.MEDIDA].quantile(QS).unstack()
+
+
+@pytest.mark.parametrize("selecoes", [
+    {},
+    {'ano': [2024]},
+    {'senoridade': ['Júnior'], 'tamanho_empresa': ['Médio', 'Grande']},
+    {'cargo': ['Arquiteto de Dados']},
+])
+@pytest.mark.parametrize("por", ['modalidade', 'senoridade', 'ano'])
+def test_quantis_mesclados_dentro_do_erro(df, selecoes, por):
+    cubo_salarios = cubo.CuboAgregado(df)
+    registros = IndiceFiltros(df).filtrar(df, selecoes)
+    obtido = quantis.quantis(cubo_salarios.filtrar_esbocos(selecoes), por, QS)
+    esperado = quantis_pandas(registros, por)
+
+    assert list(obtido.index) == list(esperado.index)
+    erro = np.abs(obtido.to_numpy() - esperado.to_numpy()) / esperado.to_numpy()
+    assert erro.max() <= TOLERANCIA
+
+
+def test_valor_de_cada_balde_dentro_do_erro():
+    valores = np.geomspace(1, 5_000_000, 2_000)
+    representantes = quantis.valor_balde(quantis.balde(valores))
+    assert (np.abs(representantes - valores) / valores).max() <= TOLERANCIA
+
+
+def test_grupo_com_um_registro(df):
+    linha = df.iloc[[0]]
+    esbocos = quantis.esbocar(linha, ['ano'], cubo.MEDIDA)
+    obtido = quantis.quantis(esbocos, 'ano', QS)
+    valor = linha[cubo.MEDIDA].iloc[0]
+    assert np.allclose(obtido.to_numpy(), valor, rtol=TOLERANCIA, atol=0)
+
+
+def test_selecao_sem_registros(df):
+    cubo_salarios = cubo.CuboAgregado(df)
+    obtido = quantis.quantis(cubo_salarios.filtrar_esbocos({'ano': [1999]}), 'modalidade', QS)
+    assert obtido.empty
+    assert list(obtido.columns) == QS
+    assert isinstance(obtido, pd.DataFrame)
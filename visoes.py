@@ -0,0 +1,299 @@
+"""Visões pré-calculadas do dashboard, gravadas em disco para as seleções comuns.
+
+Os filtros de ano, senioridade, modalidade, porte da empresa e tipo de
+contrato têm poucos valores cada, e para uma seleção fixa o dashboard inteiro
+(KPIs, as quatro abas e as recomendações para iniciantes) depende só dos
+dados. Este módulo calcula em lote as seleções mais comuns — a página padrão
+e as variações dela com um ou mais desses filtros restritos a um valor, além
+de seleções frequentes informadas num JSON — e grava o resultado de cada
+seção em ``df_limpo.visoes.sqlite``, com a chave ``cache.chave_selecao``.
+
+O ``app.py`` consulta o arquivo antes de calcular uma seção: um acerto é uma
+leitura por chave primária e um ``pickle.loads``, que não dependem do tamanho
+da base. As outras seleções são calculadas ao vivo, como antes. O arquivo
+guarda a assinatura dos dados (``dados.assinatura_dados``, ou o hash do
+snapshot) e um hash do código que monta os resultados, e só é usado quando
+os dois conferem. Com ``MAPA_BACKEND=sql`` o app consulta o banco SQLite, não
+os arquivos: o arquivo também guarda tamanho e data do banco, e só vale
+enquanto o banco for o mesmo (rode de novo depois de ``python banco.py``).
+Resultados iguais de seleções diferentes são gravados uma vez só.
+
+Uso::
+
+    python visoes.py                          # página padrão + um filtro restrito
+    python visoes.py --niveis 2               # também pares de filtros restritos
+    python visoes.py --selecoes frequentes.json --diretorio /dados
+    python visoes.py --banco /dados/df_limpo.sqlite   # banco usado com MAPA_BACKEND=sql
+"""
+import argparse
+import hashlib
+import importlib
+import itertools
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from importlib.metadata import version
+
+import numpy as np
+import pandas as pd
+
+import cubo
+import dados
+from banco import CAMINHO_BANCO
+from cache import CacheLRU, chave_selecao
+from filtros import IndiceFiltros
+
+ARQUIVO_VISOES = "df_limpo.visoes.sqlite"
+
+# Filtros de poucos valores que as visões restringem (cargo fica com o padrão da sidebar)
+FILTROS_VISOES = ['ano', 'senoridade', 'modalidade', 'tamanho_empresa', 'periodo']
+
+# Módulos cujo código decide o conteúdo dos resultados: se algum mudar, o arquivo é ignorado
+MODULOS_RESULTADOS = ['dados', 'filtros', 'cubo', 'quantis', 'resumos', 'graficos', 'figuras', 'paineis']
+
+
+def versao_codigo():
+    """Hash do código dos ``MODULOS_RESULTADOS`` e das versões do pandas, numpy, Plotly e Streamlit.
+
+    Plotly e Streamlit entram pela versão instalada, sem importá-los; os
+    resultados gravados são objetos do pandas/numpy em pickle.
+    """
+    versoes = f"{pd.__version__}:{np.__version__}:{version('plotly')}:{version('streamlit')}"
+    hash_ = hashlib.sha256(versoes.encode())
+    for modulo in MODULOS_RESULTADOS:
+        with open(os.path.join(dados.DIRETORIO, f"{modulo}.py"), "rb") as arquivo:
+            hash_.update(arquivo.read())
+    return hash_.hexdigest()
+
+
+def assinatura(diretorio):
+    """``dados.assinatura_dados`` de ``diretorio``; sem ela (snapshot sem hash de origem), o hash do snapshot."""
+    caminhos = dados.caminhos_dados(diretorio)
+    assinatura_dados = dados.assinatura_dados(caminhos['caminho_snapshot'], caminhos['diretorio_particoes'])
+    if assinatura_dados is None and os.path.exists(caminhos['caminho_snapshot']):
+        return "snapshot:" + dados.hash_arquivo(caminhos['caminho_snapshot'])
+    return assinatura_dados
+
+
+def assinatura_banco(caminho):
+    """Tamanho e data de modificação do banco SQLite, ou ``""`` se ele não existe."""
+    try:
+        estado = os.stat(caminho)
+    except FileNotFoundError:
+        return ""
+    return f"{estado.st_size}:{estado.st_mtime_ns}"
+
+
+def selecao_padrao(opcoes):
+    """Seleção inicial da sidebar do ``app.py``."""
+    return {
+        'ano': list(opcoes['ano']),
+        'senoridade': sorted(opcoes['senoridade']),
+        'cargo': opcoes['cargo'][:10] if len(opcoes['cargo']) > 10 else list(opcoes['cargo']),
+        'modalidade': sorted(opcoes['modalidade']),
+        'tamanho_empresa': sorted(opcoes['tamanho_empresa']),
+        'periodo': sorted(opcoes['periodo']),
+    }
+
+
+def selecoes_comuns(opcoes, niveis=1, frequentes=()):
+    """Página padrão, variações com até ``niveis`` filtros restritos a um valor e ``frequentes``.
+
+    Cada seleção de ``frequentes`` só precisa das colunas que mudam; as demais
+    ficam com o padrão da sidebar.
+    """
+    padrao = selecao_padrao(opcoes)
+    selecoes = []
+    for quantidade in range(niveis + 1):
+        for colunas in itertools.combinations(FILTROS_VISOES, quantidade):
+            for valores in itertools.product(*(padrao[coluna] for coluna in colunas)):
+                selecoes.append({**padrao, **{coluna: [valor] for coluna, valor in zip(colunas, valores)}})
+    selecoes.extend({**padrao, **frequente} for frequente in frequentes)
+    return selecoes
+
+
+def calcular_secoes(df_registros, indice, cubo_salarios, selecoes, cache_figuras=None):
+    """Resultados de todas as seções para ``selecoes``, como o ``app.py`` os calcula."""
+    # Importados aqui: abrir as visões no app não carrega o Plotly antes da sidebar.
+    # Importar o Streamlit define o template "streamlit" como padrão do Plotly, como no app
+    importlib.import_module("streamlit")
+    import paineis
+
+    celulas = cubo_salarios.filtrar(selecoes)
+    esbocos = cubo_salarios.filtrar_esbocos(selecoes)
+    registros = indice.filtrar(df_registros, selecoes)
+    return {
+        'kpis': paineis.kpis(celulas, cubo_salarios.celulas),
+        'analise_salarial': paineis.analise_salarial(registros, celulas, esbocos, cache_figuras=cache_figuras),
+        'localizacao_empresas': paineis.localizacao_empresas(registros, celulas, esbocos, cache_figuras=cache_figuras),
+        'tendencias': paineis.tendencias(celulas, cache_figuras=cache_figuras),
+        'iniciantes': paineis.iniciantes(registros, cache_figuras=cache_figuras),
+    }
+
+
+def gravar(diretorio=dados.DIRETORIO, niveis=1, frequentes=(), caminho_banco=CAMINHO_BANCO):
+    """Calcula as visões dos dados de ``diretorio`` e grava ``ARQUIVO_VISOES`` ao lado deles.
+
+    Como o banco e o snapshot, o arquivo é montado num temporário e renomeado
+    no final. ``caminho_banco`` é o banco do ``MAPA_BACKEND=sql``, cuja
+    assinatura também é gravada. Retorna contagens e tamanho do que foi gravado.
+    """
+    inicio = time.perf_counter()
+    caminhos = dados.caminhos_dados(diretorio)
+    df = dados.derivar_colunas(dados.carregar_dados(**caminhos))
+    # Depois da carga, que pode ter regenerado o snapshot (como em carregar_metadados)
+    assinatura_atual = assinatura(diretorio)
+    if assinatura_atual is None:
+        raise FileNotFoundError(f"sem snapshot ou partições em {diretorio}; rode o ETL antes")
+
+    indice = IndiceFiltros(df)
+    cubo_salarios = cubo.CuboAgregado(df)
+    df_registros = df[dados.COLUNAS_REGISTROS]
+    # Figuras que se repetem entre seleções são serializadas uma vez
+    cache_figuras = CacheLRU(256 * 2**20)
+
+    caminho = os.path.join(diretorio, ARQUIVO_VISOES)
+    temporario = caminho + ".tmp"
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    conexao = sqlite3.connect(temporario)
+    chaves = set()
+    try:
+        conexao.executescript("""
+            CREATE TABLE info (chave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE resultados (hash TEXT PRIMARY KEY, dados BLOB);
+            CREATE TABLE visoes (chave TEXT, secao TEXT, hash TEXT, PRIMARY KEY (chave, secao)) WITHOUT ROWID;
+        """)
+        # Uma passada por seleção: quase todo o tempo é a montagem das figuras Plotly,
+        # não a agregação; as figuras repetidas já saem do cache_figuras
+        for selecoes in selecoes_comuns(dados.metadados_dataset(df)['opcoes'], niveis, frequentes):
+            chave = chave_selecao(selecoes)
+            if chave in chaves:
+                continue
+            chaves.add(chave)
+            for secao, resultado in calcular_secoes(df_registros, indice, cubo_salarios, selecoes, cache_figuras).items():
+                serializado = pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)
+                hash_resultado = hashlib.sha1(serializado).hexdigest()
+                conexao.execute(
+                    "INSERT OR IGNORE INTO resultados VALUES (?, ?)", (hash_resultado, zlib.compress(serializado))
+                )
+                conexao.execute("INSERT INTO visoes VALUES (?, ?, ?)", (chave, secao, hash_resultado))
+        conexao.executemany("INSERT INTO info VALUES (?, ?)", [
+            ('assinatura', assinatura_atual),
+            ('versao_codigo', versao_codigo()),
+            ('banco', assinatura_banco(caminho_banco)),
+            ('visoes', str(len(chaves))),
+            ('criado_em', str(time.time())),
+        ])
+        unicos = conexao.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        conexao.commit()
+    finally:
+        conexao.close()
+    os.replace(temporario, caminho)
+    return {
+        'visoes': len(chaves),
+        'resultados_unicos': unicos,
+        'bytes': os.path.getsize(caminho),
+        'segundos': time.perf_counter() - inicio,
+    }
+
+
+class ArmazemVisoes:
+    """Leitura das visões gravadas; uma conexão somente leitura por thread, como no ``BancoSalarios``."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.info = dict(self.conexao.execute("SELECT chave, valor FROM info").fetchall())
+        self.acertos = 0
+        self.falhas = 0
+
+    @property
+    def conexao(self):
+        if not hasattr(self._local, 'conexao'):
+            self._local.conexao = sqlite3.connect(f"file:{self.caminho}?mode=ro", uri=True, check_same_thread=False)
+        return self._local.conexao
+
+    def obter(self, chave, secao):
+        """Resultado gravado da ``secao`` para a seleção ``chave``, ou ``None``.
+
+        Um resultado que não pode ser lido (arquivo corrompido, pickle de outra
+        versão de uma biblioteca) conta como falha: a seção é calculada ao vivo.
+        """
+        linha = self.conexao.execute(
+            "SELECT r.dados FROM visoes v JOIN resultados r ON r.hash = v.hash WHERE v.chave = ? AND v.secao = ?",
+            (chave, secao),
+        ).fetchone()
+        resultado = None
+        if linha is not None:
+            try:
+                resultado = pickle.loads(zlib.decompress(linha[0]))
+            except Exception:
+                linha = None
+        with self._lock:
+            if linha is None:
+                self.falhas += 1
+            else:
+                self.acertos += 1
+        return resultado
+
+    def estatisticas(self):
+        """Visões gravadas, acertos/falhas das consultas e tamanho do arquivo."""
+        with self._lock:
+            acertos, falhas = self.acertos, self.falhas
+        consultas = acertos + falhas
+        return {
+            'visoes': int(self.info.get('visoes', 0)),
+            'acertos': acertos,
+            'falhas': falhas,
+            'taxa_acerto': acertos / consultas if consultas else 0.0,
+            'bytes': os.path.getsize(self.caminho),
+        }
+
+
+def abrir(diretorio=dados.DIRETORIO, caminho_banco=None):
+    """Visões válidas para os dados atuais de ``diretorio``, ou ``None`` (arquivo ausente ou desatualizado).
+
+    Com ``caminho_banco`` (backend SQL), o banco também precisa ser o mesmo da gravação.
+    """
+    caminho = os.path.join(diretorio, ARQUIVO_VISOES)
+    if not os.path.exists(caminho):
+        return None
+    try:
+        armazem = ArmazemVisoes(caminho)
+    except sqlite3.DatabaseError:
+        return None
+    assinatura_atual = assinatura(diretorio)
+    if assinatura_atual is None or armazem.info.get('assinatura') != assinatura_atual:
+        return None
+    if armazem.info.get('versao_codigo') != versao_codigo():
+        return None
+    if caminho_banco is not None and armazem.info.get('banco') != assinatura_banco(caminho_banco):
+        return None
+    return armazem
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-calcula as visões comuns do dashboard em df_limpo.visoes.sqlite")
+    parser.add_argument("--diretorio", default=dados.DIRETORIO, help="diretório com os dados do app (MAPA_DADOS)")
+    parser.add_argument("--niveis", type=int, default=1,
+                        help="máximo de filtros restritos a um valor ao mesmo tempo (0: só a página padrão)")
+    parser.add_argument("--selecoes", help="JSON com uma lista de seleções frequentes ({coluna: [valores]})")
+    parser.add_argument("--banco", default=os.environ.get("MAPA_BANCO", CAMINHO_BANCO),
+                        help="banco SQLite usado com MAPA_BACKEND=sql (as visões só valem para ele)")
+    args = parser.parse_args()
+
+    frequentes = []
+    if args.selecoes:
+        with open(args.selecoes, encoding="utf-8") as arquivo:
+            frequentes = json.load(arquivo)
+    gravado = gravar(args.diretorio, args.niveis, frequentes, args.banco)
+    print(
+        f"{gravado['visoes']:,} visões ({gravado['resultados_unicos']:,} resultados distintos) em "
+        f"{os.path.join(args.diretorio, ARQUIVO_VISOES)}: {gravado['bytes'] / 2**20:.1f} MB, {gravado['segundos']:.1f}s"
+    )